@@ -14,6 +14,7 @@ from app.config import settings
 # --- Import entities ---
 from app.user.domain.entity.user import Base as UserBase
 from app.model.domain.entity.model import Base as ModelBase
+from app.model.domain.entity.training_job import TrainingJob  # noqa: F401
 from app.picture.domain.entity.picture import Base as PictureBase
 from app.role.domain.entity.role import Base as RoleBase
 from app.room.domain.entity.room import Base as RoomBase
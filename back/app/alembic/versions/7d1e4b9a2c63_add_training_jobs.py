@@ -0,0 +1,59 @@
+"""add training_jobs
+
+Revision ID: 7d1e4b9a2c63
+Revises: 3c7f2a8b5d91
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '7d1e4b9a2c63'
+down_revision: Union[str, None] = '3c7f2a8b5d91'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'training_jobs',
+        sa.Column('job_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('params', sa.JSON(), nullable=False),
+        sa.Column('progress', sa.JSON(), nullable=True),
+        sa.Column('model_name', sa.String(length=100), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('worker_id', sa.String(length=100), nullable=True),
+        sa.Column(
+            'user_id',
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey('users.user_id'),
+            nullable=True,
+        ),
+        sa.Column(
+            'created_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('job_id'),
+    )
+    op.create_index(
+        op.f('ix_training_jobs_status'),
+        'training_jobs',
+        ['status'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_training_jobs_status'), table_name='training_jobs')
+    op.drop_table('training_jobs')
@@ -12,6 +12,126 @@ class Settings(BaseSettings):
     APP_NAME: str
     PVA_ENABLED: bool = True
 
+    # Micro-batching des inférences concurrentes
+    INFERENCE_BATCHING_ENABLED: bool = True
+    INFERENCE_MAX_BATCH_SIZE: int = 16
+    INFERENCE_MAX_WAIT_MS: float = 5.0
+
+    # Pool dédié aux traitements CPU (décodage, inférence) + admission
+    INFERENCE_EXECUTOR_WORKERS: int = 4
+    INFERENCE_EXECUTOR_MAX_QUEUE: int = 32
+    INFERENCE_RETRY_AFTER_SECONDS: int = 1
+
+    # Ingestion des uploads (taille stockée / qualité JPEG)
+    UPLOAD_IMAGE_SIZE: int = 384
+    UPLOAD_JPEG_QUALITY: int = 100
+
+    # Cache du modèle actif (relecture périodique pour les autres workers)
+    ACTIVE_MODEL_POLL_SECONDS: float = 2.0
+    MODEL_EVICTION_GRACE_SECONDS: float = 60.0
+    # Budget mémoire (par worker) du cache LRU des modèles chargés
+    MODEL_CACHE_BUDGET_MB: int = 512
+
+    # Poids mappés en mémoire (partagés entre workers via le page cache)
+    MODEL_MMAP_ENABLED: bool = True
+
+    # Graphe figé/optimisé (<stem>-optimized.pth) préféré au checkpoint.
+    # TorchScript : pas de partage mmap ni d'activations pour ce modèle,
+    # d'où l'activation explicite.
+    MODEL_OPTIMIZED_ENABLED: bool = False
+    OPTIMIZED_EXPORT_ENABLED: bool = True
+
+    # Backend d'exécution : "torch" ou "onnxruntime" (<stem>.onnx)
+    INFERENCE_BACKEND: str = "torch"
+    ONNX_EXPORT_ENABLED: bool = True
+    ONNXRUNTIME_THREADS: int = 0
+
+    # Variante INT8 (<stem>-int8.pth) servie à la place du modèle fp32.
+    # Modèle TorchScript : pas d'activations pour cette variante.
+    MODEL_INT8_ENABLED: bool = False
+    QUANTIZE_AFTER_TRAINING: bool = False
+    QUANTIZATION_CALIBRATION_IMAGES: int = 128
+
+    # Cache des prédictions (doublons exacts + quasi-doublons par dHash ;
+    # seuil de Hamming < 0 pour désactiver la recherche perceptuelle)
+    PREDICTION_CACHE_ENABLED: bool = True
+    PREDICTION_CACHE_MAX_ENTRIES: int = 1024
+    PREDICTION_CACHE_TTL_SECONDS: float = 600.0
+    PREDICTION_CACHE_HAMMING_THRESHOLD: int = 4
+
+    # Images d'activation rendues à la demande (LRU des PNG rendus) ;
+    # bundles réutilisés pour une même image / version de modèle / options
+    ACTIVATION_RENDER_CACHE_ENTRIES: int = 256
+    ACTIVATION_CACHE_ENABLED: bool = True
+    # Rendu sur un pool borné ; format "png", "webp" ou "jpeg"
+    ACTIVATION_RENDER_WORKERS: int = 2
+    ACTIVATION_IMAGE_FORMAT: str = "png"
+    ACTIVATION_PNG_COMPRESS_LEVEL: int = 1
+    ACTIVATION_IMAGE_QUALITY: int = 85
+    # Heatmap = "mean" ou "max" des N premiers canaux (0 = tous), calculé
+    # dans le hook de capture
+    ACTIVATION_REDUCTION: str = "mean"
+    ACTIVATION_MAX_CHANNELS: int = 0
+    # Nettoyage de uploads/activations : TTL depuis le dernier accès et
+    # quota total (0 = sans quota), les plus anciens supprimés d'abord
+    ACTIVATION_REAPER_ENABLED: bool = True
+    ACTIVATION_TTL_HOURS: float = 24.0
+    ACTIVATION_MAX_MB: int = 2048
+    ACTIVATION_REAPER_INTERVAL_SECONDS: float = 300.0
+
+    # Miniature (150px) et affichage (384px) encodées dès l'import plutôt
+    # qu'au premier GET /pictures/{id}/recover
+    PICTURE_RENDITIONS_AT_IMPORT: bool = True
+
+    # Import par lot (POST /pictures/import/batch)
+    BATCH_IMPORT_MAX_FILES: int = 500
+    BATCH_IMPORT_MAX_FILE_MB: int = 20
+    BATCH_IMPORT_CONCURRENCY: int = 4
+    BATCH_IMPORT_FLUSH_SIZE: int = 50
+
+    # Préchargement du modèle actif au démarrage (readiness sur /ready)
+    WARMUP_ENABLED: bool = True
+    WARMUP_ITERATIONS: int = 3
+
+    # Jobs d'entraînement (POST /models/train mis en file), consommés par
+    # app.scripts.training_worker (Deployment k8s training-worker). Worker
+    # dans l'API seulement sur demande (dev) : un seul process uvicorn par
+    # conteneur
+    TRAINING_WORKER_ENABLED: bool = False
+    TRAINING_POLL_SECONDS: float = 5.0
+    TRAINING_HEARTBEAT_SECONDS: float = 15.0
+    TRAINING_STALE_SECONDS: float = 120.0
+    TRAINING_MAX_ATTEMPTS: int = 2
+    TRAINING_EVENTS_POLL_SECONDS: float = 1.0
+    # DataLoader de l'entraînement : décodage JPEG dans des process
+    # dédiés (-1 = CPU du quota cgroup - 1, 4 max ; 0 = dans la boucle),
+    # démarrés en "spawn" plutôt que forkés depuis un process multi-threadé
+    TRAINING_LOADER_WORKERS: int = -1
+    TRAINING_LOADER_START_METHOD: str = "spawn"
+    TRAINING_PREFETCH_FACTOR: int = 2
+    TRAINING_PERSISTENT_WORKERS: bool = True
+    TRAINING_PIN_MEMORY: bool = True
+    # Images décodées une fois (uint8, shards mappés en mémoire) et
+    # réutilisées d'un epoch et d'un entraînement à l'autre
+    TRAINING_DATASET_CACHE_ENABLED: bool = True
+    TRAINING_DATASET_CACHE_DIR: str = "uploads/.dataset-cache"
+    TRAINING_DATASET_CACHE_SHARD_SIZE: int = 256
+
+    # Stockage d'objets partagé pour les modèles ("" = volume local seul,
+    # "local" = répertoire monté, "s3" = bucket S3/MinIO, boto3 requis)
+    STORAGE_BACKEND: str = ""
+    STORAGE_LOCAL_ROOT: str = "/app/storage"
+    STORAGE_MODELS_PREFIX: str = "models/"
+    S3_BUCKET: str = ""
+    S3_ENDPOINT_URL: str = ""
+    S3_REGION: str = ""
+    S3_ACCESS_KEY_ID: str = ""
+    S3_SECRET_ACCESS_KEY: str = ""
+    S3_MAX_POOL_CONNECTIONS: int = 20
+    S3_MULTIPART_THRESHOLD_MB: int = 64
+    S3_MULTIPART_CHUNK_MB: int = 16
+    S3_TRANSFER_CONCURRENCY: int = 4
+
     @property
     def database_url(self):
         password_encoded = quote_plus(self.DB_PASSWORD)
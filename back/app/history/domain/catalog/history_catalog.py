@@ -6,3 +6,4 @@ class HistoryCatalog(Protocol):
     def find_all(self) -> Collection[History]: ...
     def find_by_user_id(self, user_id: str) -> Collection[History]: ...
     def save(self, history: History) -> History: ...
+    def save_all(self, histories: Collection[History]) -> None: ...
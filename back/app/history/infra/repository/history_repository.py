@@ -27,3 +27,12 @@ class HistoryRepository:
         self.db.commit()
         self.db.refresh(history)
         return history
+
+    def save_all(self, histories) -> None:
+        """Persist many History entities in one transaction."""
+        try:
+            self.db.add_all(list(histories))
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
@@ -0,0 +1,88 @@
+"""Cache HTTP des fichiers servis (ETag forts, 304, Cache-Control).
+
+Les ETag sont dérivés du SHA-256 du contenu. Le condensat d'un fichier est
+mémorisé par (chemin, taille, mtime) pour ne pas relire le fichier à
+chaque requête ; il est recalculé dès que le fichier change.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+from fastapi import Request
+from fastapi.responses import FileResponse, Response
+
+# Contenu adressé par un token (jamais modifié sous la même URL)
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+_DIGEST_CACHE_SIZE = 4096
+_digests: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+_digests_lock = threading.Lock()
+
+
+def file_digest(path: Union[str, Path]) -> str:
+    """SHA-256 du contenu de ``path`` (mémorisé tant qu'il ne change pas)."""
+    st = os.stat(path)
+    key = (str(path), st.st_size, st.st_mtime_ns)
+    with _digests_lock:
+        digest = _digests.get(key)
+        if digest is not None:
+            _digests.move_to_end(key)
+            return digest
+
+    sha = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1024 * 1024), b""):
+            sha.update(chunk)
+    digest = sha.hexdigest()
+
+    with _digests_lock:
+        _digests[key] = digest
+        while len(_digests) > _DIGEST_CACHE_SIZE:
+            _digests.popitem(last=False)
+    return digest
+
+
+def strong_etag(digest: str, *variant: str) -> str:
+    """ETag fort : condensat du contenu, plus la variante servie."""
+    suffix = "".join(f"-{v}" for v in variant)
+    return f'"{digest[:32]}{suffix}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """``If-None-Match`` correspond-il à ``etag`` (comparaison faible) ?"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in header.split(",")]
+    return etag in (tag[2:] if tag.startswith("W/") else tag
+                    for tag in candidates)
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    return Response(
+        status_code=304,
+        headers={"ETag": etag, "Cache-Control": cache_control},
+    )
+
+
+def cached_file_response(
+    request: Request,
+    path: Union[str, Path],
+    media_type: Optional[str] = None,
+    cache_control: str = IMMUTABLE,
+    extra_headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """``FileResponse`` (sendfile, Range, Content-Length, Last-Modified)
+    avec ETag fort ; 304 si le client a déjà cette version."""
+    etag = strong_etag(file_digest(path))
+    if etag_matches(request, etag):
+        return not_modified(etag, cache_control)
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    headers.update(extra_headers or {})
+    return FileResponse(path, media_type=media_type, headers=headers)
@@ -1,7 +1,9 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from app.config import settings
+from app.metrics import collect_metrics
 from app.database import engine, Base
 from app.scripts.seed_dev import load_fixtures
 from sqlalchemy import text
@@ -19,7 +21,15 @@ from app.authentification.infra.rest.auth_router import (
     router as auth_router,
 )
 from app.room.infra.rest.room_router import router as room_router
+from app.model.infra.factory.model_factory import (
+    get_model_warmup,
+    get_training_worker,
+    model_catalog_session,
+)
 from app.history.infra.rest.history_router import router as history_router
+from app.picture.infra.factory.picture_factory import get_activation_reaper
+from app.model.domain.service.predict import configure_model_storage
+from app.storage.infra.factory.storage_factory import get_blob_storage
 
 app = FastAPI()
 
@@ -54,6 +64,32 @@ def on_startup() -> None:
     if settings.APP_PROFILE.startswith("dev"):
         refresh_db()
 
+    # Modèles absents du volume local récupérés depuis le stockage partagé
+    configure_model_storage(
+        get_blob_storage(), settings.STORAGE_MODELS_PREFIX)
+
+    # Load the active model and run a few passes before /ready says yes
+    model_warmup = get_model_warmup()
+    if settings.WARMUP_ENABLED:
+        model_warmup.start_background(model_catalog_session)
+    else:
+        model_warmup.skip()
+
+    # TTL + quota sur uploads/activations
+    if settings.ACTIVATION_REAPER_ENABLED:
+        get_activation_reaper().start()
+
+    # Jobs d'entraînement consommés dans l'API (dev) : un seul process
+    # uvicorn du conteneur entraîne
+    if settings.TRAINING_WORKER_ENABLED:
+        get_training_worker().start()
+
+
+@app.on_event("shutdown")
+def on_shutdown() -> None:
+    get_activation_reaper().stop(timeout=5)
+    get_training_worker().stop(timeout=5)
+
 
 app.add_middleware(
     CORSMiddleware,
@@ -69,6 +105,19 @@ def read_root() -> dict:
     return {"message": "Welcome to the FastAPI application!"}
 
 
+@app.get("/ready")
+def read_readiness():
+    readiness = get_model_warmup().status()
+    if not readiness["ready"]:
+        return JSONResponse(status_code=503, content=readiness)
+    return readiness
+
+
+@app.get("/metrics")
+def read_metrics() -> dict:
+    return collect_metrics()
+
+
 # routers include
 app.include_router(user_router)
 app.include_router(model_router)
@@ -0,0 +1,28 @@
+"""Registre minimal des métriques applicatives.
+
+Chaque composant (executor d'inférence, batcher, caches…) enregistre une
+fonction renvoyant un dict de compteurs ; ``GET /metrics`` agrège le tout.
+Les valeurs sont propres au worker uvicorn qui répond.
+"""
+
+from typing import Any, Callable, Dict
+
+_PROVIDERS: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+
+def register_metrics(
+    name: str,
+    provider: Callable[[], Dict[str, Any]],
+) -> None:
+    """Enregistre (ou remplace) le fournisseur de métriques ``name``."""
+    _PROVIDERS[name] = provider
+
+
+def collect_metrics() -> Dict[str, Any]:
+    snapshot: Dict[str, Any] = {}
+    for name, provider in list(_PROVIDERS.items()):
+        try:
+            snapshot[name] = provider()
+        except Exception as e:
+            snapshot[name] = {"error": str(e)}
+    return snapshot
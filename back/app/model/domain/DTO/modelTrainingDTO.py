@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Literal, Optional
 from app.room.domain.DTO.roomLightDTO import RoomLightDTO
 from app.model.domain.DTO.scratchLayersDTO import ScratchLayersDTO
@@ -13,3 +13,6 @@ class ModelTrainingDTO(BaseModel):
     roomList: list[RoomLightDTO]
     scratchLayers: Optional[ScratchLayersDTO] = None
     customLayers: Optional[CustomLayersDTO] = None
+    # Surcharge de TRAINING_LOADER_WORKERS / TRAINING_PREFETCH_FACTOR
+    numWorkers: Optional[int] = Field(default=None, ge=-1)
+    prefetchFactor: Optional[int] = Field(default=None, ge=1)
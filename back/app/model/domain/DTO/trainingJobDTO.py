@@ -0,0 +1,17 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class TrainingJobDTO(BaseModel):
+    id: UUID
+    status: str
+    progress: Optional[Dict[str, Any]] = None
+    model_name: Optional[str] = None
+    error: Optional[str] = None
+    attempts: int = 0
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
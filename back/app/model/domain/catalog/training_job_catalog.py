@@ -0,0 +1,42 @@
+from datetime import datetime
+from typing import Any, Dict, Optional, Protocol
+from uuid import UUID
+
+from app.model.domain.entity.training_job import TrainingJob
+
+
+class TrainingJobCatalog(Protocol):
+    def save(self, job: TrainingJob) -> TrainingJob: ...
+
+    def find_by_id(self, job_id: UUID) -> Optional[TrainingJob]: ...
+
+    def claim_next(
+        self, worker_id: str, stale_before: datetime
+    ) -> Optional[TrainingJob]:
+        """
+        Passes the oldest queued job (or a running one whose worker stopped
+        heartbeating before ``stale_before``) to ``worker_id``. Concurrent
+        workers never claim the same job.
+        """
+        ...
+
+    def heartbeat(
+        self,
+        job_id: UUID,
+        worker_id: str,
+        progress: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """
+        Refreshes the heartbeat (and progress) of a job still owned by
+        ``worker_id``; False if it was reclaimed meanwhile.
+        """
+        ...
+
+    def finish(
+        self,
+        job_id: UUID,
+        worker_id: str,
+        status: str,
+        model_name: Optional[str] = None,
+        error: Optional[str] = None,
+    ) -> bool: ...
@@ -0,0 +1,88 @@
+import uuid
+from sqlalchemy import (
+    JSON,
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    String,
+    Text,
+)
+from sqlalchemy.sql import func
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.database import Base
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+TERMINAL_STATUSES = (SUCCEEDED, FAILED)
+
+
+class TrainingJob(Base):
+    __tablename__ = "training_jobs"
+
+    job_id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+        unique=True,
+        nullable=False,
+    )
+    status = Column(
+        String(20),
+        default=QUEUED,
+        nullable=False,
+        index=True,
+    )
+    # ModelTrainingDTO sérialisé
+    params = Column(
+        JSON,
+        nullable=False,
+    )
+    # Dernier epoch terminé : loss, débit, ETA...
+    progress = Column(
+        JSON,
+        nullable=True,
+    )
+    model_name = Column(
+        String(100),
+        nullable=True,
+    )
+    error = Column(
+        Text,
+        nullable=True,
+    )
+    attempts = Column(
+        Integer,
+        default=0,
+        nullable=False,
+    )
+    worker_id = Column(
+        String(100),
+        nullable=True,
+    )
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.user_id"),
+        nullable=True,
+    )
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+    started_at = Column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+    heartbeat_at = Column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+    finished_at = Column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
@@ -0,0 +1,21 @@
+from app.model.domain.DTO.trainingJobDTO import TrainingJobDTO
+from app.model.domain.entity.training_job import TrainingJob
+
+
+class TrainingJobToTrainingJobDTOMapper:
+    @staticmethod
+    def apply(job: TrainingJob) -> TrainingJobDTO:
+        return TrainingJobDTO(
+            id=job.job_id,
+            status=job.status,
+            progress=job.progress,
+            model_name=job.model_name,
+            error=job.error,
+            attempts=job.attempts or 0,
+            created_at=job.created_at,
+            started_at=job.started_at,
+            finished_at=job.finished_at,
+        )
+
+
+training_job_to_trainingJobDTO_mapper = TrainingJobToTrainingJobDTOMapper()
@@ -0,0 +1,240 @@
+# app/model/domain/service/activation_reaper.py
+"""Background cleanup of ``uploads/activations/<token>`` directories.
+
+Every activation request leaves a token directory behind. The reaper
+periodically removes the ones not used for ``ttl_s`` seconds, then, if
+the remaining total is still above ``max_bytes``, the least recently used
+ones until it fits.
+
+Several workers and pods may share the same volume and sweep at the same
+time. A directory is first claimed by renaming it into ``.trash/`` (an
+atomic rename on the same filesystem): only the worker whose rename
+succeeds deletes it and counts the reclaimed bytes, the others just skip
+it. A non-blocking ``flock`` additionally keeps workers of the same node
+from scanning the directory concurrently.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non POSIX
+    fcntl = None
+
+PathLike = Union[str, Path]
+
+TRASH_DIR = ".trash"
+LOCK_FILE = ".reaper.lock"
+
+
+def _scan_dir(path: Path) -> Tuple[int, float]:
+    """(taille totale, mtime le plus récent) d'un répertoire de token."""
+    size = 0
+    latest = path.stat().st_mtime
+    for entry in os.scandir(path):
+        if entry.is_file(follow_symlinks=False):
+            st = entry.stat(follow_symlinks=False)
+            size += st.st_size
+            latest = max(latest, st.st_mtime)
+    return size, latest
+
+
+class ActivationReaper:
+    def __init__(
+        self,
+        root: PathLike,
+        ttl_s: float = 24 * 3600.0,
+        max_bytes: int = 0,
+        interval_s: float = 300.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.root = Path(root)
+        self.ttl_s = float(ttl_s)
+        # 0 = pas de quota
+        self.max_bytes = max(int(max_bytes), 0)
+        self.interval_s = max(float(interval_s), 1.0)
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._sweeps = 0
+        self._skipped_sweeps = 0
+        self._dirs_expired = 0
+        self._dirs_evicted = 0
+        self._bytes_reclaimed = 0
+        self._errors = 0
+        self._last_sweep_ms: Optional[float] = None
+        self._last_total_bytes: Optional[int] = None
+        self._last_dirs: Optional[int] = None
+
+    # ------------------------------------------------------------------
+    # Sweep
+    # ------------------------------------------------------------------
+
+    def sweep(self) -> Dict[str, Any]:
+        """Une passe : expiration par TTL puis quota (plus anciens d'abord)."""
+        if not self.root.is_dir():
+            return {"expired": 0, "evicted": 0, "bytes_reclaimed": 0}
+
+        lock_fh = self._try_lock()
+        if lock_fh is False:
+            with self._lock:
+                self._skipped_sweeps += 1
+            return {"expired": 0, "evicted": 0, "bytes_reclaimed": 0,
+                    "skipped": True}
+
+        started = time.perf_counter()
+        try:
+            self._empty_trash()
+            now = self._clock()
+            entries = self._list_entries()
+
+            expired = 0
+            evicted = 0
+            reclaimed = 0
+            kept: List[Tuple[float, int, Path]] = []
+            for latest, size, path in entries:
+                if self.ttl_s > 0 and now - latest > self.ttl_s:
+                    if self._remove(path):
+                        expired += 1
+                        reclaimed += size
+                    continue
+                kept.append((latest, size, path))
+
+            total = sum(size for _, size, _ in kept)
+            # kept est trié du plus ancien au plus récent
+            while self.max_bytes and kept and total > self.max_bytes:
+                _, size, path = kept.pop(0)
+                # Déjà réclamé par un autre worker : libéré quand même
+                if self._remove(path):
+                    evicted += 1
+                    reclaimed += size
+                total -= size
+        finally:
+            if lock_fh:
+                lock_fh.close()
+
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        with self._lock:
+            self._sweeps += 1
+            self._dirs_expired += expired
+            self._dirs_evicted += evicted
+            self._bytes_reclaimed += reclaimed
+            self._last_sweep_ms = elapsed_ms
+            self._last_total_bytes = total
+            self._last_dirs = len(kept)
+        if expired or evicted:
+            print(f"[REAPER] removed {expired} expired / {evicted} over quota "
+                  f"activation dir(s), {reclaimed} bytes reclaimed")
+        return {"expired": expired, "evicted": evicted,
+                "bytes_reclaimed": reclaimed}
+
+    # ------------------------------------------------------------------
+    # Background thread
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._loop, name="activation-reaper", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.sweep()
+            except Exception as e:
+                with self._lock:
+                    self._errors += 1
+                print(f"[WARN] activation reaper sweep failed: {e}")
+            self._stop.wait(self.interval_s)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "ttl_s": self.ttl_s,
+                "max_bytes": self.max_bytes,
+                "sweeps": self._sweeps,
+                "skipped_sweeps": self._skipped_sweeps,
+                "dirs_expired": self._dirs_expired,
+                "dirs_evicted": self._dirs_evicted,
+                "bytes_reclaimed": self._bytes_reclaimed,
+                "errors": self._errors,
+                "last_sweep_ms": self._last_sweep_ms,
+                "total_bytes": self._last_total_bytes,
+                "dirs": self._last_dirs,
+            }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _list_entries(self) -> List[Tuple[float, int, Path]]:
+        """(dernier accès, taille, chemin) des tokens, plus anciens d'abord."""
+        entries = []
+        for entry in os.scandir(self.root):
+            if entry.name.startswith(".") or not entry.is_dir(
+                    follow_symlinks=False):
+                continue
+            path = Path(entry.path)
+            try:
+                size, latest = _scan_dir(path)
+            except FileNotFoundError:
+                # Supprimé entre-temps par un autre worker
+                continue
+            entries.append((latest, size, path))
+        entries.sort(key=lambda e: e[0])
+        return entries
+
+    def _remove(self, path: Path) -> bool:
+        """Réclame ``path`` par renommage atomique puis le supprime."""
+        trash = self.root / TRASH_DIR
+        trash.mkdir(exist_ok=True)
+        claimed = trash / f"{path.name}.{uuid.uuid4().hex}"
+        try:
+            os.rename(path, claimed)
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            with self._lock:
+                self._errors += 1
+            print(f"[WARN] activation reaper cannot claim {path}: {e}")
+            return False
+        shutil.rmtree(claimed, ignore_errors=True)
+        return True
+
+    def _empty_trash(self) -> None:
+        """Restes d'un worker interrompu pendant une suppression."""
+        trash = self.root / TRASH_DIR
+        if trash.is_dir():
+            for entry in os.scandir(trash):
+                shutil.rmtree(entry.path, ignore_errors=True)
+
+    def _try_lock(self):
+        """Fichier verrouillé, None sans fcntl, False si déjà pris."""
+        if fcntl is None:
+            return None
+        fh = open(self.root / LOCK_FILE, "a")
+        try:
+            fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            fh.close()
+            return False
+        return fh
@@ -0,0 +1,599 @@
+# app/model/domain/service/activation_store.py
+"""Compressed activation bundles, rendered to PNG on demand.
+
+Generating activations used to render and PNG-encode a heatmap and an
+overlay for every hooked layer before answering, although the frontend
+only looks at a few of them. A request now stores one compressed bundle
+per token directory:
+
+- ``activations.npz``: the resized original (uint8 RGB) and, per layer,
+  the channel-reduced map normalized to uint8 at its native resolution;
+- ``manifest.json``: the served file names and how to render each one.
+
+``ActivationRenderer`` turns a file name of the manifest into an encoded
+image when it is requested and keeps the most recent renders in an LRU.
+The output format (PNG, WebP or JPEG) follows the file extension chosen
+when the bundle was written.
+
+Tokens from ``activation_token`` are deterministic (picture, model
+version, image content, options): a repeated request finds the bundle of
+the first one and its stored result instead of running the model again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import math
+import os
+import shutil
+import threading
+import time
+import uuid
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+import torch
+from PIL import Image
+
+PathLike = Union[str, Path]
+
+BUNDLE_FILE = "activations.npz"
+MANIFEST_FILE = "manifest.json"
+ORIGINAL_STEM = "original"
+
+ORIGINAL = "original"
+HEATMAP = "heatmap"
+OVERLAY = "overlay"
+
+OVERLAY_ALPHA = 0.45
+
+# Réduction des canaux
+MEAN = "mean"
+MAX = "max"
+
+# extension -> (format Pillow, media type)
+IMAGE_FORMATS = {
+    ".png": ("PNG", "image/png"),
+    ".webp": ("WEBP", "image/webp"),
+    ".jpg": ("JPEG", "image/jpeg"),
+    ".jpeg": ("JPEG", "image/jpeg"),
+}
+FORMAT_EXTENSIONS = {
+    "png": ".png",
+    "webp": ".webp",
+    "jpeg": ".jpg",
+    "jpg": ".jpg",
+}
+
+
+def activation_token(**key: Any) -> str:
+    """Token déterministe (32 hex) pour une clé de bundle."""
+    payload = json.dumps(key, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+@dataclass(frozen=True)
+class ChannelReduction:
+    """Réduction des canaux appliquée dans le hook de capture.
+
+    A ``[N, C, H, W]`` output is reduced on the fly to an ``[N, H, W]``
+    map (mean or max of its first ``max_channels`` channels, all of them
+    when None) before being copied to the CPU, so the full feature map
+    of each hooked layer is never kept. Other outputs are copied as is.
+    """
+
+    max_channels: Optional[int] = None
+    mode: str = MEAN
+
+    def __post_init__(self) -> None:
+        if self.mode not in (MEAN, MAX):
+            raise ValueError(
+                f"Unsupported channel reduction '{self.mode}' "
+                f"(available: {MEAN}, {MAX})")
+
+    def __call__(self, out: torch.Tensor) -> torch.Tensor:
+        out = out.detach()
+        if out.ndim == 4:
+            if self.max_channels:
+                out = out[:, :self.max_channels]
+            if self.mode == MAX:
+                out = out.amax(dim=1)
+            else:
+                out = out.float().mean(dim=1)
+        return out.cpu()
+
+
+def to_map(
+    feature: torch.Tensor,
+    max_channels: Optional[int] = None,
+    mode: str = MEAN,
+) -> torch.Tensor:
+    """Carte 2-D (float, non normalisée) d'une activation.
+
+    - ``[1, C, H, W]`` / ``[C, H, W]``: mean (or max) over the first
+      ``max_channels`` channels; a map already reduced in the hook is
+      ``[1, H, W]`` and passes through unchanged;
+    - ``[H, W]``: used as is;
+    - ``[1, N]`` / ``[N]`` and anything else: zero-padded to a square.
+    """
+    feature = feature.detach().cpu().float()
+    if feature.ndim == 4:
+        feature = feature[0]
+
+    if feature.ndim == 3:
+        return ChannelReduction(max_channels, mode)(feature.unsqueeze(0))[0]
+    if feature.ndim == 2 and feature.shape[0] != 1:
+        return feature
+    flat = feature.reshape(-1)
+    n = flat.numel()
+    side = int(math.ceil(math.sqrt(max(n, 1))))
+    padded = torch.zeros(side * side)
+    padded[:n] = flat
+    return padded.reshape(side, side)
+
+
+def normalize_maps(maps: Dict[str, torch.Tensor]) -> Dict[str, np.ndarray]:
+    """Normalise chaque carte sur [0, 255] (uint8).
+
+    Maps of the same shape are stacked and normalized in one vectorized
+    operation instead of one Python-level pass per layer.
+    """
+    by_shape: Dict[Tuple[int, ...], List[str]] = {}
+    for key, fmap in maps.items():
+        by_shape.setdefault(tuple(fmap.shape), []).append(key)
+
+    normalized: Dict[str, np.ndarray] = {}
+    for keys in by_shape.values():
+        stack = torch.stack([maps[k].float() for k in keys])
+        low = stack.amin(dim=(1, 2), keepdim=True)
+        high = stack.amax(dim=(1, 2), keepdim=True)
+        stack = (stack - low) / (high - low + 1e-6)
+        arrays = (stack * 255).clamp(0, 255).byte().numpy()
+        normalized.update(zip(keys, arrays))
+    return normalized
+
+
+def reduce_activation(
+    feature: torch.Tensor,
+    max_channels: Optional[int] = None,
+    mode: str = MEAN,
+) -> np.ndarray:
+    """Carte 2-D uint8 (normalisée sur [0, 255]) d'une activation."""
+    return normalize_maps({"map": to_map(feature, max_channels, mode)})["map"]
+
+
+def write_bundle(
+    base: PathLike,
+    original: Image.Image,
+    maps: Dict[str, np.ndarray],
+    files: Dict[str, Dict[str, Any]],
+    model_version: Optional[str] = None,
+    result: Optional[Dict[str, Any]] = None,
+) -> Path:
+    """Écrit le bundle et son manifeste dans ``base``.
+
+    ``original`` is the image already resized to the model input size,
+    ``maps`` the reduced maps by key and ``files`` the served file names
+    (``{"kind": "heatmap" | "overlay" | "original", "map": key}``).
+    ``result`` is the response payload returned again on a repeated
+    request. The manifest is written last: a directory without it is
+    incomplete. Concurrent writers of the same token use distinct
+    temporary files and the last rename wins.
+    """
+    base = Path(base)
+    base.mkdir(parents=True, exist_ok=True)
+
+    arrays = {f"map_{key}": value for key, value in maps.items()}
+    arrays["original"] = np.asarray(original.convert("RGB"), dtype=np.uint8)
+
+    suffix = f".{uuid.uuid4().hex}.tmp"
+    bundle = base / BUNDLE_FILE
+    tmp = base / (BUNDLE_FILE + suffix)
+    with open(tmp, "wb") as fh:
+        np.savez_compressed(fh, **arrays)
+    os.replace(tmp, bundle)
+
+    manifest = {
+        "size": list(original.size),
+        "model_version": model_version,
+        "files": files,
+        "result": result,
+    }
+    tmp = base / (MANIFEST_FILE + suffix)
+    tmp.write_text(json.dumps(manifest), encoding="utf-8")
+    os.replace(tmp, base / MANIFEST_FILE)
+    return bundle
+
+
+def read_manifest(base: PathLike) -> Optional[Dict[str, Any]]:
+    try:
+        with open(Path(base) / MANIFEST_FILE, "r", encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def bundle_exists(base: PathLike) -> bool:
+    base = Path(base)
+    return (base / MANIFEST_FILE).is_file() and (base / BUNDLE_FILE).is_file()
+
+
+def read_cached_result(base: PathLike) -> Optional[Dict[str, Any]]:
+    """Résultat stocké d'un bundle complet, ou None.
+
+    A hit refreshes the manifest mtime, which the reaper uses as the last
+    access time of the bundle.
+    """
+    if not (Path(base) / BUNDLE_FILE).is_file():
+        return None
+    manifest = read_manifest(base)
+    if manifest is None:
+        return None
+    try:
+        os.utime(Path(base) / MANIFEST_FILE)
+    except OSError:
+        pass
+    return manifest.get("result")
+
+
+def purge_model_bundles(root: PathLike, model_version: str) -> int:
+    """Supprime les bundles produits par ``model_version`` sous ``root``."""
+    root = Path(root)
+    if not root.is_dir():
+        return 0
+    removed = 0
+    for base in root.iterdir():
+        manifest = read_manifest(base) if base.is_dir() else None
+        if manifest and manifest.get("model_version") == model_version:
+            shutil.rmtree(base, ignore_errors=True)
+            removed += 1
+    if removed:
+        print(f"[ACTIVATIONS] purged {removed} bundle(s) of {model_version}")
+    return removed
+
+
+def file_extension(image_format: str) -> str:
+    """Extension des fichiers servis pour un format ("png", "webp", "jpeg").
+
+    Raises:
+        ValueError: format non supporté.
+    """
+    try:
+        return FORMAT_EXTENSIONS[image_format.lower()]
+    except KeyError:
+        raise ValueError(
+            f"Unsupported activation image format '{image_format}' "
+            f"(available: {', '.join(sorted(FORMAT_EXTENSIONS))})")
+
+
+def media_type_for(filename: str) -> str:
+    suffix = Path(filename).suffix.lower()
+    return IMAGE_FORMATS.get(suffix, IMAGE_FORMATS[".png"])[1]
+
+
+@dataclass(frozen=True)
+class EncoderOptions:
+    # zlib 0-9 : 1 encode plusieurs fois plus vite que 6 (défaut Pillow)
+    png_compress_level: int = 6
+    # WebP / JPEG
+    quality: int = 85
+
+
+def encode_image(
+    image: Image.Image,
+    filename: str,
+    options: Optional[EncoderOptions] = None,
+) -> bytes:
+    """Encode ``image`` au format indiqué par l'extension de ``filename``."""
+    options = options or EncoderOptions()
+    suffix = Path(filename).suffix.lower()
+    image_format = IMAGE_FORMATS.get(suffix, IMAGE_FORMATS[".png"])[0]
+    if image_format == "PNG":
+        params = {"compress_level": options.png_compress_level}
+    else:
+        params = {"quality": options.quality}
+
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format, **params)
+    return buffer.getvalue()
+
+
+def load_bundle(
+    base: PathLike,
+    filenames: Iterable[str],
+) -> Optional[Tuple[Dict[str, Dict[str, Any]], Image.Image,
+                    Dict[str, np.ndarray]]]:
+    """(specs des fichiers connus, original, cartes utiles) ou None.
+
+    The npz archive is read once, in the calling thread, for all the
+    requested files; the returned arrays can then be rendered in parallel.
+    """
+    manifest = read_manifest(base)
+    if manifest is None:
+        return None
+    known = manifest.get("files", {})
+    specs = {name: known[name] for name in filenames if name in known}
+    if not specs:
+        return None
+
+    with np.load(Path(base) / BUNDLE_FILE) as bundle:
+        original = Image.fromarray(bundle["original"], mode="RGB")
+        maps = {
+            spec["map"]: bundle[f"map_{spec['map']}"]
+            for spec in specs.values() if spec.get("map") is not None
+        }
+    return specs, original, maps
+
+
+def render_image(
+    spec: Dict[str, Any],
+    original: Image.Image,
+    maps: Dict[str, np.ndarray],
+) -> Image.Image:
+    kind = spec.get("kind")
+    if kind == ORIGINAL:
+        return original
+    fmap = Image.fromarray(maps[spec["map"]], mode="L")
+    heatmap = fmap.resize(original.size, Image.Resampling.BILINEAR)
+    if kind == OVERLAY:
+        return Image.blend(
+            original, heatmap.convert("RGB"), alpha=OVERLAY_ALPHA)
+    return heatmap
+
+
+def render_file(
+    base: PathLike,
+    filename: str,
+    options: Optional[EncoderOptions] = None,
+) -> Optional[bytes]:
+    """Image encodée d'un fichier du manifeste, ou None s'il est inconnu."""
+    loaded = load_bundle(base, [filename])
+    if loaded is None:
+        return None
+    specs, original, maps = loaded
+    return encode_image(
+        render_image(specs[filename], original, maps), filename, options)
+
+
+def bundle_etag(base: PathLike, *variant: Any) -> Optional[str]:
+    """ETag fort d'un bundle (manifeste + variante de rendu), ou None."""
+    try:
+        manifest = (Path(base) / MANIFEST_FILE).read_bytes()
+    except OSError:
+        return None
+    digest = hashlib.sha256(manifest)
+    digest.update(repr(variant).encode("utf-8"))
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+class _ChunkSink(io.RawIOBase):
+    """Flux non seekable qui accumule ce que ``zipfile`` y écrit."""
+
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_zip(entries: Iterable[Tuple[str, bytes]]) -> Iterator[bytes]:
+    """ZIP produit au fil de l'eau, un morceau par membre.
+
+    Members are stored without recompression (PNG/WebP/JPEG are already
+    compressed) and nothing is written to disk.
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED) as zf:
+        for name, data in entries:
+            zf.writestr(name, data)
+            yield sink.take()
+    yield sink.take()
+
+
+def build_sprite(
+    base: PathLike,
+    options: Optional[EncoderOptions] = None,
+) -> Optional[Tuple[bytes, Dict[str, Any]]]:
+    """Planche unique de toutes les images d'un bundle + positions.
+
+    Tiles follow the manifest order on a near-square grid. The atlas uses
+    the image format of the bundle files. Returns None for an unknown or
+    legacy (PNG on disk) token.
+    """
+    manifest = read_manifest(base)
+    if manifest is None:
+        return None
+    names = list(manifest.get("files", {}))
+    loaded = load_bundle(base, names)
+    if loaded is None:
+        return None
+    specs, original, maps = loaded
+
+    width, height = original.size
+    columns = max(int(math.ceil(math.sqrt(len(names)))), 1)
+    rows = int(math.ceil(len(names) / columns))
+    atlas = Image.new("RGB", (columns * width, rows * height))
+    frames: Dict[str, Dict[str, int]] = {}
+    for i, name in enumerate(names):
+        x, y = (i % columns) * width, (i // columns) * height
+        tile = render_image(specs[name], original, maps).convert("RGB")
+        atlas.paste(tile, (x, y))
+        frames[name] = {"x": x, "y": y, "w": width, "h": height}
+
+    sprite_name = "sprite" + Path(names[0]).suffix.lower()
+    data = encode_image(atlas, sprite_name, options)
+    return data, {
+        "media_type": media_type_for(sprite_name),
+        "tile": [width, height],
+        "columns": columns,
+        "frames": frames,
+    }
+
+
+class ActivationRenderer:
+    """Rendu à la demande des images d'activation, avec cache LRU.
+
+    Rendering and encoding run on a bounded thread pool (Pillow releases
+    the GIL while resizing and compressing), so concurrent image requests
+    cannot take more than ``workers`` cores.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        workers: int = 2,
+        encoder: Optional[EncoderOptions] = None,
+    ) -> None:
+        self.max_entries = max(int(max_entries), 0)
+        self.workers = max(int(workers), 1)
+        self.encoder = encoder or EncoderOptions()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers,
+            thread_name_prefix="activation-render",
+        )
+        self._lock = threading.Lock()
+        # (token dir, filename) -> encoded bytes
+        self._entries: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self._bytes = 0
+
+        self._hits = 0
+        self._misses = 0
+        self._renders = 0
+        self._render_ms_total = 0.0
+
+    def submit(
+        self,
+        base: PathLike,
+        filename: str,
+    ) -> "Future[Optional[bytes]]":
+        """Rendu d'un fichier sur le pool (à attendre côté appelant)."""
+        return self._executor.submit(self.render, base, filename)
+
+    def render(self, base: PathLike, filename: str) -> Optional[bytes]:
+        return self.render_many(base, [filename])[filename]
+
+    def render_all(self, base: PathLike) -> Optional[Dict[str, bytes]]:
+        """Tous les fichiers d'un bundle, dans l'ordre du manifeste."""
+        manifest = read_manifest(base)
+        if manifest is None:
+            return None
+        rendered = self.render_many(base, manifest.get("files", {}))
+        return {name: data for name, data in rendered.items() if data}
+
+    def submit_sprite(
+        self,
+        base: PathLike,
+    ) -> "Future[Optional[Tuple[bytes, Dict[str, Any]]]]":
+        """Planche du bundle (``build_sprite``) calculée sur le pool."""
+        return self._executor.submit(build_sprite, base, self.encoder)
+
+    def render_many(
+        self,
+        base: PathLike,
+        filenames: Iterable[str],
+    ) -> Dict[str, Optional[bytes]]:
+        """Rendus de plusieurs fichiers d'un même bundle.
+
+        The bundle is loaded once and the missing renders are spread over
+        the pool. Must not be called from a pool thread with more than one
+        missing file.
+        """
+        filenames = list(dict.fromkeys(filenames))
+        results: Dict[str, Optional[bytes]] = {}
+        missing: List[str] = []
+        with self._lock:
+            for name in filenames:
+                key = (str(base), name)
+                data = self._entries.get(key)
+                if data is not None:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    results[name] = data
+                else:
+                    self._misses += 1
+                    missing.append(name)
+        if not missing:
+            return results
+
+        loaded = load_bundle(base, missing)
+        if loaded is None:
+            results.update({name: None for name in missing})
+            return results
+        specs, original, maps = loaded
+
+        def _render(name: str) -> Tuple[str, bytes, float]:
+            started = time.perf_counter()
+            data = encode_image(
+                render_image(specs[name], original, maps),
+                name, self.encoder)
+            return name, data, (time.perf_counter() - started) * 1000.0
+
+        known = [name for name in missing if name in specs]
+        if len(known) == 1:
+            rendered = [_render(known[0])]
+        else:
+            rendered = list(self._executor.map(_render, known))
+
+        with self._lock:
+            for name, data, elapsed_ms in rendered:
+                self._renders += 1
+                self._render_ms_total += elapsed_ms
+                key = (str(base), name)
+                if self.max_entries and key not in self._entries:
+                    self._entries[key] = data
+                    self._bytes += len(data)
+            while len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+        results.update({name: data for name, data, _ in rendered})
+        for name in missing:
+            results.setdefault(name, None)
+        return results
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self._bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": (self._hits / lookups) if lookups else 0.0,
+                "workers": self.workers,
+                "renders": self._renders,
+                "avg_render_ms": (
+                    self._render_ms_total / self._renders
+                    if self._renders else 0.0),
+            }
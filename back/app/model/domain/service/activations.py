@@ -1,7 +1,6 @@
 # app/model/domain/service/activations.py
 from __future__ import annotations
 
-import math
 import os
 import uuid
 from pathlib import Path
@@ -11,6 +10,20 @@ import torch
 from PIL import Image
 from torch import nn
 
+from app.model.domain.service.activation_store import (
+    BUNDLE_FILE,
+    HEATMAP,
+    MEAN,
+    ORIGINAL,
+    ORIGINAL_STEM,
+    OVERLAY,
+    ChannelReduction,
+    file_extension,
+    normalize_maps,
+    read_cached_result,
+    to_map,
+    write_bundle,
+)
 from app.model.domain.service.transforms import (
     open_image_from_bytes,
     default_preprocess,
@@ -23,6 +36,9 @@ class ActivationGenerator:
     By default every first-level child module is hooked so the user sees the
     output after *each layer* in execution order.  The ``display_name`` of
     each item is the PyTorch class name (``Conv2d``, ``ReLU``, …).
+
+    Only the reduced activation maps are stored (see ``activation_store``);
+    the heatmap and overlay PNGs are rendered when their URL is requested.
     """
 
     def __init__(
@@ -54,73 +70,6 @@ class ActivationGenerator:
         # Model has no children (single layer) → return itself
         return [("model", model)]
 
-    # ------------------------------------------------------------------
-    # Helpers – image processing
-    # ------------------------------------------------------------------
-
-    def _normalize_01(self, t: torch.Tensor) -> torch.Tensor:
-        t_min = float(t.min())
-        t_max = float(t.max())
-        return (t - t_min) / (t_max - t_min + 1e-6)
-
-    def _feature_to_heatmap(self, feature: torch.Tensor) -> Image.Image:
-        """Convert any activation tensor to a grayscale heatmap image.
-
-        Handles:
-        - [1, C, H, W] or [C, H, W]  → mean over C → 2-D map
-        - [H, W]                      → direct 2-D map
-        - [1, N] or [N]               → reshape to closest square
-        """
-        if feature.ndim == 4:
-            feature = feature[0]
-
-        if feature.ndim == 3:
-            # Spatial feature map – mean over channels
-            fmap = feature.float().mean(dim=0)
-        elif feature.ndim == 2 and feature.shape[0] == 1:
-            # [1, N] after Linear – reshape to square
-            fmap = feature[0].float()
-            n = fmap.numel()
-            side = int(math.ceil(math.sqrt(n)))
-            padded = torch.zeros(side * side)
-            padded[:n] = fmap
-            fmap = padded.reshape(side, side)
-        elif feature.ndim == 2:
-            # [H, W] – already spatial
-            fmap = feature.float()
-        elif feature.ndim == 1:
-            # [N] – reshape to square
-            fmap = feature.float()
-            n = fmap.numel()
-            side = int(math.ceil(math.sqrt(n)))
-            padded = torch.zeros(side * side)
-            padded[:n] = fmap
-            fmap = padded.reshape(side, side)
-        else:
-            fmap = feature.detach().cpu().float().reshape(-1)
-            n = fmap.numel()
-            side = int(math.ceil(math.sqrt(max(n, 1))))
-            padded = torch.zeros(side * side)
-            padded[:n] = fmap
-            fmap = padded.reshape(side, side)
-
-        fmap = self._normalize_01(fmap)
-        arr = (fmap * 255).clamp(0, 255).byte().cpu().numpy()
-        return Image.fromarray(arr, mode="L")
-
-    @staticmethod
-    def _resize_to(img: Image.Image, size: Tuple[int, int]) -> Image.Image:
-        return img.resize(size, Image.Resampling.BILINEAR)
-
-    @staticmethod
-    def _heatmap_to_overlay(
-        original_rgb: Image.Image,
-        heatmap_l: Image.Image,
-        alpha: float = 0.45,
-    ) -> Image.Image:
-        hm_rgb = heatmap_l.convert("RGB")
-        return Image.blend(original_rgb, hm_rgb, alpha=alpha)
-
     # ------------------------------------------------------------------
     # Core generation
     # ------------------------------------------------------------------
@@ -137,9 +86,30 @@ class ActivationGenerator:
         include_heatmaps: bool = True,
         include_overlays: bool = True,
         device: Optional[torch.device] = None,
+        token: Optional[str] = None,
+        model_version: Optional[str] = None,
+        image_format: str = "png",
+        max_channels: Optional[int] = None,
+        reduction: str = MEAN,
     ) -> Dict[str, Any]:
+        """Capture les activations et stocke leur bundle.
+
+        With a deterministic ``token`` (see ``activation_token``) an
+        existing bundle is returned as is, without a forward pass.
+        ``image_format`` ("png", "webp" or "jpeg") sets the extension, and
+        thus the encoding, of the files rendered from the bundle. Heatmaps
+        are the ``reduction`` ("mean" or "max") of the first
+        ``max_channels`` channels (all of them when None).
+        """
+        ext = file_extension(image_format)
         device = device or self.device
 
+        if token is not None:
+            cached = read_cached_result(
+                Path(self.uploads_dir) / "activations" / token)
+            if cached is not None:
+                return cached
+
         model.eval()
         model.to(device)
 
@@ -161,7 +131,11 @@ class ActivationGenerator:
         layers_to_hook = [name for name, _ in children_info]
 
         # ----- Register hooks (ordered list preserves execution order) -----
-        ordered_activations: List[Tuple[str, str, torch.Tensor]] = []
+        # Channels are reduced inside the hook: only an [1, H, W] map per
+        # layer is copied and kept, never the full feature map.
+        reducer = ChannelReduction(max_channels, reduction)
+        ordered_activations: List[
+            Tuple[str, str, List[int], torch.Tensor]] = []
         hooks: List[torch.utils.hooks.RemovableHandle] = []
 
         def _make_hook(lname: str, disp: str):
@@ -171,7 +145,7 @@ class ActivationGenerator:
                         out = out[0]
                     if torch.is_tensor(out):
                         ordered_activations.append(
-                            (lname, disp, out.detach().cpu())
+                            (lname, disp, list(out.shape), reducer(out))
                         )
                 except Exception:
                     pass
@@ -205,105 +179,78 @@ class ActivationGenerator:
             except Exception:
                 pass
 
-        # ----- Save images -----
-        token = str(uuid.uuid4())
+        # ----- Store the bundle (images are rendered on demand) -----
+        token = token or str(uuid.uuid4())
         base = Path(self.uploads_dir) / "activations" / token
-        base.mkdir(parents=True, exist_ok=True)
 
         items: List[Dict[str, Any]] = []
-        target_size = (input_size, input_size)
-
-        # Original
-        original_path = base / "original.png"
-        try:
-            original.save(original_path)
-            items.append({
-                "step": -1,
-                "layer": "original",
-                "display_name": "Original",
-                "type": "original",
-                "shape": [1, 3, input_size, input_size],
-                "file": str(original_path),
-                "url": f"/pictures/activations/{token}/image/original.png",
-            })
-        except Exception:
-            pass
-
-        original_resized = self._resize_to(original, target_size)
-
-        for step_idx, (layer_name, disp_name, feat) in enumerate(
+        original_file = f"{ORIGINAL_STEM}{ext}"
+        files: Dict[str, Dict[str, Any]] = {
+            original_file: {"kind": ORIGINAL, "map": None},
+        }
+        original_resized = original.resize(
+            (input_size, input_size), Image.Resampling.BILINEAR)
+
+        items.append({
+            "step": -1,
+            "layer": "original",
+            "display_name": "Original",
+            "type": "original",
+            "shape": [1, 3, input_size, input_size],
+            "url": f"/pictures/activations/{token}/image/{original_file}",
+        })
+
+        kinds = []
+        if include_heatmaps:
+            kinds.append(HEATMAP)
+        if include_overlays:
+            kinds.append(OVERLAY)
+
+        reduced: Dict[str, torch.Tensor] = {}
+        for step_idx, (layer_name, disp_name, shape, feat) in enumerate(
             ordered_activations
         ):
-            shape = list(feat.shape) if torch.is_tensor(feat) else None
             safe_name = layer_name.replace(".", "_")
+            key = f"{step_idx:02d}"
 
-            heatmap_img = None
-            if include_heatmaps:
-                try:
-                    hm = self._feature_to_heatmap(feat)
-                    hm = self._resize_to(hm, target_size)
-                    fname = f"step_{step_idx:02d}_{safe_name}_heatmap.png"
-                    path = base / fname
-                    hm.save(path)
-                    items.append({
-                        "step": step_idx,
-                        "layer": layer_name,
-                        "display_name": disp_name,
-                        "type": "heatmap",
-                        "shape": shape,
-                        "file": str(path),
-                        "url": (
-                            f"/pictures/activations/{token}/image/{fname}"
-                        ),
-                    })
-                    heatmap_img = hm
-                except Exception as e:
-                    items.append({
-                        "step": step_idx,
-                        "layer": layer_name,
-                        "display_name": disp_name,
-                        "type": "heatmap",
-                        "shape": shape,
-                        "error": str(e),
-                    })
-
-            if include_overlays:
-                try:
-                    if heatmap_img is None:
-                        hm = self._feature_to_heatmap(feat)
-                        heatmap_img = self._resize_to(hm, target_size)
-                    ov = self._heatmap_to_overlay(
-                        original_resized, heatmap_img, alpha=0.45,
-                    )
-                    fname = f"step_{step_idx:02d}_{safe_name}_overlay.png"
-                    path = base / fname
-                    ov.save(path)
-                    items.append({
-                        "step": step_idx,
-                        "layer": layer_name,
-                        "display_name": disp_name,
-                        "type": "overlay",
-                        "shape": shape,
-                        "file": str(path),
-                        "url": (
-                            f"/pictures/activations/{token}/image/{fname}"
-                        ),
-                    })
-                except Exception as e:
+            try:
+                if kinds:
+                    reduced[key] = to_map(feat)
+            except Exception as e:
+                for kind in kinds:
                     items.append({
                         "step": step_idx,
                         "layer": layer_name,
                         "display_name": disp_name,
-                        "type": "overlay",
+                        "type": kind,
                         "shape": shape,
                         "error": str(e),
                     })
-
-        return {
+                continue
+
+            for kind in kinds:
+                fname = f"step_{step_idx:02d}_{safe_name}_{kind}{ext}"
+                files[fname] = {"kind": kind, "map": key}
+                items.append({
+                    "step": step_idx,
+                    "layer": layer_name,
+                    "display_name": disp_name,
+                    "type": kind,
+                    "shape": shape,
+                    "url": f"/pictures/activations/{token}/image/{fname}",
+                })
+
+        maps = normalize_maps(reduced)
+
+        result = {
             "token": token,
             "layers_requested": layers_to_hook,
+            "bundle": str(base / BUNDLE_FILE),
             "items": items,
         }
+        write_bundle(base, original_resized, maps, files,
+                     model_version=model_version, result=result)
+        return result
 
 
 # ------------------------------------------------------------------
@@ -325,6 +272,11 @@ def generate_activations(
     include_overlays: bool = True,
     uploads_dir: Optional[str] = None,
     device: Optional[torch.device] = None,
+    token: Optional[str] = None,
+    model_version: Optional[str] = None,
+    image_format: str = "png",
+    max_channels: Optional[int] = None,
+    reduction: str = MEAN,
 ) -> Dict[str, Any]:
     """Backward-compatible wrapper around ``ActivationGenerator``."""
     gen = _DEFAULT_ACTIVATION_GENERATOR
@@ -344,4 +296,9 @@ def generate_activations(
         include_heatmaps=include_heatmaps,
         include_overlays=include_overlays,
         device=device,
+        token=token,
+        model_version=model_version,
+        image_format=image_format,
+        max_channels=max_channels,
+        reduction=reduction,
     )
@@ -0,0 +1,157 @@
+# app/model/domain/service/active_model_registry.py
+"""In-process cache of the active model row.
+
+Every inference used to query ``models`` for the active row. The registry
+keeps a detached snapshot of that row and only re-reads it when it has been
+invalidated locally (``set_active_model`` in this worker) or when the poll
+interval has elapsed, which is how a switch made by another uvicorn worker
+or pod is picked up.
+
+When the active model changes, the previous version is retired and evicted
+from the model caches once ``eviction_grace_s`` has passed, so in-flight
+requests can finish on the old module while memory stays bounded.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+
+@dataclass(frozen=True)
+class ActiveModelInfo:
+    """Snapshot of the active ``Model`` row, safe to share across sessions."""
+
+    model_id: Any
+    name: str
+    path: str
+    input_size: int
+
+    @classmethod
+    def from_entity(cls, model) -> "ActiveModelInfo":
+        return cls(
+            model_id=model.model_id,
+            name=model.name,
+            path=model.path,
+            input_size=int(getattr(model, "input_size", None) or 384),
+        )
+
+
+class ActiveModelRegistry:
+    def __init__(
+        self,
+        poll_interval_s: float = 2.0,
+        eviction_grace_s: float = 60.0,
+        on_evict: Optional[Callable[[str], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.poll_interval_s = max(float(poll_interval_s), 0.0)
+        self.eviction_grace_s = max(float(eviction_grace_s), 0.0)
+        self._on_evict = on_evict
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._active: Optional[ActiveModelInfo] = None
+        self._checked_at: Optional[float] = None
+        self._retired: Dict[str, float] = {}
+        self._listeners: List[Callable[[Optional[ActiveModelInfo],
+                                        Optional[ActiveModelInfo]], None]] = []
+
+        self._hits = 0
+        self._reloads = 0
+        self._switches = 0
+        self._evictions = 0
+
+    def resolve(self, catalog) -> Optional[ActiveModelInfo]:
+        """Retourne le modèle actif, en ne requêtant la base qu'au besoin."""
+        now = self._clock()
+        with self._lock:
+            if (
+                self._checked_at is not None
+                and now - self._checked_at < self.poll_interval_s
+            ):
+                self._hits += 1
+                active = self._active
+                self._collect_retired(now)
+                return active
+
+        entity = catalog.find_active_model()
+        info = ActiveModelInfo.from_entity(entity) if entity else None
+
+        with self._lock:
+            self._reloads += 1
+            previous = self._active
+            self._active = info
+            self._checked_at = now
+            changed = self._track_switch(previous, info, now)
+            self._collect_retired(now)
+
+        if changed:
+            for listener in list(self._listeners):
+                try:
+                    listener(previous, info)
+                except Exception as e:
+                    print(f"[WARN] active model listener failed: {e}")
+        return info
+
+    def invalidate(self) -> None:
+        """Force une relecture du modèle actif au prochain ``resolve``."""
+        with self._lock:
+            self._checked_at = None
+
+    def add_listener(
+        self,
+        listener: Callable[[Optional[ActiveModelInfo],
+                            Optional[ActiveModelInfo]], None],
+    ) -> None:
+        """Appelé avec (ancien, nouveau) à chaque changement observé."""
+        self._listeners.append(listener)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "active": self._active.path if self._active else None,
+                "hits": self._hits,
+                "reloads": self._reloads,
+                "switches": self._switches,
+                "evictions": self._evictions,
+                "retired": sorted(self._retired),
+            }
+
+    # ------------------------------------------------------------------
+    # Internals (lock held)
+    # ------------------------------------------------------------------
+
+    def _track_switch(
+        self,
+        previous: Optional[ActiveModelInfo],
+        current: Optional[ActiveModelInfo],
+        now: float,
+    ) -> bool:
+        prev_path = previous.path if previous else None
+        cur_path = current.path if current else None
+        if cur_path is not None:
+            # Re-activated before its grace period ended: keep it.
+            self._retired.pop(cur_path, None)
+        if prev_path == cur_path:
+            return previous != current
+        if prev_path is not None:
+            self._switches += 1
+            self._retired[prev_path] = now
+        return True
+
+    def _collect_retired(self, now: float) -> None:
+        expired = [
+            version for version, retired_at in self._retired.items()
+            if now - retired_at >= self.eviction_grace_s
+        ]
+        for version in expired:
+            del self._retired[version]
+            self._evictions += 1
+            if self._on_evict is not None:
+                try:
+                    self._on_evict(version)
+                except Exception as e:
+                    print(f"[WARN] eviction failed for {version}: {e}")
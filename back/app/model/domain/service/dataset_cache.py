@@ -0,0 +1,344 @@
+# app/model/domain/service/dataset_cache.py
+"""Decoded-image cache for training (memory-mapped uint8 shards).
+
+``RoomDataset`` decodes and resizes a JPEG on every access. Over several
+epochs that costs more than the forward pass of the scratch models. The
+cache decodes each validated picture once to a ``size x size x 3`` uint8
+slot of a shard file (``shard-00000.u8``, ``shard_size`` slots each). The
+slot is then read through ``numpy.memmap``: the page cache keeps the
+pixels warm across epochs, DataLoader workers and training runs.
+
+``index.json`` maps a picture id to its slot and to the digest of its
+file. ``sync`` makes the cache match the pictures being trained on:
+
+- new picture: decoded into a free slot;
+- file changed (other digest): decoded again;
+- file gone (picture deleted): entry dropped, slot freed;
+- relabelled picture: nothing to do, labels come from the records.
+
+Pixels are flushed before the index is replaced, so a crash mid-sync at
+worst decodes a few pictures again. Syncs are serialised by a flock on
+``index.lock``. A training holds a shared flock on ``readers.lock`` while
+it reads slots, and freed slots are only reused when no training holds it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import torch
+from PIL import Image
+from torch.utils.data import Dataset
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non POSIX
+    fcntl = None
+
+PathLike = Union[str, Path]
+
+INDEX_VERSION = 1
+
+
+def _lock(fh, shared: bool = False, blocking: bool = True) -> bool:
+    """flock sur ``fh`` ; False si ``blocking=False`` et déjà pris."""
+    if fcntl is None:
+        return True
+    operation = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+    if not blocking:
+        operation |= fcntl.LOCK_NB
+    try:
+        fcntl.flock(fh, operation)
+    except OSError:
+        return False
+    return True
+
+
+def decode_image(path: PathLike, size: int) -> np.ndarray:
+    """Même résultat que Resize((size, size)) + ToTensor, en uint8 HWC."""
+    with Image.open(path) as image:
+        image = image.convert("RGB").resize(
+            (size, size), Image.BILINEAR)
+        return np.asarray(image, dtype=np.uint8)
+
+
+class DatasetCache:
+    def __init__(
+        self,
+        root: PathLike,
+        size: int = 224,
+        shard_size: int = 256,
+        workers: int = 1,
+    ) -> None:
+        self.root = Path(root)
+        self.size = int(size)
+        self.shard_size = max(int(shard_size), 1)
+        # Threads de décodage (PIL relâche le GIL pendant le décodage)
+        self.workers = max(int(workers), 1)
+
+    # ------------------------------------------------------------------
+    # Layout
+    # ------------------------------------------------------------------
+
+    @property
+    def index_path(self) -> Path:
+        return self.root / "index.json"
+
+    def shard_path(self, shard: int) -> Path:
+        return self.root / f"shard-{shard:05d}.u8"
+
+    def open_shard(self, shard: int, mode: str = "r") -> np.memmap:
+        path = self.shard_path(shard)
+        if mode != "r" and not path.exists():
+            mode = "w+"
+        return np.memmap(
+            path,
+            dtype=np.uint8,
+            mode=mode,
+            shape=(self.shard_size, self.size, self.size, 3),
+        )
+
+    # ------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------
+
+    def _empty_index(self) -> Dict[str, Any]:
+        return {
+            "version": INDEX_VERSION,
+            "size": self.size,
+            "shard_size": self.shard_size,
+            "next": 0,
+            "free": [],
+            "entries": {},
+        }
+
+    def load_index(self) -> Dict[str, Any]:
+        try:
+            index = json.loads(self.index_path.read_text())
+        except (OSError, ValueError):
+            return self._empty_index()
+        layout = (index.get("version"), index.get("size"),
+                  index.get("shard_size"))
+        if layout != (INDEX_VERSION, self.size, self.shard_size):
+            # Autre taille d'image / de shard : on repart de zéro
+            for path in self.root.glob("shard-*.u8"):
+                path.unlink(missing_ok=True)
+            return self._empty_index()
+        return index
+
+    def _save_index(self, index: Dict[str, Any]) -> None:
+        tmp = self.index_path.with_name(
+            f".{self.index_path.name}.{uuid.uuid4().hex}.tmp")
+        tmp.write_text(json.dumps(index))
+        os.replace(tmp, self.index_path)
+
+    # ------------------------------------------------------------------
+    # Sync
+    # ------------------------------------------------------------------
+
+    def open(
+        self, records: List[Dict[str, Any]], images_dir: PathLike = ""
+    ) -> "CachedRoomDataset":
+        """Synchronise le cache puis renvoie le dataset qui le lit."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        readers = open(self.root / "readers.lock", "a")
+        try:
+            with open(self.root / "index.lock", "a") as index_lock:
+                _lock(index_lock)
+                # Aucun entraînement en cours : les slots libres sont
+                # réutilisables
+                reuse = _lock(readers, blocking=False)
+                kept, slots = self._sync(
+                    records, Path(images_dir), reuse_free=reuse)
+                # Lecture protégée jusqu'à dataset.close()
+                _lock(readers, shared=True)
+        except BaseException:
+            readers.close()
+            raise
+        return CachedRoomDataset(
+            kept, self, slots, reader_lock=readers)
+
+    def sync(
+        self, records: List[Dict[str, Any]], images_dir: PathLike = ""
+    ) -> Tuple[List[Dict[str, Any]], List[Tuple[int, int]]]:
+        """Comme ``open`` sans garder de verrou de lecture."""
+        dataset = self.open(records, images_dir)
+        dataset.close()
+        return dataset.records, dataset.slots
+
+    def _sync(
+        self,
+        records: List[Dict[str, Any]],
+        images_dir: Path,
+        reuse_free: bool,
+    ) -> Tuple[List[Dict[str, Any]], List[Tuple[int, int]]]:
+        index = self.load_index()
+        entries: Dict[str, Dict[str, Any]] = index["entries"]
+        counts = {"hits": 0, "decoded": 0, "evicted": 0, "failed": 0}
+
+        # Pictures supprimées : leur fichier a disparu
+        for picture_id, entry in list(entries.items()):
+            if not os.path.exists(entry["path"]):
+                index["free"].append([entry["shard"], entry["slot"]])
+                del entries[picture_id]
+                counts["evicted"] += 1
+
+        def allocate() -> List[int]:
+            if reuse_free and index["free"]:
+                return index["free"].pop()
+            position = index["next"]
+            index["next"] += 1
+            return [position // self.shard_size, position % self.shard_size]
+
+        pending = []
+        for record in records:
+            picture_id = str(record["picture_id"])
+            path = images_dir / record["filename"]
+            try:
+                stat = os.stat(path)
+            except OSError as e:
+                print(f"[WARN] dataset cache: {path} skipped: {e}")
+                counts["failed"] += 1
+                continue
+            entry = entries.get(picture_id)
+            digest = self._digest(path, stat, entry)
+            if entry is not None and entry["digest"] == digest:
+                counts["hits"] += 1
+                continue
+            if entry is not None and not reuse_free:
+                # Un entraînement peut encore lire l'ancien contenu
+                index["free"].append([entry["shard"], entry["slot"]])
+                entry = None
+            shard, slot = (
+                (entry["shard"], entry["slot"]) if entry else allocate())
+            pending.append((picture_id, path, stat, digest, shard, slot))
+
+        decoded = self._decode_all(pending)
+        for picture_id, path, stat, digest, shard, slot in pending:
+            if picture_id not in decoded:
+                counts["failed"] += 1
+                index["free"].append([shard, slot])
+                entries.pop(picture_id, None)
+                continue
+            entries[picture_id] = {
+                "digest": digest,
+                "path": str(path),
+                "stat": [stat.st_size, stat.st_mtime_ns],
+                "shard": shard,
+                "slot": slot,
+            }
+            counts["decoded"] += 1
+        self._save_index(index)
+        print(f"[TRAINING] dataset cache {self.root}: {counts}")
+
+        kept, slots = [], []
+        for record in records:
+            entry = entries.get(str(record["picture_id"]))
+            if entry is not None:
+                kept.append(record)
+                slots.append((entry["shard"], entry["slot"]))
+        return kept, slots
+
+    def _decode_all(self, pending) -> set:
+        """Décode et écrit les slots ; renvoie les ids réussis."""
+        if not pending:
+            return set()
+
+        def decode(item):
+            picture_id, path = item[0], item[1]
+            try:
+                return picture_id, decode_image(path, self.size)
+            except Exception as e:
+                print(f"[WARN] dataset cache: {path} not decoded: {e}")
+                return picture_id, None
+
+        shards: Dict[int, np.memmap] = {}
+        done = set()
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            results = pool.map(decode, pending)
+            for item, (picture_id, pixels) in zip(pending, results):
+                if pixels is None:
+                    continue
+                shard, slot = item[4], item[5]
+                if shard not in shards:
+                    shards[shard] = self.open_shard(shard, mode="r+")
+                shards[shard][slot] = pixels
+                done.add(picture_id)
+        for array in shards.values():
+            array.flush()
+        return done
+
+    @staticmethod
+    def _digest(
+        path: Path, stat: os.stat_result, entry: Optional[Dict[str, Any]]
+    ) -> str:
+        name = path.name.split(".", 1)[0]
+        if len(name) == 64 and all(c in "0123456789abcdef" for c in name):
+            # Blob du ContentStore : son nom identifie déjà son contenu
+            return name
+        if (entry is not None and entry["path"] == str(path)
+                and entry["stat"] == [stat.st_size, stat.st_mtime_ns]):
+            return entry["digest"]
+        with open(path, "rb") as fh:
+            return hashlib.file_digest(fh, "sha256").hexdigest()
+
+
+class CachedRoomDataset(Dataset):
+    """RoomDataset lu depuis le cache : mêmes records, room_to_idx et
+    tenseurs (float CHW dans [0, 1]) sans décodage JPEG."""
+
+    def __init__(
+        self,
+        records: List[Dict[str, Any]],
+        cache: DatasetCache,
+        slots: List[Tuple[int, int]],
+        transform=None,
+        reader_lock=None,
+    ):
+        self.records = records
+        self.cache = cache
+        self.slots = slots
+        self.transform = transform
+        self._reader_lock = reader_lock
+        self._shards: Dict[int, np.memmap] = {}
+
+        rooms = sorted({r["room"] for r in records})
+        self.room_to_idx = {room: i for i, room in enumerate(rooms)}
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, idx):
+        shard, slot = self.slots[idx]
+        if shard not in self._shards:
+            # Ouvert paresseusement : chaque worker a ses propres mappings
+            self._shards[shard] = self.cache.open_shard(shard)
+        pixels = np.array(self._shards[shard][slot])
+        image = torch.from_numpy(pixels).permute(2, 0, 1).float().div_(255)
+        if self.transform:
+            image = self.transform(image)
+        return image, self.room_to_idx[self.records[idx]["room"]]
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_shards"] = {}
+        state["_reader_lock"] = None
+        return state
+
+    def close(self) -> None:
+        """Libère le verrou de lecture (slots réutilisables)."""
+        self._shards = {}
+        if self._reader_lock is not None:
+            # LOCK_UN explicite : des DataLoader workers forkés partagent
+            # encore le descripteur
+            if fcntl is not None:
+                fcntl.flock(self._reader_lock, fcntl.LOCK_UN)
+            self._reader_lock.close()
+            self._reader_lock = None
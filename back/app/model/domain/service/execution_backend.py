@@ -0,0 +1,134 @@
+# app/model/domain/service/execution_backend.py
+"""Pluggable execution backends for ``load_model``.
+
+A backend turns a checkpoint path into an ``nn.Module``-compatible callable
+so the rest of the inference path (batcher, executor, post-processing) is
+unchanged. ``torch`` is the default and keeps the historical loading logic.
+``onnxruntime`` runs ``<stem>.onnx``, exported at training time next to the
+TorchScript ``.pth``; it shares the ``<stem>-label.json`` /
+``<stem>-preprocess.json`` sidecars of the checkpoint.
+
+onnxruntime is imported lazily: it is only required when the backend is
+selected (``INFERENCE_BACKEND=onnxruntime``).
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+import torch
+from torch import nn
+
+PathLike = Union[str, Path]
+
+TORCH = "torch"
+ONNXRUNTIME = "onnxruntime"
+
+
+def onnx_artifact_path(checkpoint: PathLike) -> Path:
+    return Path(checkpoint).with_suffix(".onnx")
+
+
+class OnnxRuntimeModule(nn.Module):
+    """Module exécutant un graphe ONNX avec onnxruntime (CPU).
+
+    Has no submodules, so activation hooks find no layer and the
+    inference path returns predictions without activations.
+    """
+
+    def __init__(self, path: PathLike, intra_op_threads: int = 0) -> None:
+        super().__init__()
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = (
+            ort.GraphOptimizationLevel.ORT_ENABLE_ALL)
+        if intra_op_threads > 0:
+            options.intra_op_num_threads = intra_op_threads
+
+        self.path = str(path)
+        self.nbytes = os.path.getsize(self.path)
+        self.session = ort.InferenceSession(
+            self.path, options, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        inputs = {
+            self.input_name: x.detach().cpu().contiguous().numpy(),
+        }
+        logits = self.session.run(None, inputs)[0]
+        return torch.from_numpy(logits)
+
+
+def export_onnx(
+    model: nn.Module,
+    checkpoint: PathLike,
+    sample: torch.Tensor,
+    opset_version: int = 17,
+) -> Path:
+    """Exporte ``<stem>.onnx`` (batch dynamique) à côté du checkpoint."""
+    dest = onnx_artifact_path(checkpoint)
+    tmp = dest.with_name(dest.name + ".tmp")
+    model = model.to("cpu").eval()
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (sample.to("cpu"),),
+            str(tmp),
+            input_names=["input"],
+            output_names=["logits"],
+            dynamic_axes={"input": {0: "batch"}, "logits": {0: "batch"}},
+            opset_version=opset_version,
+            dynamo=False,
+        )
+    os.replace(tmp, dest)
+    print(f"[EXPORT] onnx model saved to {dest}")
+    return dest
+
+
+def _load_onnxruntime(checkpoint: PathLike) -> Optional[nn.Module]:
+    from app.config import settings
+
+    path = onnx_artifact_path(checkpoint)
+    if not path.is_file():
+        return None
+    return OnnxRuntimeModule(
+        path, intra_op_threads=settings.ONNXRUNTIME_THREADS)
+
+
+# name -> loader(checkpoint) ; None = pas d'artefact pour ce backend
+_BACKENDS: Dict[str, Callable[[PathLike], Optional[nn.Module]]] = {
+    TORCH: lambda checkpoint: None,
+    ONNXRUNTIME: _load_onnxruntime,
+}
+
+
+def register_backend(
+    name: str,
+    loader: Callable[[PathLike], Optional[nn.Module]],
+) -> None:
+    _BACKENDS[name] = loader
+
+
+def available_backends() -> List[str]:
+    return sorted(_BACKENDS)
+
+
+def load_backend_module(
+    backend: str,
+    checkpoint: PathLike,
+) -> Optional[nn.Module]:
+    """Module du backend pour ``checkpoint``, ou None pour le chargement torch.
+
+    Raises:
+        ValueError: backend inconnu.
+    """
+    try:
+        loader = _BACKENDS[backend]
+    except KeyError:
+        raise ValueError(
+            f"Unknown inference backend '{backend}' "
+            f"(available: {', '.join(available_backends())})")
+    return loader(checkpoint)
@@ -0,0 +1,314 @@
+# app/model/domain/service/inference_batcher.py
+"""Dynamic micro-batching for single-image inference requests.
+
+Concurrent callers submit a ``[1, C, H, W]`` tensor and block until their
+result is ready. A dispatcher thread collects pending requests and flushes
+them as one ``[N, C, H, W]`` forward pass as soon as ``max_batch_size``
+requests are queued or the oldest request has waited ``max_wait_ms``.
+Top-k results (and optional hooked activations) are then scattered back to
+each caller.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import torch
+from torch import nn
+
+
+@dataclass
+class BatchResult:
+    """Per-request output of a (possibly batched) forward pass."""
+
+    indices: List[int]
+    scores: List[float]
+    activations: Dict[str, torch.Tensor] = field(default_factory=dict)
+    batch_size: int = 1
+    queue_ms: float = 0.0
+
+
+@dataclass
+class _PendingRequest:
+    model: nn.Module
+    model_version: str
+    tensor: torch.Tensor
+    top_k: int
+    capture_layers: List[str]
+    future: Future
+    enqueued_at: float
+    activation_reduction: Optional[Callable[[torch.Tensor],
+                                            torch.Tensor]] = None
+
+    @property
+    def group_key(self) -> Tuple[Any, ...]:
+        # Hooks are shared by the whole batch: one reduction per batch
+        reduction = (
+            self.activation_reduction if self.capture_layers else None)
+        return (id(self.model), self.model_version,
+                tuple(self.tensor.shape[1:]), reduction)
+
+
+def run_batch(
+    model: nn.Module,
+    batch: torch.Tensor,
+    top_k: List[int],
+    capture_layers: Optional[List[List[str]]] = None,
+    activation_reduction: Optional[Callable[[torch.Tensor],
+                                            torch.Tensor]] = None,
+) -> List[BatchResult]:
+    """Run one forward pass over ``batch`` and split the outputs per row.
+
+    ``top_k[i]`` and ``capture_layers[i]`` apply to row ``i``. Activations are
+    captured with forward hooks registered on the union of requested layers
+    and sliced back to ``[1, ...]`` for each row. ``activation_reduction``
+    (e.g. a channel mean) runs inside the hook, before the CPU copy, and
+    must keep the batch dimension.
+    """
+    n = batch.shape[0]
+    capture_layers = capture_layers or [[] for _ in range(n)]
+
+    wanted: List[str] = []
+    for layers in capture_layers:
+        for name in layers:
+            if name not in wanted:
+                wanted.append(name)
+
+    captured: Dict[str, torch.Tensor] = {}
+    hooks: List[torch.utils.hooks.RemovableHandle] = []
+
+    def _make_hook(name: str):
+        def hook(module, inp, out):
+            try:
+                if isinstance(out, (tuple, list)):
+                    out = out[0]
+                if torch.is_tensor(out):
+                    # store on CPU
+                    if activation_reduction is not None:
+                        captured[name] = activation_reduction(out)
+                    else:
+                        captured[name] = out.detach().cpu()
+            except Exception:
+                pass
+        return hook
+
+    if wanted:
+        try:
+            name_to_module = dict(model.named_modules())
+            for name in wanted:
+                if name in name_to_module:
+                    hooks.append(name_to_module[name].register_forward_hook(
+                        _make_hook(name)))
+                else:
+                    print(f"[ACTIVATIONS][WARN] layer '{name}' not found")
+        except Exception as e:
+            print(f"[ACTIVATIONS][WARN] cannot register hooks: {e}")
+            for h in hooks:
+                h.remove()
+            hooks = []
+
+    try:
+        with torch.no_grad():
+            logits = model(batch)
+            if logits.ndim == 1:
+                logits = logits.unsqueeze(0)
+            probs = torch.softmax(logits, dim=1)
+            k = min(max(top_k), probs.shape[1])
+            topk = torch.topk(probs, k=k, dim=1)
+            all_indices = topk.indices.tolist()
+            all_scores = topk.values.tolist()
+    finally:
+        for h in hooks:
+            try:
+                h.remove()
+            except Exception:
+                pass
+
+    results: List[BatchResult] = []
+    for i in range(n):
+        row_k = top_k[i]
+        acts: Dict[str, torch.Tensor] = {}
+        for name in capture_layers[i]:
+            at = captured.get(name)
+            if at is None:
+                continue
+            if at.ndim >= 1 and at.shape[0] == n:
+                acts[name] = at[i:i + 1].clone() if n > 1 else at
+            elif n == 1:
+                acts[name] = at
+        results.append(BatchResult(
+            indices=all_indices[i][:row_k],
+            scores=all_scores[i][:row_k],
+            activations=acts,
+            batch_size=n,
+        ))
+    return results
+
+
+class InferenceBatcher:
+    """Collects concurrent inference requests into micro-batches.
+
+    The dispatcher thread is started lazily on the first ``submit`` so that
+    importing the module (tests, scripts) does not spawn threads.
+    Requests targeting different models or input shapes that land in the
+    same window are run as separate batches.
+    """
+
+    def __init__(
+        self,
+        max_batch_size: int = 16,
+        max_wait_ms: float = 5.0,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be >= 1")
+        self.max_batch_size = int(max_batch_size)
+        self.max_wait = max(float(max_wait_ms), 0.0) / 1000.0
+
+        self._queue: "queue.Queue[Optional[_PendingRequest]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+        self._batches = 0
+        self._requests = 0
+        self._max_seen_batch = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def submit(
+        self,
+        model: nn.Module,
+        model_version: str,
+        tensor: torch.Tensor,
+        top_k: int = 3,
+        capture_layers: Optional[List[str]] = None,
+        timeout: Optional[float] = None,
+        activation_reduction: Optional[Callable[[torch.Tensor],
+                                                torch.Tensor]] = None,
+    ) -> BatchResult:
+        """Queue a ``[1, C, H, W]`` tensor and wait for its result."""
+        if tensor.ndim == 3:
+            tensor = tensor.unsqueeze(0)
+        if tensor.ndim != 4 or tensor.shape[0] != 1:
+            raise ValueError(
+                f"Expected a [1,C,H,W] tensor, got {list(tensor.shape)}")
+
+        self._ensure_started()
+        request = _PendingRequest(
+            model=model,
+            model_version=model_version,
+            tensor=tensor,
+            top_k=int(top_k),
+            capture_layers=list(capture_layers or []),
+            future=Future(),
+            enqueued_at=time.perf_counter(),
+            activation_reduction=activation_reduction,
+        )
+        self._queue.put(request)
+        return request.future.result(timeout=timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        batches = self._batches
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "pending": self._queue.qsize(),
+            "batches": batches,
+            "requests": self._requests,
+            "avg_batch_size": (self._requests / batches) if batches else 0.0,
+            "max_seen_batch_size": self._max_seen_batch,
+        }
+
+    def shutdown(self, timeout: Optional[float] = 5.0) -> None:
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(timeout=timeout)
+
+    # ------------------------------------------------------------------
+    # Dispatcher
+    # ------------------------------------------------------------------
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="inference-batcher",
+                    daemon=True,
+                )
+                self._thread.start()
+
+    def _collect(self, first: _PendingRequest) -> Tuple[
+            List[_PendingRequest], bool]:
+        batch = [first]
+        deadline = first.enqueued_at + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining > 0:
+                    item = self._queue.get(timeout=remaining)
+                else:
+                    # Window elapsed: only drain what is already queued.
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch, stop = self._collect(first)
+
+            groups: Dict[Tuple[int, str, Tuple[int, ...]],
+                         List[_PendingRequest]] = {}
+            for req in batch:
+                groups.setdefault(req.group_key, []).append(req)
+
+            for group in groups.values():
+                self._flush(group)
+
+            if stop:
+                return
+
+    def _flush(self, group: List[_PendingRequest]) -> None:
+        started = time.perf_counter()
+        try:
+            results = run_batch(
+                group[0].model,
+                torch.cat([r.tensor for r in group], dim=0),
+                top_k=[r.top_k for r in group],
+                capture_layers=[r.capture_layers for r in group],
+                activation_reduction=next(
+                    (r.activation_reduction for r in group
+                     if r.capture_layers), None),
+            )
+        except Exception as exc:
+            for r in group:
+                if not r.future.done():
+                    r.future.set_exception(exc)
+            return
+
+        self._batches += 1
+        self._requests += len(group)
+        self._max_seen_batch = max(self._max_seen_batch, len(group))
+
+        for r, res in zip(group, results):
+            res.queue_ms = (started - r.enqueued_at) * 1000.0
+            if not r.future.done():
+                r.future.set_result(res)
@@ -0,0 +1,140 @@
+# app/model/domain/service/inference_executor.py
+"""Bounded executor keeping CPU-bound inference off the asyncio loop.
+
+Image decoding and torch forward passes are offloaded to a dedicated thread
+pool (torch and Pillow release the GIL in their hot loops). Admission
+control rejects new work once ``max_workers + max_queue`` tasks are pending
+so that a burst cannot pile up unbounded latency behind a single worker.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, TypeVar
+
+T = TypeVar("T")
+
+
+class InferenceQueueFullError(Exception):
+    """Levée quand la file d'inférence est pleine (à traduire en 503)."""
+
+    def __init__(self, retry_after: int, depth: int):
+        super().__init__(
+            f"Inference queue is full ({depth} pending requests)")
+        self.retry_after = retry_after
+        self.depth = depth
+
+
+class InferenceExecutor:
+    def __init__(
+        self,
+        max_workers: int = 4,
+        max_queue: int = 32,
+        retry_after_seconds: int = 1,
+    ) -> None:
+        self.max_workers = max(int(max_workers), 1)
+        self.max_queue = max(int(max_queue), 0)
+        self.retry_after_seconds = max(int(retry_after_seconds), 1)
+
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="inference",
+        )
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._wait_total_ms = 0.0
+        self._wait_max_ms = 0.0
+        self._wait_last_ms = 0.0
+        self._run_total_ms = 0.0
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Exécute ``fn`` sur le pool et l'attend sans bloquer la boucle.
+
+        Raises:
+            InferenceQueueFullError: si la file est déjà pleine.
+        """
+        with self._lock:
+            if self._pending >= self.capacity:
+                self._rejected += 1
+                raise InferenceQueueFullError(
+                    retry_after=self.retry_after_seconds,
+                    depth=self._pending,
+                )
+            self._pending += 1
+
+        submitted = time.perf_counter()
+
+        def _task() -> T:
+            started = time.perf_counter()
+            waited_ms = (started - submitted) * 1000.0
+            with self._lock:
+                self._running += 1
+                self._wait_total_ms += waited_ms
+                self._wait_last_ms = waited_ms
+                self._wait_max_ms = max(self._wait_max_ms, waited_ms)
+            ok = False
+            try:
+                result = fn(*args, **kwargs)
+                ok = True
+                return result
+            finally:
+                # Compté jusqu'à la fin du calcul, même si l'appelant a été
+                # annulé entre-temps
+                with self._lock:
+                    self._pending -= 1
+                    self._running -= 1
+                    self._run_total_ms += (
+                        time.perf_counter() - started) * 1000.0
+                    if ok:
+                        self._completed += 1
+                    else:
+                        self._failed += 1
+
+        def _on_done(future) -> None:
+            # Annulé dans la file : _task n'a jamais tourné
+            if future.cancelled():
+                with self._lock:
+                    self._pending -= 1
+
+        try:
+            future = self._pool.submit(_task)
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            raise
+        future.add_done_callback(_on_done)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            finished = self._completed + self._failed
+            return {
+                "workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "in_flight": self._running,
+                "queue_depth": max(self._pending - self._running, 0),
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "wait_ms_avg": (
+                    self._wait_total_ms / finished if finished else 0.0),
+                "wait_ms_max": self._wait_max_ms,
+                "wait_ms_last": self._wait_last_ms,
+                "run_ms_avg": (
+                    self._run_total_ms / finished if finished else 0.0),
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
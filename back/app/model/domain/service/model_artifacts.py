@@ -0,0 +1,194 @@
+# app/model/domain/service/model_artifacts.py
+"""Files stored next to a model checkpoint in ``MODEL_DIR``.
+
+A trained model ``<stem>.pth`` (TorchScript) can have derived artifacts
+sharing its stem. ``<stem>-mmap.pt`` is the eager module saved with
+``torch.save``: it is loaded with ``torch.load(mmap=True)`` so its weight
+pages come from the OS page cache and are shared by every uvicorn worker
+instead of being copied into each process. ``<stem>-int8.pth`` is the
+post-training quantized TorchScript variant and ``<stem>-optimized.pth``
+the frozen, channels_last graph; both carry their own copies of the label
+and preprocess sidecars.
+
+Derived artifacts and sidecars are not models of their own and must be
+ignored when scanning the directory.
+
+When a shared ``BlobStorage`` is configured, training publishes the
+files of a checkpoint under ``STORAGE_MODELS_PREFIX`` and an inference pod
+whose local ``MODEL_DIR`` lacks them fetches them before loading. The
+``-mmap.pt`` artifact is the exception: it is a pickle, and unpickling
+runs arbitrary code, so it is only ever loaded on the node that wrote it.
+It is never published nor fetched, and pods without it load the
+TorchScript checkpoint instead.
+"""
+
+from __future__ import annotations
+
+import copy
+import shutil
+from pathlib import Path
+from typing import Any, List, Union
+
+import torch
+from torch import nn
+
+from app.storage.domain.catalog.blob_storage import BlobStorage
+
+MMAP_SUFFIX = "-mmap"
+INT8_SUFFIX = "-int8"
+OPTIMIZED_SUFFIX = "-optimized"
+
+# Suffixes (sur le stem) des fichiers dérivés d'un checkpoint
+DERIVED_SUFFIXES = (MMAP_SUFFIX, INT8_SUFFIX, OPTIMIZED_SUFFIX)
+
+SIDECAR_SUFFIXES = ("-label.json", "-preprocess.json")
+
+PathLike = Union[str, Path]
+
+
+def mmap_artifact_path(checkpoint: PathLike) -> Path:
+    p = Path(checkpoint)
+    return p.parent / f"{p.stem}{MMAP_SUFFIX}.pt"
+
+
+def int8_artifact_path(checkpoint: PathLike) -> Path:
+    p = Path(checkpoint)
+    return p.parent / f"{p.stem}{INT8_SUFFIX}.pth"
+
+
+def optimized_artifact_path(checkpoint: PathLike) -> Path:
+    p = Path(checkpoint)
+    return p.parent / f"{p.stem}{OPTIMIZED_SUFFIX}.pth"
+
+
+def copy_sidecars(checkpoint: PathLike, artifact: PathLike) -> None:
+    """Copie les sidecars (labels, preprocess) de ``checkpoint`` vers ceux
+    d'``artifact`` pour que l'artefact soit chargeable seul."""
+    src, dst = Path(checkpoint), Path(artifact)
+    for suffix in SIDECAR_SUFFIXES:
+        sidecar = src.parent / f"{src.stem}{suffix}"
+        if sidecar.is_file():
+            shutil.copyfile(sidecar, dst.parent / f"{dst.stem}{suffix}")
+
+
+def is_derived_artifact(filename: PathLike) -> bool:
+    """True pour un fichier dérivé (``-mmap.pt``...), pas un modèle."""
+    stem = Path(filename).stem
+    return any(stem.endswith(suffix) for suffix in DERIVED_SUFFIXES)
+
+
+def load_checkpoint(
+    path: PathLike,
+    mmap: bool = True,
+    weights_only: bool = True,
+) -> Any:
+    """``torch.load`` sur CPU, mappé en mémoire quand c'est possible.
+
+    Only zip-format checkpoints (the default since torch 1.6) can be
+    mapped; legacy files fall back to a regular load.
+    """
+    if mmap:
+        try:
+            return torch.load(
+                str(path),
+                map_location="cpu",
+                mmap=True,
+                weights_only=weights_only,
+            )
+        except RuntimeError as e:
+            print(f"[WARN] mmap load failed for {path}, falling back: {e}")
+    return torch.load(
+        str(path), map_location="cpu", weights_only=weights_only)
+
+
+def save_mmap_artifact(module: nn.Module, checkpoint: PathLike) -> Path:
+    """Enregistre le module eager à côté de ``checkpoint`` (``-mmap.pt``).
+
+    ``module`` lui-même n'est pas modifié (device, mode train/eval).
+    """
+    dest = mmap_artifact_path(checkpoint)
+    tmp = dest.with_name(dest.name + ".tmp")
+    # Weights must live on CPU to be mappable by inference workers; the
+    # copy leaves the caller's (training) model where it is
+    torch.save(copy.deepcopy(module).to("cpu").eval(), tmp)
+    tmp.replace(dest)
+    return dest
+
+
+def load_mmap_module(checkpoint: PathLike) -> nn.Module:
+    """Charge ``<stem>-mmap.pt`` s'il existe, sinon lève FileNotFoundError.
+
+    Trust boundary: the file is unpickled (``weights_only=False``), so it
+    must have been written by ``save_mmap_artifact`` on this node. The
+    artifact is kept out of ``publish_artifacts``/``fetch_artifacts`` for
+    that reason; never copy one into ``MODEL_DIR`` from elsewhere.
+    """
+    artifact = mmap_artifact_path(checkpoint)
+    if not artifact.is_file():
+        raise FileNotFoundError(f"No mmap artifact for {checkpoint}")
+    module = load_checkpoint(artifact, mmap=True, weights_only=False)
+    if not isinstance(module, nn.Module):
+        raise ValueError(f"{artifact} does not contain an nn.Module")
+    return module
+
+
+# ----------------------------------------------------------------------
+# Stockage partagé (BlobStorage)
+# ----------------------------------------------------------------------
+
+def _belongs_to(stem: str, name: str) -> bool:
+    """``name`` est-il le checkpoint ``stem`` ou l'un de ses fichiers ?"""
+    if not name.startswith(stem):
+        return False
+    rest = name[len(stem):]
+    return rest in (".pth", ".pt", ".onnx") or any(
+        rest.startswith(suffix)
+        for suffix in DERIVED_SUFFIXES + SIDECAR_SUFFIXES)
+
+
+def _shareable(name: str) -> bool:
+    """Hors ``-mmap.pt`` : un pickle ne transite pas par le stockage."""
+    return not Path(name).stem.endswith(MMAP_SUFFIX)
+
+
+def artifact_files(checkpoint: PathLike) -> List[Path]:
+    """Le checkpoint, ses artefacts dérivés et leurs sidecars."""
+    p = Path(checkpoint)
+    if not p.parent.is_dir():
+        return []
+    return sorted(f for f in p.parent.iterdir()
+                  if f.is_file() and _belongs_to(p.stem, f.name))
+
+
+def publish_artifacts(
+    storage: BlobStorage, checkpoint: PathLike, prefix: str
+) -> List[str]:
+    """Envoie les fichiers du checkpoint vers ``storage`` (multipart pour
+    les gros fichiers côté S3) ; renvoie les clés écrites."""
+    keys = []
+    for path in artifact_files(checkpoint):
+        if not _shareable(path.name):
+            continue
+        key = f"{prefix}{path.name}"
+        storage.upload_file(key, path)
+        keys.append(key)
+    return keys
+
+
+def fetch_artifacts(
+    storage: BlobStorage, checkpoint: PathLike, prefix: str
+) -> List[Path]:
+    """Télécharge (en streaming) les fichiers du checkpoint absents du
+    dossier local ; renvoie les chemins écrits."""
+    p = Path(checkpoint)
+    fetched = []
+    for key in storage.keys(f"{prefix}{p.stem}"):
+        name = key[len(prefix):]
+        if ("/" in name or not _belongs_to(p.stem, name)
+                or not _shareable(name)):
+            continue
+        dest = p.parent / name
+        if not dest.is_file():
+            storage.download_file(key, dest)
+            fetched.append(dest)
+    return fetched
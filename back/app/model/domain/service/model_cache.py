@@ -0,0 +1,178 @@
+# app/model/domain/service/model_cache.py
+"""Bounded LRU cache for loaded models and their sidecars.
+
+Replaces the unbounded ``MODEL_CACHE``/``LABELS_CACHE``/``PREPROCESS_CACHE``
+dicts. Modules are accounted by the size of their parameters and buffers;
+once the byte budget is exceeded the least recently used, unpinned versions
+are evicted together with their labels and preprocess config. The active
+model is pinned so that activation or layer-listing requests on other
+versions can never push it out.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set
+
+from torch import nn
+
+
+def module_nbytes(module: nn.Module) -> int:
+    """Taille mémoire des paramètres et buffers d'un module."""
+    total = 0
+    try:
+        for t in list(module.parameters()) + list(module.buffers()):
+            total += t.numel() * t.element_size()
+    except Exception:
+        pass
+    return total
+
+
+@dataclass
+class _Entry:
+    module: Optional[nn.Module] = None
+    labels: Optional[List[str]] = None
+    preprocess: Optional[Dict[str, Any]] = None
+    nbytes: int = 0
+
+
+class ModelCache:
+    def __init__(self, budget_bytes: int = 512 * 1024 * 1024) -> None:
+        self.budget_bytes = int(budget_bytes)
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._pinned: Set[str] = set()
+        self._lock = threading.RLock()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    # ------------------------------------------------------------------
+    # Modules
+    # ------------------------------------------------------------------
+
+    def get_model(self, version: str) -> Optional[nn.Module]:
+        with self._lock:
+            entry = self._entries.get(version)
+            if entry is None or entry.module is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._entries.move_to_end(version)
+            return entry.module
+
+    def put_model(
+        self,
+        version: str,
+        module: nn.Module,
+        nbytes: Optional[int] = None,
+    ) -> nn.Module:
+        """Insère un module puis évince en LRU jusqu'à tenir le budget.
+
+        ``nbytes`` permet de fournir la taille quand elle ne se déduit pas
+        des paramètres (ex. backend hors torch).
+        """
+        size = module_nbytes(module) if nbytes is None else int(nbytes)
+        with self._lock:
+            entry = self._entries.setdefault(version, _Entry())
+            entry.module = module
+            entry.nbytes = size
+            self._entries.move_to_end(version)
+            self._enforce_budget(keep=version)
+        return module
+
+    def has_model(self, version: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(version)
+            return entry is not None and entry.module is not None
+
+    # ------------------------------------------------------------------
+    # Sidecars
+    # ------------------------------------------------------------------
+
+    def get_labels(self, version: str) -> Optional[List[str]]:
+        with self._lock:
+            entry = self._entries.get(version)
+            return list(entry.labels) if entry and entry.labels else None
+
+    def set_labels(self, version: str, labels: List[str]) -> None:
+        with self._lock:
+            self._entries.setdefault(version, _Entry()).labels = list(labels)
+
+    def get_preprocess(self, version: str) -> Dict[str, Any]:
+        """Copie de la config de preprocess (dict vide si inconnue)."""
+        with self._lock:
+            entry = self._entries.get(version)
+            return dict(entry.preprocess) if entry and entry.preprocess else {}
+
+    def set_preprocess(self, version: str, config: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries.setdefault(version, _Entry()).preprocess = dict(
+                config)
+
+    # ------------------------------------------------------------------
+    # Pinning / eviction
+    # ------------------------------------------------------------------
+
+    def pin(self, version: str) -> None:
+        with self._lock:
+            self._pinned.add(version)
+
+    def unpin(self, version: str) -> None:
+        with self._lock:
+            self._pinned.discard(version)
+            self._enforce_budget()
+
+    def evict(self, version: str) -> bool:
+        """Retire une version (module + sidecars), même épinglée."""
+        with self._lock:
+            self._pinned.discard(version)
+            entry = self._entries.pop(version, None)
+            if entry is not None and entry.module is not None:
+                self._evictions += 1
+            return entry is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._pinned.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "budget_bytes": self.budget_bytes,
+                "used_bytes": self._used_bytes(),
+                "models": [
+                    v for v, e in self._entries.items() if e.module is not None
+                ],
+                "pinned": sorted(self._pinned),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": (self._hits / lookups) if lookups else 0.0,
+                "evictions": self._evictions,
+            }
+
+    def _used_bytes(self) -> int:
+        return sum(e.nbytes for e in self._entries.values() if e.module)
+
+    def _enforce_budget(self, keep: Optional[str] = None) -> None:
+        used = self._used_bytes()
+        if used <= self.budget_bytes:
+            return
+        for version in list(self._entries):
+            if used <= self.budget_bytes:
+                break
+            entry = self._entries[version]
+            if (
+                version == keep
+                or version in self._pinned
+                or entry.module is None
+            ):
+                continue
+            del self._entries[version]
+            used -= entry.nbytes
+            self._evictions += 1
+            print(f"[MODEL_CACHE] evicted {version} (LRU, budget)")
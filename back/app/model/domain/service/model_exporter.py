@@ -0,0 +1,124 @@
+# app/model/domain/service/model_exporter.py
+"""Inference-optimized export of trained models.
+
+The eager model is converted to channels_last, scripted and frozen.
+Freezing inlines the weights and folds BatchNorm into the preceding
+convolutions. ``torch.jit.optimize_for_inference`` is applied when the
+artifact is loaded rather than before saving: the graph it produces
+(prepacked oneDNN ops) cannot be serialized and reloaded.
+
+The export is only written when both the frozen graph and its reloaded,
+optimized form match the eager model on a sample batch.
+"""
+
+from __future__ import annotations
+
+import copy
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import torch
+from torch import nn
+
+from app.model.domain.service.model_artifacts import (
+    copy_sidecars,
+    optimized_artifact_path,
+)
+
+
+class ModelEquivalenceError(ValueError):
+    """Le modèle optimisé ne reproduit pas les sorties du modèle eager."""
+
+
+def optimize_for_serving(module: torch.jit.ScriptModule) -> nn.Module:
+    """``optimize_for_inference`` sur un module figé, sans échec bloquant."""
+    try:
+        return torch.jit.optimize_for_inference(module)
+    except Exception as e:
+        print(f"[WARN] optimize_for_inference failed, using frozen: {e}")
+        return module
+
+
+class ModelExporter:
+    def __init__(
+        self,
+        atol: float = 1e-3,
+        rtol: float = 1e-3,
+        channels_last: bool = True,
+    ) -> None:
+        self.atol = atol
+        self.rtol = rtol
+        self.channels_last = channels_last
+        self.last_report: Optional[Dict[str, Any]] = None
+
+    def optimize(self, model: nn.Module) -> torch.jit.ScriptModule:
+        """Copie channels_last, scriptée et figée de ``model``."""
+        model = copy.deepcopy(model).to("cpu").eval()
+        if self.channels_last:
+            model = model.to(memory_format=torch.channels_last)
+        return torch.jit.freeze(torch.jit.script(model))
+
+    def verify(
+        self,
+        eager: nn.Module,
+        candidate: nn.Module,
+        sample: torch.Tensor,
+    ) -> float:
+        """Écart max entre les sorties ; lève si hors tolérance."""
+        with torch.inference_mode():
+            expected = eager(sample)
+            actual = candidate(sample)
+        if expected.shape != actual.shape:
+            raise ModelEquivalenceError(
+                f"output shape {tuple(actual.shape)} != "
+                f"{tuple(expected.shape)}")
+        max_diff = float((expected - actual).abs().max())
+        if not torch.allclose(
+                expected, actual, atol=self.atol, rtol=self.rtol):
+            raise ModelEquivalenceError(
+                f"optimized model diverges (max abs diff {max_diff:.2e})")
+        return max_diff
+
+    def export(
+        self,
+        model: nn.Module,
+        checkpoint: Union[str, Path],
+        sample: torch.Tensor,
+    ) -> Path:
+        """Écrit ``<stem>-optimized.pth`` et ses sidecars après vérification.
+
+        Raises:
+            ModelEquivalenceError: si les sorties divergent (rien n'est écrit).
+        """
+        eager = copy.deepcopy(model).to("cpu").eval()
+        sample = sample.to("cpu")
+        frozen = self.optimize(eager)
+
+        frozen_diff = self.verify(eager, frozen, sample)
+
+        dest = optimized_artifact_path(checkpoint)
+        tmp = dest.with_name(dest.name + ".tmp")
+        # Sauvegardé avant optimize_for_inference, qui réécrit le graphe
+        # sur place en une forme qui ne se recharge pas
+        frozen.save(str(tmp))
+        try:
+            # Vérifié tel que load_model le servira : rechargé puis optimisé
+            served = optimize_for_serving(
+                torch.jit.load(str(tmp), map_location="cpu"))
+            served_diff = self.verify(eager, served, sample)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        os.replace(tmp, dest)
+        copy_sidecars(checkpoint, dest)
+
+        self.last_report = {
+            "path": str(dest),
+            "channels_last": self.channels_last,
+            "max_abs_diff_frozen": frozen_diff,
+            "max_abs_diff_optimized": served_diff,
+        }
+        print(f"[EXPORT] optimized model saved to {dest} "
+              f"(max abs diff {max(frozen_diff, served_diff):.2e})")
+        return dest
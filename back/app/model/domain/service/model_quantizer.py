@@ -0,0 +1,138 @@
+# app/model/domain/service/model_quantizer.py
+"""Post-training INT8 quantization of trained models (CPU inference).
+
+Convolutions are quantized statically: observers are inserted with FX
+graph mode, calibrated on a sample of validated pictures, then converted.
+Linear layers (the classifier head) use dynamic quantization. Models that
+cannot be FX-traced, or calls without calibration data, fall back to
+dynamic quantization of the Linear layers only.
+
+The result is traced, frozen and written as ``<stem>-int8.pth`` next to
+the fp32 checkpoint, with copies of its sidecars, so ``load_model`` can
+serve it when ``MODEL_INT8_ENABLED`` is set.
+"""
+
+from __future__ import annotations
+
+import copy
+import os
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Sequence, Union
+
+import torch
+from PIL import Image
+from torch import nn
+
+from app.model.domain.service.model_artifacts import (
+    copy_sidecars,
+    int8_artifact_path,
+)
+from app.model.domain.service.transforms import default_preprocess
+
+
+def iter_calibration_batches(
+    image_paths: Sequence[Union[str, Path]],
+    size: int,
+    mean: Optional[Iterable[float]] = None,
+    std: Optional[Iterable[float]] = None,
+    batch_size: int = 8,
+) -> Iterator[torch.Tensor]:
+    """Batches (N, C, H, W) prétraités comme à l'inférence."""
+    batch: List[torch.Tensor] = []
+    for path in image_paths:
+        try:
+            with Image.open(path) as img:
+                tensor = default_preprocess(
+                    img.convert("RGB"), size=size, mean=mean, std=std)
+        except Exception as e:
+            print(f"[QUANT][WARN] calibration image skipped {path}: {e}")
+            continue
+        batch.append(tensor)
+        if len(batch) >= batch_size:
+            yield torch.cat(batch)
+            batch = []
+    if batch:
+        yield torch.cat(batch)
+
+
+class ModelQuantizer:
+    STATIC = "static"
+    DYNAMIC = "dynamic"
+
+    def __init__(self, backend: str = "x86") -> None:
+        supported = torch.backends.quantized.supported_engines
+        self.backend = backend if backend in supported else "qnnpack"
+        self.last_mode: Optional[str] = None
+
+    def quantize(
+        self,
+        model: nn.Module,
+        example_input: torch.Tensor,
+        calibration: Optional[Iterable[torch.Tensor]] = None,
+    ) -> nn.Module:
+        """Retourne une copie INT8 de ``model`` (le module source est intact).
+        """
+        torch.backends.quantized.engine = self.backend
+        model = copy.deepcopy(model).to("cpu").eval()
+
+        if calibration is not None:
+            try:
+                quantized = self._quantize_static(
+                    model, example_input, calibration)
+                self.last_mode = self.STATIC
+                return quantized
+            except Exception as e:
+                print(f"[QUANT][WARN] static quantization failed, "
+                      f"falling back to dynamic: {e}")
+
+        quantized = torch.ao.quantization.quantize_dynamic(
+            model, {nn.Linear}, dtype=torch.qint8)
+        self.last_mode = self.DYNAMIC
+        return quantized
+
+    def export(
+        self,
+        model: nn.Module,
+        checkpoint: Union[str, Path],
+        example_input: torch.Tensor,
+        calibration: Optional[Iterable[torch.Tensor]] = None,
+    ) -> Path:
+        """Quantifie puis écrit ``<stem>-int8.pth`` et ses sidecars."""
+        quantized = self.quantize(model, example_input, calibration)
+        with torch.inference_mode():
+            scripted = torch.jit.freeze(
+                torch.jit.trace(quantized, example_input))
+
+        dest = int8_artifact_path(checkpoint)
+        tmp = dest.with_name(dest.name + ".tmp")
+        scripted.save(str(tmp))
+        os.replace(tmp, dest)
+        copy_sidecars(checkpoint, dest)
+        print(f"[QUANT] {self.last_mode} int8 model saved to {dest}")
+        return dest
+
+    def _quantize_static(
+        self,
+        model: nn.Module,
+        example_input: torch.Tensor,
+        calibration: Iterable[torch.Tensor],
+    ) -> nn.Module:
+        from torch.ao.quantization import (
+            default_dynamic_qconfig,
+            get_default_qconfig_mapping,
+        )
+        from torch.ao.quantization.quantize_fx import convert_fx, prepare_fx
+
+        qconfig_mapping = get_default_qconfig_mapping(
+            self.backend).set_object_type(nn.Linear, default_dynamic_qconfig)
+        prepared = prepare_fx(model, qconfig_mapping, (example_input,))
+
+        seen = 0
+        with torch.inference_mode():
+            for batch in calibration:
+                prepared(batch)
+                seen += int(batch.shape[0])
+        if seen == 0:
+            raise ValueError("no calibration image")
+        print(f"[QUANT] calibrated on {seen} images")
+        return convert_fx(prepared)
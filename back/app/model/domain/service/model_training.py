@@ -5,20 +5,83 @@ from torch.utils.data import DataLoader
 from torchvision import transforms
 from pathlib import Path
 from app.model.domain.service.room_dataset import RoomDataset
+from app.model.domain.service.dataset_cache import DatasetCache
+from app.model.domain.service.model_artifacts import (
+    publish_artifacts,
+    save_mmap_artifact,
+)
+from app.model.domain.service.model_exporter import ModelExporter
+from app.model.domain.service.execution_backend import export_onnx
+from app.model.domain.service.training_jobs import epoch_progress
+from app.model.domain.service.model_quantizer import (
+    ModelQuantizer,
+    iter_calibration_batches,
+)
 import json
+import os
+import random
 import re
+import time
+from app.config import settings
 from app.model.domain.DTO.modelTrainingDTO import ModelTrainingDTO
 from app.model.domain.DTO.scratchLayersDTO import ScratchLayersDTO
 from app.model.domain.DTO.customLayersDTO import (
     CustomLayersDTO
 )
-from typing import Literal, Optional
+from typing import Callable, Literal, Optional
 
 UPLOAD_DIR = Path("./")
 MODEL_DIR = Path("/app/models")
+IMAGE_SIZE = 224
 MODEL_DIR.mkdir(parents=True, exist_ok=True)  # create folder if not exists
 
 
+AUTO_LOADER_WORKERS_MAX = 4
+
+
+def available_cpus() -> int:
+    """CPU utilisables : affinité, bornée par le quota cgroup (limite k8s).
+
+    ``sched_getaffinity`` voit tous les cœurs du nœud, pas le quota du pod.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # pragma: no cover - non Linux
+        cpus = os.cpu_count() or 1
+    quota = _cgroup_cpu_quota()
+    if quota is not None:
+        cpus = min(cpus, max(int(quota), 1))
+    return cpus
+
+
+def _cgroup_cpu_quota() -> Optional[float]:
+    try:
+        # cgroup v2 : "<quota> <period>" ou "max <period>"
+        with open("/sys/fs/cgroup/cpu.max") as fh:
+            quota, period = fh.read().split()[:2]
+        if quota == "max":
+            return None
+        return int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        # cgroup v1
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as fh:
+            quota = int(fh.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as fh:
+            period = int(fh.read())
+        return quota / period if quota > 0 and period > 0 else None
+    except (OSError, ValueError):
+        return None
+
+
+def resolve_loader_workers(requested: int) -> int:
+    """-1 : un worker par CPU disponible, moins celui de la boucle (4 max)."""
+    if requested >= 0:
+        return requested
+    return min(max(available_cpus() - 1, 0), AUTO_LOADER_WORKERS_MAX)
+
+
 class ModelTraining:
     def __init__(self,
                  room_catalog,
@@ -26,7 +89,8 @@ class ModelTraining:
                  picture_catalog,
                  model_namer,
                  model_name="base",
-                 num_classes=None
+                 num_classes=None,
+                 blob_storage=None,
                  ):
         self.room_catalog = room_catalog
         self.model_catalog = model_catalog
@@ -34,8 +98,11 @@ class ModelTraining:
         self.model_namer = model_namer
         self.model_name = model_name
         self.num_classes = num_classes
+        # Stockage partagé où publier les modèles entraînés (optionnel)
+        self.blob_storage = blob_storage
         self.model = None
         self.dataset = None
+        self.epoch_timings = {"data_wait_s": 0.0, "compute_s": 0.0}
         self.device = torch.device(
             "cuda" if torch.cuda.is_available() else "cpu"
         )
@@ -71,6 +138,7 @@ class ModelTraining:
                 )
 
             records.append({
+                "picture_id": str(pic.image_id),
                 "filename": pic.path,
                 "room": pic.room.name
             })
@@ -81,12 +149,17 @@ class ModelTraining:
     # 2️⃣ Define transforms
     def get_transforms(self):
         return transforms.Compose([
-            transforms.Resize((224, 224)),
+            transforms.Resize((IMAGE_SIZE, IMAGE_SIZE)),
             transforms.ToTensor()
         ])
 
     # 3️⃣ Create Dataset
     def create_dataset(self, records):
+        if settings.TRAINING_DATASET_CACHE_ENABLED:
+            try:
+                return self.create_cached_dataset(records)
+            except Exception as e:
+                print(f"[WARN] dataset cache unavailable: {e}")
         transform = self.get_transforms()
         dataset = RoomDataset(
             records=records,
@@ -95,6 +168,26 @@ class ModelTraining:
         )
         return dataset
 
+    # 3️⃣b Dataset read from the decoded-image cache
+    def create_cached_dataset(self, records):
+        """
+        Same tensors as get_transforms(), decoded once into memory-mapped
+        shards shared by epochs, DataLoader workers and training runs.
+        """
+        cache = DatasetCache(
+            root=settings.TRAINING_DATASET_CACHE_DIR,
+            size=IMAGE_SIZE,
+            shard_size=settings.TRAINING_DATASET_CACHE_SHARD_SIZE,
+            workers=min(available_cpus(), AUTO_LOADER_WORKERS_MAX),
+        )
+        return cache.open(records, images_dir=UPLOAD_DIR)
+
+    # 3️⃣c Release the dataset (cache read lock)
+    def release_dataset(self):
+        close = getattr(self.dataset, "close", None)
+        if close is not None:
+            close()
+
     # 4️⃣ Build Dataset
     def build_dataset(self, rooms):
         if self.dataset is None:
@@ -381,8 +474,50 @@ class ModelTraining:
         return features
 
     # 6️⃣ Create DataLoader
-    def create_dataloader(self, batch_size=8, shuffle=True):
-        return DataLoader(self.dataset, batch_size=batch_size, shuffle=shuffle)
+    def create_dataloader(
+        self,
+        batch_size=8,
+        shuffle=True,
+        num_workers=None,
+        prefetch_factor=None,
+    ):
+        """
+        Decoding and resizing run in ``num_workers`` processes (settings
+        by default) so the training loop does not wait on JPEG decoding.
+        """
+        num_workers = resolve_loader_workers(
+            settings.TRAINING_LOADER_WORKERS
+            if num_workers is None else num_workers
+        )
+        options = {
+            "batch_size": batch_size,
+            "shuffle": shuffle,
+            "num_workers": num_workers,
+            # Copie hôte → GPU asynchrone depuis de la mémoire verrouillée
+            "pin_memory": (
+                settings.TRAINING_PIN_MEMORY and self.device.type == "cuda"
+            ),
+        }
+        if num_workers > 0:
+            options["prefetch_factor"] = (
+                prefetch_factor or settings.TRAINING_PREFETCH_FACTOR
+            )
+            # Workers gardés d'un epoch à l'autre (pas de re-création)
+            options["persistent_workers"] = (
+                settings.TRAINING_PERSISTENT_WORKERS
+            )
+            # Pas de fork d'un process multi-threadé (uvicorn, heartbeat)
+            options["multiprocessing_context"] = (
+                settings.TRAINING_LOADER_START_METHOD
+            )
+        print(
+            f"[TRAINING] DataLoader: workers={num_workers} "
+            f"prefetch={options.get('prefetch_factor')} "
+            f"persistent={options.get('persistent_workers', False)} "
+            f"start={options.get('multiprocessing_context')} "
+            f"pin_memory={options['pin_memory']}"
+        )
+        return DataLoader(self.dataset, **options)
 
     # 7️⃣ Create optimizer
     def create_optimizer(self, lr=1e-4):
@@ -394,17 +529,37 @@ class ModelTraining:
 
     # 9 Train one epoch
     def train_epoch(self, dataloader, optimizer, loss_fn):
+        """
+        Returns the epoch loss; the time spent waiting for batches vs
+        computing is left in ``self.epoch_timings``.
+        """
         self.model.train()  # set model to training mode
+        non_blocking = dataloader.pin_memory
         running_loss = 0.0
-        for images, labels in dataloader:
-            images, labels = images.to(self.device), labels.to(self.device)
+        data_wait = 0.0
+        compute = 0.0
+        batches = iter(dataloader)
+        while True:
+            waited = time.perf_counter()
+            try:
+                images, labels = next(batches)
+            except StopIteration:
+                break
+            computed = time.perf_counter()
+            data_wait += computed - waited
+
+            images = images.to(self.device, non_blocking=non_blocking)
+            labels = labels.to(self.device, non_blocking=non_blocking)
             optimizer.zero_grad()
             outputs = self.model(images)
             loss = loss_fn(outputs, labels)
             loss.backward()
             optimizer.step()
+            # loss.item() synchronise le GPU : compute inclut le calcul réel
             running_loss += loss.item() * images.size(0)
+            compute += time.perf_counter() - computed
         epoch_loss = running_loss / len(dataloader.dataset)
+        self.epoch_timings = {"data_wait_s": data_wait, "compute_s": compute}
         return epoch_loss
 
     # 10 find next model name
@@ -458,6 +613,13 @@ class ModelTraining:
         scripted = torch.jit.script(self.model)
         scripted.save(filepath)
         print(f"Model saved to {filepath}")
+
+        # Eager copy loadable with torch.load(mmap=True) by inference workers
+        try:
+            mmap_path = save_mmap_artifact(self.model, filepath)
+            print(f"Mmap artifact saved to {mmap_path}")
+        except Exception as e:
+            print(f"[WARN] mmap artifact not saved for {filepath}: {e}")
         return filepath
 
     # 11 Save labels
@@ -486,8 +648,88 @@ class ModelTraining:
         print(f"Labels saved to {filepath}")
         return filepath
 
+    # 11a Publish to the shared storage
+    def publish_model(self, filename):
+        """
+        Upload <filename>.pth with its derived artifacts and sidecars so
+        inference pods without this volume can fetch them.
+        """
+        keys = publish_artifacts(
+            self.blob_storage,
+            MODEL_DIR / f"{filename}.pth",
+            settings.STORAGE_MODELS_PREFIX,
+        )
+        print(f"Model published: {', '.join(keys)}")
+        return keys
+
+    # 11b Inference-optimized export
+    def export_optimized(self, filename, size=None):
+        """
+        Write <filename>-optimized.pth (frozen, BatchNorm folded,
+        channels_last) once it matches the eager model on a sample batch.
+        """
+        if self.model is None:
+            raise ValueError("Model is not initialized.")
+
+        size = size or settings.UPLOAD_IMAGE_SIZE
+        return ModelExporter().export(
+            self.model,
+            MODEL_DIR / f"{filename}.pth",
+            sample=torch.randn(2, 3, size, size),
+        )
+
+    # 11c ONNX export (onnxruntime backend)
+    def export_onnx(self, filename, size=None):
+        """
+        Write <filename>.onnx next to the TorchScript checkpoint; it uses
+        the same label / preprocess sidecars.
+        """
+        if self.model is None:
+            raise ValueError("Model is not initialized.")
+
+        size = size or settings.UPLOAD_IMAGE_SIZE
+        return export_onnx(
+            self.model,
+            MODEL_DIR / f"{filename}.pth",
+            sample=torch.randn(1, 3, size, size),
+        )
+
+    # 11d Post-training INT8 quantization
+    def quantize_model(self, filename, size=None):
+        """
+        Write <filename>-int8.pth, calibrated on a sample of the validated
+        pictures used for training (same preprocessing as inference).
+        """
+        if self.model is None or self.dataset is None:
+            raise ValueError("Model and dataset must be built first.")
+
+        size = size or settings.UPLOAD_IMAGE_SIZE
+        records = list(self.dataset.records)
+        sample = random.Random(0).sample(
+            records,
+            min(len(records), settings.QUANTIZATION_CALIBRATION_IMAGES),
+        )
+        paths = [UPLOAD_DIR / r["filename"] for r in sample]
+
+        quantizer = ModelQuantizer()
+        return quantizer.export(
+            self.model,
+            MODEL_DIR / f"{filename}.pth",
+            example_input=torch.randn(1, 3, size, size),
+            calibration=iter_calibration_batches(paths, size=size),
+        )
+
     # 12 Full training loop
-    def train(self, modelTrainingDTO: ModelTrainingDTO, save: bool = True):
+    def train(
+        self,
+        modelTrainingDTO: ModelTrainingDTO,
+        save: bool = True,
+        on_epoch: Optional[Callable[[dict], None]] = None,
+    ):
+        """
+        Train then save the model; returns its file name. ``on_epoch``
+        receives the progress (loss, throughput, ETA) after each epoch.
+        """
         print("[DEBUG] Rooms from DTO:", modelTrainingDTO.roomList)
         # Ensure dataset and model are built
         rooms = []
@@ -497,26 +739,47 @@ class ModelTraining:
             rooms.append(room)
 
         self.build_dataset(rooms)
-        self.init_model(
-            modelTrainingDTO.type,
-            scratch_layers=modelTrainingDTO.scratchLayers,
-            custom_layers=modelTrainingDTO.customLayers
-        )
-        self.model.to(self.device)
-
-        dataloader = self.create_dataloader(
-            batch_size=modelTrainingDTO.batchSize
-        )
-        optimizer = self.create_optimizer(lr=modelTrainingDTO.learningRate)
-        loss_fn = self.create_loss()
+        try:
+            self.init_model(
+                modelTrainingDTO.type,
+                scratch_layers=modelTrainingDTO.scratchLayers,
+                custom_layers=modelTrainingDTO.customLayers
+            )
+            self.model.to(self.device)
 
-        for epoch in range(modelTrainingDTO.epochs):
-            epoch_loss = self.train_epoch(dataloader, optimizer, loss_fn)
-            print(
-                f"Epoch {epoch + 1}/"
-                f"{modelTrainingDTO.epochs} "
-                f"- Loss: {epoch_loss:.4f}"
+            dataloader = self.create_dataloader(
+                batch_size=modelTrainingDTO.batchSize,
+                num_workers=modelTrainingDTO.numWorkers,
+                prefetch_factor=modelTrainingDTO.prefetchFactor,
             )
+            optimizer = self.create_optimizer(lr=modelTrainingDTO.learningRate)
+            loss_fn = self.create_loss()
+
+            started = time.perf_counter()
+            for epoch in range(modelTrainingDTO.epochs):
+                epoch_started = time.perf_counter()
+                epoch_loss = self.train_epoch(dataloader, optimizer, loss_fn)
+                timings = self.epoch_timings
+                print(
+                    f"Epoch {epoch + 1}/"
+                    f"{modelTrainingDTO.epochs} "
+                    f"- Loss: {epoch_loss:.4f} "
+                    f"- data wait: {timings['data_wait_s']:.2f}s "
+                    f"- compute: {timings['compute_s']:.2f}s"
+                )
+                if on_epoch is not None:
+                    on_epoch(epoch_progress(
+                        epoch=epoch + 1,
+                        epochs=modelTrainingDTO.epochs,
+                        loss=epoch_loss,
+                        samples=len(dataloader.dataset),
+                        epoch_s=time.perf_counter() - epoch_started,
+                        elapsed_s=time.perf_counter() - started,
+                        **timings,
+                    ))
+        finally:
+            # Slots du cache à nouveau réutilisables par d'autres syncs
+            self.release_dataset()
 
         # model_file_name = self.find_next_model_name(variant=self.model_name)
         model_file_name = self.model_namer.find_next_model_name(
@@ -526,5 +789,26 @@ class ModelTraining:
         if save:
             self.save_model(model_file_name)
             self.save_labels(model_file_name)
-
-    print("Training completed.")
+            if settings.OPTIMIZED_EXPORT_ENABLED:
+                try:
+                    self.export_optimized(model_file_name)
+                except Exception as e:
+                    print(f"[WARN] optimized export failed: {e}")
+            if settings.ONNX_EXPORT_ENABLED:
+                try:
+                    self.export_onnx(model_file_name)
+                except Exception as e:
+                    print(f"[WARN] onnx export failed: {e}")
+            if settings.QUANTIZE_AFTER_TRAINING:
+                try:
+                    self.quantize_model(model_file_name)
+                except Exception as e:
+                    print(f"[WARN] int8 quantization failed: {e}")
+            if self.blob_storage is not None:
+                try:
+                    self.publish_model(model_file_name)
+                except Exception as e:
+                    print(f"[WARN] model publication failed: {e}")
+
+        print("Training completed.")
+        return model_file_name
@@ -0,0 +1,135 @@
+# app/model/domain/service/model_warmup.py
+"""Preload and warm up the active model when a worker starts.
+
+Without this, the first request after a deploy or a scale-up pays for the
+checkpoint load, the torchvision import and the first-run allocator /
+oneDNN kernel selection. The readiness endpoint reports not-ready until the
+warmup has finished so Kubernetes only routes traffic to warm pods.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import torch
+from PIL import Image
+
+import app.model.domain.catalog.model_catalog as model_catalog
+from app.model.domain.service.inference_batcher import run_batch
+from app.model.domain.service.predict import (
+    load_model,
+    model_cache,
+    resolve_active_model,
+)
+from app.model.domain.service.transforms import default_preprocess
+
+
+class ModelWarmup:
+    PENDING = "pending"
+    WARMING = "warming"
+    READY = "ready"
+    FAILED = "failed"
+
+    def __init__(self, iterations: int = 3, batch_sizes=(1,)) -> None:
+        self.iterations = max(int(iterations), 0)
+        self.batch_sizes = tuple(int(b) for b in batch_sizes if int(b) > 0)
+        self._lock = threading.Lock()
+        self._state = self.PENDING
+        self._model_version: Optional[str] = None
+        self._duration_ms: Optional[float] = None
+        self._error: Optional[str] = None
+
+    @property
+    def is_ready(self) -> bool:
+        # A failed warmup must not keep the pod out of rotation forever:
+        # requests will surface the underlying error themselves.
+        return self._state in (self.READY, self.FAILED)
+
+    def run(self, catalog: model_catalog.ModelCatalog) -> None:
+        """Charge le modèle actif puis enchaîne quelques passes à vide."""
+        self._set_state(self.WARMING)
+        started = time.perf_counter()
+        try:
+            active = resolve_active_model(catalog)
+            if active is None:
+                print("[WARMUP] no active model, nothing to warm up")
+                self._finish(self.READY, started)
+                return
+
+            model_version = active.path
+            self._model_version = model_version
+            model = load_model(model_version)
+
+            pc = model_cache.get_preprocess(model_version)
+            size = int(pc.get("size", active.input_size))
+            dummy = default_preprocess(
+                Image.new("RGB", (size, size)),
+                size=size,
+                mean=pc.get("mean"),
+                std=pc.get("std"),
+            )
+
+            for batch_size in self.batch_sizes:
+                batch = dummy.expand(batch_size, -1, -1, -1).contiguous()
+                for _ in range(self.iterations):
+                    run_batch(model, batch, top_k=[1] * batch_size)
+
+            self._finish(self.READY, started)
+            print(
+                f"[WARMUP] {model_version} warm in "
+                f"{self._duration_ms:.0f} ms "
+                f"({self.iterations} passes, batch sizes {self.batch_sizes})"
+            )
+        except Exception as e:
+            self._error = str(e)
+            self._finish(self.FAILED, started)
+            print(f"[WARMUP][ERROR] warmup failed: {e}")
+
+    def skip(self) -> None:
+        """Warmup désactivé : le worker est prêt immédiatement."""
+        self._set_state(self.READY)
+
+    def start_background(
+        self,
+        catalog_factory: Callable[[], Any],
+    ) -> threading.Thread:
+        """Lance ``run`` dans un thread avec son propre catalogue.
+
+        ``catalog_factory`` renvoie un gestionnaire de contexte fournissant
+        un ``ModelCatalog`` (la session DB lui est propre).
+        """
+        def _target():
+            try:
+                with catalog_factory() as catalog:
+                    self.run(catalog)
+            except Exception as e:
+                self._error = str(e)
+                self._set_state(self.FAILED)
+                print(f"[WARMUP][ERROR] cannot open catalog: {e}")
+
+        thread = threading.Thread(
+            target=_target, name="model-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "ready": self.is_ready,
+                "state": self._state,
+                "model_version": self._model_version,
+                "duration_ms": self._duration_ms,
+                "error": self._error,
+                "torch_threads": torch.get_num_threads(),
+            }
+
+    def _set_state(self, state: str) -> None:
+        with self._lock:
+            self._state = state
+
+    def _finish(self, state: str, started: float) -> None:
+        with self._lock:
+            self._duration_ms = (time.perf_counter() - started) * 1000.0
+            self._state = state
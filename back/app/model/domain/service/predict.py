@@ -23,6 +23,8 @@ load the model file.
 
 from __future__ import annotations
 
+import io
+import threading
 import time
 import uuid
 from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
@@ -35,14 +37,167 @@ from torch import nn
 from PIL import Image
 
 import app.model.domain.catalog.model_catalog as model_catalog
+from app.config import settings
+from app.metrics import register_metrics
+from app.model.domain.service.activation_store import (
+    BUNDLE_FILE,
+    HEATMAP,
+    OVERLAY,
+    ChannelReduction,
+    file_extension,
+    normalize_maps,
+    purge_model_bundles,
+    to_map,
+    write_bundle,
+)
+from app.model.domain.service.active_model_registry import (
+    ActiveModelInfo,
+    ActiveModelRegistry,
+)
+from app.model.domain.service.model_artifacts import (
+    fetch_artifacts,
+    int8_artifact_path,
+    is_derived_artifact,
+    load_checkpoint,
+    load_mmap_module,
+    mmap_artifact_path,
+    optimized_artifact_path,
+)
+from app.storage.domain.catalog.blob_storage import BlobStorage
+from app.model.domain.service.model_exporter import optimize_for_serving
+from app.model.domain.service.execution_backend import (
+    TORCH,
+    load_backend_module,
+)
+from app.model.domain.service.model_cache import ModelCache, module_nbytes
+from app.model.domain.service.prediction_cache import (
+    MISS,
+    SIMILAR,
+    PredictionCache,
+    content_hash,
+    dhash,
+)
+from app.model.domain.service.inference_batcher import (
+    InferenceBatcher,
+    run_batch,
+)
 from app.model.domain.service.transforms import (
     open_image_from_bytes,
     default_preprocess,
 )
 
-MODEL_CACHE: Dict[str, torch.nn.Module] = {}
-LABELS_CACHE: Dict[str, List[str]] = {}
-PREPROCESS_CACHE: Dict[str, Dict[str, Any]] = {}
+model_cache = ModelCache(
+    budget_bytes=settings.MODEL_CACHE_BUDGET_MB * 1024 * 1024,
+)
+register_metrics("model_cache", model_cache.stats)
+
+_DEFAULT_BATCHER = InferenceBatcher(
+    max_batch_size=settings.INFERENCE_MAX_BATCH_SIZE,
+    max_wait_ms=settings.INFERENCE_MAX_WAIT_MS,
+)
+register_metrics("inference_batcher", _DEFAULT_BATCHER.stats)
+
+
+def evict_model(model_version: str) -> None:
+    """Drop a model version and its sidecars from the in-process caches."""
+    if model_cache.evict(model_version):
+        print(f"[MODEL_CACHE] evicted {model_version}")
+
+
+ACTIVE_MODEL_REGISTRY = ActiveModelRegistry(
+    poll_interval_s=settings.ACTIVE_MODEL_POLL_SECONDS,
+    eviction_grace_s=settings.MODEL_EVICTION_GRACE_SECONDS,
+    on_evict=evict_model,
+)
+register_metrics("active_model", ACTIVE_MODEL_REGISTRY.stats)
+
+
+def _pin_active_model(
+    previous: Optional[ActiveModelInfo],
+    current: Optional[ActiveModelInfo],
+) -> None:
+    if previous is not None:
+        model_cache.unpin(previous.path)
+    if current is not None:
+        model_cache.pin(current.path)
+
+
+ACTIVE_MODEL_REGISTRY.add_listener(_pin_active_model)
+
+prediction_cache = PredictionCache(
+    max_entries=settings.PREDICTION_CACHE_MAX_ENTRIES,
+    ttl_s=settings.PREDICTION_CACHE_TTL_SECONDS,
+    hamming_threshold=settings.PREDICTION_CACHE_HAMMING_THRESHOLD,
+)
+register_metrics("prediction_cache", prediction_cache.stats)
+
+
+def _drop_cached_predictions(
+    previous: Optional[ActiveModelInfo],
+    current: Optional[ActiveModelInfo],
+) -> None:
+    if previous is not None and (
+            current is None or current.path != previous.path):
+        prediction_cache.invalidate_model(previous.path)
+
+
+ACTIVE_MODEL_REGISTRY.add_listener(_drop_cached_predictions)
+
+
+def _purge_activation_bundles(
+    previous: Optional[ActiveModelInfo],
+    current: Optional[ActiveModelInfo],
+) -> None:
+    """Les bundles d'activations de l'ancien modèle ne resserviront plus."""
+    if not settings.ACTIVATION_CACHE_ENABLED or previous is None:
+        return
+    if current is not None and current.path == previous.path:
+        return
+    root = Path(os.environ.get("UPLOAD_DIR") or "uploads") / "activations"
+    threading.Thread(
+        target=purge_model_bundles,
+        args=(root, previous.path),
+        name="activation-purge",
+        daemon=True,
+    ).start()
+
+
+ACTIVE_MODEL_REGISTRY.add_listener(_purge_activation_bundles)
+
+
+# Stockage partagé des modèles (None : MODEL_DIR local uniquement)
+_model_storage: Optional[BlobStorage] = None
+_model_storage_prefix = ""
+
+
+def configure_model_storage(
+    storage: Optional[BlobStorage], prefix: str = "",
+) -> None:
+    global _model_storage, _model_storage_prefix
+    _model_storage = storage
+    _model_storage_prefix = prefix
+
+
+def _fetch_model_artifacts(checkpoint: Path) -> None:
+    """Récupère un checkpoint absent du volume local depuis le stockage."""
+    if _model_storage is None or checkpoint.is_file():
+        return
+    try:
+        fetched = fetch_artifacts(
+            _model_storage, checkpoint, _model_storage_prefix)
+    except Exception as e:
+        print(f"[WARN] model artifacts not fetched for {checkpoint}: {e}")
+        return
+    if fetched:
+        print(f"[MODEL_STORAGE] fetched {len(fetched)} file(s) "
+              f"for {checkpoint.name}")
+
+
+def resolve_active_model(
+    catalog: model_catalog.ModelCatalog,
+) -> Optional[ActiveModelInfo]:
+    """Active model snapshot, served from the registry when fresh."""
+    return ACTIVE_MODEL_REGISTRY.resolve(catalog)
 
 
 def load_model(
@@ -53,8 +208,9 @@ def load_model(
     if device is None:
         device = torch.device("cpu")
 
-    if model_version in MODEL_CACHE:
-        return MODEL_CACHE[model_version]
+    cached = model_cache.get_model(model_version)
+    if cached is not None:
+        return cached
 
     resolved_path: Optional[str] = None
 
@@ -65,10 +221,13 @@ def load_model(
         candidate: Optional[Path] = None
         if model_version:
             mv = base / model_version
+            _fetch_model_artifacts(
+                mv if mv.suffix.lower() in (".pth", ".pt")
+                else base / (model_version + ".pth"))
             if mv.is_file() and mv.suffix.lower() in (".pth", ".pt"):
                 candidate = mv
             elif mv.is_dir():
-                pths = sorted(mv.glob("*.pth")) + sorted(mv.glob("*.pt"))
+                pths = _model_files(mv)
                 candidate = pths[-1] if pths else None
             else:
                 p = base / (model_version + ".pth")
@@ -76,7 +235,7 @@ def load_model(
                     candidate = p
 
         if candidate is None:
-            pths = sorted(base.glob("*.pth")) + sorted(base.glob("*.pt"))
+            pths = _model_files(base)
             candidate = pths[-1] if pths else None
 
         if candidate is None:
@@ -90,8 +249,7 @@ def load_model(
             module = loaded
             module.to(device)
             module.eval()
-            MODEL_CACHE[model_version] = module
-            return module
+            return model_cache.put_model(model_version, module)
 
         if isinstance(loaded, (tuple, list)) and len(loaded) > 0:
             first = loaded[0]
@@ -99,19 +257,19 @@ def load_model(
                 module = first
                 module.to(device)
                 module.eval()
-                MODEL_CACHE[model_version] = module
-                return module
+                return model_cache.put_model(model_version, module)
             if isinstance(first, str):
                 resolved_path = first
 
             if len(loaded) > 1 and loaded[1] is not None:
                 try:
-                    LABELS_CACHE[model_version] = list(loaded[1])
+                    model_cache.set_labels(model_version, list(loaded[1]))
                 except Exception:
                     pass
             if len(loaded) > 2 and loaded[2] is not None:
                 try:
-                    PREPROCESS_CACHE[model_version] = dict(loaded[2])
+                    model_cache.set_preprocess(
+                        model_version, dict(loaded[2]))
                 except Exception:
                     pass
         elif isinstance(loaded, str):
@@ -120,30 +278,55 @@ def load_model(
             raise ValueError("model_loader returned unsupported type")
 
     module = None
+    source_path: Optional[str] = None
     if resolved_path is not None:
         rp = Path(resolved_path)
         if not rp.is_absolute():
             resolved_path = str(Path("/app/models") / resolved_path)
 
-        # Try TorchScript first
-        try:
+        # Non-torch execution backend (e.g. onnxruntime on <stem>.onnx)
+        if settings.INFERENCE_BACKEND != TORCH:
             try:
-                module = torch.jit.load(resolved_path, map_location=device)
+                module = load_backend_module(
+                    settings.INFERENCE_BACKEND, resolved_path)
+            except ImportError as e:
+                print(f"[WARN] backend {settings.INFERENCE_BACKEND} "
+                      f"unavailable, using torch: {e}")
+            if module is not None:
                 try:
                     _try_load_sidecar(resolved_path, model_version)
                 except FileNotFoundError as e:
                     print(
                         f"[WARN] sidecar not loaded for {resolved_path}: {e}")
-            except RuntimeError as e:
-                msg = str(e)
-                if any(x in msg for x in
-                       ("PytorchStreamReader", "constants.pkl", "unsupported")
-                       ):
-                    module = None
-                else:
-                    raise
-        except Exception:
-            module = None
+
+        # Derived artifact (int8, optimized, mmap) when one is available
+        if module is None:
+            module, source_path = _load_derived_artifact(
+                resolved_path, model_version)
+        source_path = source_path or resolved_path
+
+        # Then TorchScript
+        if module is None:
+            try:
+                try:
+                    module = torch.jit.load(resolved_path, map_location=device)
+                    try:
+                        _try_load_sidecar(resolved_path, model_version)
+                    except FileNotFoundError as e:
+                        print(
+                            f"[WARN] sidecar not loaded for {resolved_path}: "
+                            f"{e}")
+                except RuntimeError as e:
+                    msg = str(e)
+                    if any(x in msg for x in
+                           ("PytorchStreamReader", "constants.pkl",
+                            "unsupported")
+                           ):
+                        module = None
+                    else:
+                        raise
+            except Exception:
+                module = None
 
         if module is None:
             module = _build_module_from_state(resolved_path, device=device)
@@ -157,8 +340,17 @@ def load_model(
 
     module.to(device)
     module.eval()
-    MODEL_CACHE[model_version] = module
-    return module
+    nbytes = None
+    if module_nbytes(module) == 0:
+        # Frozen graphs hold their weights as constants and other backends
+        # outside torch: account them by file size
+        nbytes = getattr(module, "nbytes", None)
+        if nbytes is None and source_path is not None:
+            try:
+                nbytes = os.path.getsize(source_path)
+            except OSError:
+                nbytes = None
+    return model_cache.put_model(model_version, module, nbytes=nbytes)
 
 
 def _postprocess_logits(
@@ -197,41 +389,8 @@ def _default_activation_layers(m: nn.Module) -> List[str]:
     return convs[:3]
 
 
-def _to_grayscale_heatmap_01(feat_chw: torch.Tensor) -> torch.Tensor:
-    """
-    feat_chw: [C,H,W] -> heatmap [H,W] normalized to [0,1]
-    """
-    heat = feat_chw.mean(dim=0)  # [H,W]
-    heat = heat - heat.min()
-    heat = heat / (heat.max() + 1e-6)
-    return heat.clamp(0, 1)
-
-
-def _heatmap_to_pil(heat_hw_01: torch.Tensor,
-                    out_size: Tuple[int, int]) -> Image.Image:
-    """
-    heatmap [H,W] in [0,1] -> PIL grayscale resized to out_size.
-    """
-    arr = (heat_hw_01 * 255).byte().cpu().numpy()
-    img = Image.fromarray(arr, mode="L")
-    if img.size != out_size:
-        img = img.resize(out_size, Image.Resampling.BILINEAR)
-    return img
-
-
-def _overlay_on_image(original_rgb: Image.Image, heat_gray: Image.Image,
-                      alpha: float = 0.45) -> Image.Image:
-    """
-    Overlay grayscale heatmap onto the original image using a simple blend.
-    (No colormap dependency; keeps it lightweight.)
-    """
-    base = original_rgb.convert("RGB")
-    heat_rgb = Image.merge("RGB", (heat_gray, heat_gray, heat_gray))
-    return Image.blend(base, heat_rgb, alpha=alpha)
-
-
 def predict_image(
-    image_bytes: bytes,
+    image_bytes: Optional[bytes],
     catalog: model_catalog.ModelCatalog,
     top_k: int = 3,
     confidence_threshold: float = 0.8,
@@ -242,26 +401,39 @@ def predict_image(
     activation_layers: Optional[List[str]] = None,
     save_activations_to: Optional[str] = None,
     max_activation_channels: int = 64,
+    image: Optional[Image.Image] = None,
+    with_activations: bool = True,
 ) -> Dict[str, Any]:
+    """Run the active model on one image.
+
+    The image is given either as encoded ``image_bytes`` or as an already
+    decoded PIL ``image`` (ingestion pipeline), which skips a second decode.
+    ``with_activations=False`` skips hooks and heatmap rendering.
+    """
     if device is None:
         device = torch.device("cpu")
+    if image is None and image_bytes is None:
+        raise ValueError("predict_image needs image_bytes or image")
 
     start_time = time.time()
+    timings: Dict[str, float] = {}
 
-    active_model = catalog.find_active_model()
+    t0 = time.perf_counter()
+    active_model = resolve_active_model(catalog)
     if active_model is None:
         raise RuntimeError("No active model configured in database")
 
     model_version = active_model.path
     model = load_model(model_version, device=device)
+    timings["load_model"] = (time.perf_counter() - t0) * 1000.0
 
     # labels
-    labels_list: Optional[List[str]] = LABELS_CACHE.get(model_version)
+    labels_list: Optional[List[str]] = model_cache.get_labels(model_version)
     if labels is not None:
         labels_list = list(labels)
 
     # preprocess config
-    pc = PREPROCESS_CACHE.get(model_version, {}).copy()
+    pc = model_cache.get_preprocess(model_version)
     if preprocess_config:
         pc.update(preprocess_config)
 
@@ -270,79 +442,65 @@ def predict_image(
     std = pc.get("std")
 
     # original image (for overlay)
-    original = open_image_from_bytes(image_bytes).convert("RGB")
-    original_resized = original.resize((size, size), Image.Resampling.BILINEAR)
+    t0 = time.perf_counter()
+    if image is not None:
+        original = image.convert("RGB")
+    else:
+        original = open_image_from_bytes(image_bytes).convert("RGB")
 
     # model tensor
     tensor = default_preprocess(original, size=size,
                                 mean=mean, std=std).to(device)
-
-    # hooks
-    hooks: List[torch.utils.hooks.RemovableHandle] = []
-    activations: Dict[str, torch.Tensor] = {}
-
-    def _make_hook(name: str):
-        def hook(module, inp, out):
-            try:
-                if isinstance(out, (tuple, list)):
-                    out = out[0]
-                if torch.is_tensor(out):
-                    # store on CPU
-                    activations[name] = out.detach().cpu()
-            except Exception:
-                pass
-        return hook
-
-    layers_to_hook = activation_layers or _default_activation_layers(model)
-
-    if layers_to_hook:
-        try:
-            name_to_module = dict(model.named_modules())
-            for n in layers_to_hook:
-                if n in name_to_module:
-                    hooks.append(name_to_module[n].register_forward_hook(
-                        _make_hook(n)))
-                else:
-                    print(f"[ACTIVATIONS][WARN] layer '{n}' not found")
-        except Exception as e:
-            print(f"[ACTIVATIONS][WARN] cannot register hooks: {e}")
-            hooks = []
-
-    # inference
-    with torch.no_grad():
-        logits = model(tensor)
-        if logits.ndim == 1:
-            logits = logits.unsqueeze(0)
-        indices, scores = _postprocess_logits(logits, top_k=top_k)
-
-    # cleanup hooks
-    for h in hooks:
-        try:
-            h.remove()
-        except Exception:
-            pass
-
-    # activations -> images
+    timings["preprocess"] = (time.perf_counter() - t0) * 1000.0
+
+    layers_to_hook: List[str] = []
+    if with_activations:
+        layers_to_hook = (
+            activation_layers or _default_activation_layers(model))
+    # Channel mean computed in the hook: only [1, H, W] maps are copied
+    reduction = ChannelReduction(
+        max_activation_channels, settings.ACTIVATION_REDUCTION)
+
+    # inference (micro-batched with concurrent requests when enabled)
+    t0 = time.perf_counter()
+    if settings.INFERENCE_BATCHING_ENABLED:
+        batch_result = _DEFAULT_BATCHER.submit(
+            model,
+            model_version,
+            tensor,
+            top_k=top_k,
+            capture_layers=layers_to_hook,
+            activation_reduction=reduction,
+        )
+    else:
+        batch_result = run_batch(
+            model, tensor, top_k=[top_k], capture_layers=[layers_to_hook],
+            activation_reduction=reduction,
+        )[0]
+    timings["inference"] = (time.perf_counter() - t0) * 1000.0
+    timings["inference_queue"] = batch_result.queue_ms
+
+    indices, scores = batch_result.indices, batch_result.scores
+    activations: Dict[str, torch.Tensor] = batch_result.activations
+
+    # activations -> compressed bundle (PNGs rendered on demand)
+    t0 = time.perf_counter()
     activations_payload: Optional[Dict[str, Any]] = None
     if activations:
         uploads_dir = save_activations_to or os.environ.get(
             "UPLOAD_DIR") or "uploads"
         token = str(uuid.uuid4())
         base = Path(uploads_dir) / "activations" / token
-        base.mkdir(parents=True, exist_ok=True)
 
         items: List[Dict[str, Any]] = []
-        out_size = (size, size)
+        files: Dict[str, Dict[str, Any]] = {}
+        ext = file_extension(settings.ACTIVATION_IMAGE_FORMAT)
 
+        reduced: Dict[str, torch.Tensor] = {}
         for name, at in activations.items():
             try:
-                # Expect conv-like tensors: [N,C,H,W]
-                if at.ndim == 4:
-                    feat = at[0]  # [C,H,W]
-                elif at.ndim == 3:
-                    feat = at
-                else:
-                    # Non-spatial (vector) -> skip (or you could render bars)
+                # Non-spatial (vector) -> skip (or you could render bars)
+                if at.ndim not in (3, 4):
                     items.append({
                         "layer": name,
                         "shape": list(at.shape),
@@ -351,41 +509,21 @@ def predict_image(
                     })
                     continue
 
-                # Safety: cap channels if insane
-                if feat.shape[0] > max_activation_channels:
-                    feat = feat[:max_activation_channels]
-
-                heat01 = _to_grayscale_heatmap_01(feat)
-                heat_img = _heatmap_to_pil(
-                    heat01, out_size=out_size)
-                overlay = _overlay_on_image(
-                    original_resized, heat_img, alpha=0.45)
-
-                # Save both heatmap and overlay for "pro" UX
                 safe = name.replace(".", "_")
+                reduced[safe] = to_map(at)
 
-                heat_fname = f"{safe}__heat.png"
-                heat_path = base / heat_fname
-                heat_img.save(heat_path)
-
-                ov_fname = f"{safe}__overlay.png"
-                ov_path = base / ov_fname
-                overlay.save(ov_path)
-
-                items.append({
-                    "layer": name,
-                    "shape": list(at.shape),
-                    "type": "heatmap",
-                    "file": str(heat_path),
-                    "url": f"/pictures/activations/{token}/image/{heat_fname}",
-                })
-                items.append({
-                    "layer": name,
-                    "shape": list(at.shape),
-                    "type": "overlay",
-                    "file": str(ov_path),
-                    "url": f"/pictures/activations/{token}/image/{ov_fname}",
-                })
+                # Both heatmap and overlay for "pro" UX
+                for kind, fname in (
+                    (HEATMAP, f"{safe}__heat{ext}"),
+                    (OVERLAY, f"{safe}__overlay{ext}"),
+                ):
+                    files[fname] = {"kind": kind, "map": safe}
+                    items.append({
+                        "layer": name,
+                        "shape": list(at.shape),
+                        "type": kind,
+                        "url": f"/pictures/activations/{token}/image/{fname}",
+                    })
 
             except Exception as e:
                 items.append({
@@ -394,11 +532,19 @@ def predict_image(
                     "error": str(e),
                 })
 
+        maps = normalize_maps(reduced)
+        original_resized = original.resize(
+            (size, size), Image.Resampling.BILINEAR)
         activations_payload = {
             "token": token,
             "layers_requested": layers_to_hook,
+            "bundle": str(base / BUNDLE_FILE),
             "items": items,
         }
+        write_bundle(base, original_resized, maps, files,
+                     model_version=model_version,
+                     result=activations_payload)
+        timings["activations"] = (time.perf_counter() - t0) * 1000.0
 
     # mapping indices → labels
     preds: List[Dict[str, Any]] = []
@@ -418,6 +564,7 @@ def predict_image(
         "accepted": bool(accepted),
         "time_ms": float(elapsed_ms),
         "activations": activations_payload,
+        "timings_ms": timings,
     }
 
     # callback save
@@ -430,6 +577,10 @@ def predict_image(
             "id": str(uuid.uuid4()),
         }
         try:
+            if image_bytes is None:
+                buffer = io.BytesIO()
+                original.save(buffer, format="JPEG", quality=95)
+                image_bytes = buffer.getvalue()
             save_callback(image_bytes, metadata)
             result["save_callback_ok"] = True
         except Exception as e:
@@ -444,6 +595,131 @@ def predict_image(
     return result
 
 
+def cached_predict_image(
+    image_bytes: Optional[bytes],
+    catalog: model_catalog.ModelCatalog,
+    image: Optional[Image.Image] = None,
+    cache: Optional[PredictionCache] = None,
+    **kwargs: Any,
+) -> Dict[str, Any]:
+    """``predict_image`` behind the prediction cache.
+
+    Identical bytes (same active model, same options) return the cached
+    result without a forward pass. Near-duplicates (dHash) only match for
+    activation-free calls (``with_activations=False``, e.g. the batch
+    import). Activation maps are captured during the forward pass, so a
+    request asking for them would pay that pass anyway; it only gets exact
+    hits. Requests with overrides or a save callback are never cached.
+    The result carries ``"cache": "exact" | "similar" | "miss"``.
+    """
+    cache = cache or prediction_cache
+    cacheable = (
+        settings.PREDICTION_CACHE_ENABLED
+        and image_bytes is not None
+        and not kwargs.get("labels")
+        and not kwargs.get("preprocess_config")
+        and kwargs.get("save_callback") is None
+    )
+    active_model = resolve_active_model(catalog) if cacheable else None
+    if active_model is None:
+        return predict_image(image_bytes, catalog, image=image, **kwargs)
+
+    t0 = time.perf_counter()
+    with_activations = kwargs.get("with_activations", True)
+    variant = (
+        kwargs.get("top_k", 3),
+        kwargs.get("confidence_threshold", 0.8),
+        tuple(kwargs.get("activation_layers") or ()),
+        kwargs.get("max_activation_channels", 64),
+        with_activations,
+    )
+    digest = content_hash(image_bytes)
+    phash = None
+    # Les heatmaps d'un quasi-doublon sont celles d'une autre image : pas
+    # de dHash (ni calculé, ni stocké) quand on les demande
+    if cache.hamming_threshold >= 0 and not with_activations:
+        if image is None:
+            image = open_image_from_bytes(image_bytes)
+        phash = dhash(image)
+
+    cached, kind = cache.lookup(
+        active_model.path, digest, phash, variant,
+        is_valid=_activation_files_exist,
+    )
+    lookup_ms = (time.perf_counter() - t0) * 1000.0
+    if cached is not None:
+        if kind == SIMILAR:
+            # Prédictions et top-k seulement, jamais le token d'un autre
+            cached["activations"] = None
+        cached["cache"] = kind
+        cached["time_ms"] = lookup_ms
+        cached["timings_ms"] = {"cache_lookup": lookup_ms}
+        return cached
+
+    result = predict_image(image_bytes, catalog, image=image, **kwargs)
+    if result.get("model_version") == active_model.path:
+        cache.store(active_model.path, digest, result, phash, variant)
+    result["cache"] = MISS
+    result.setdefault("timings_ms", {})["cache_lookup"] = lookup_ms
+    return result
+
+
+def _activation_files_exist(result: Dict[str, Any]) -> bool:
+    """Un résultat en cache n'est réutilisable que si ses activations
+    existent encore sur disque."""
+    bundle = (result.get("activations") or {}).get("bundle")
+    return bundle is None or Path(bundle).is_file()
+
+
+def _load_derived_artifact(
+    resolved_path: str,
+    model_version: str,
+) -> Tuple[Optional[nn.Module], Optional[str]]:
+    """Premier artefact dérivé disponible, par ordre de préférence.
+
+    Retourne (module, chemin de l'artefact) ou (None, None).
+    """
+    candidates = []
+    if settings.MODEL_INT8_ENABLED:
+        candidates.append((
+            int8_artifact_path(resolved_path),
+            lambda p: torch.jit.load(str(p), map_location="cpu"),
+        ))
+    if settings.MODEL_OPTIMIZED_ENABLED:
+        candidates.append((
+            optimized_artifact_path(resolved_path),
+            lambda p: optimize_for_serving(
+                torch.jit.load(str(p), map_location="cpu")),
+        ))
+    if settings.MODEL_MMAP_ENABLED:
+        # Eager copy mapped from the page cache, shared across workers
+        candidates.append((
+            mmap_artifact_path(resolved_path),
+            lambda p: load_mmap_module(resolved_path),
+        ))
+
+    for path, loader in candidates:
+        if not path.is_file():
+            continue
+        try:
+            module = loader(path)
+        except Exception as e:
+            print(f"[WARN] artifact unusable {path}: {e}")
+            continue
+        try:
+            _try_load_sidecar(resolved_path, model_version)
+        except FileNotFoundError as e:
+            print(f"[WARN] sidecar not loaded for {resolved_path}: {e}")
+        return module, str(path)
+    return None, None
+
+
+def _model_files(directory: Path) -> List[Path]:
+    """Checkpoints d'un dossier, hors artefacts dérivés (``-mmap.pt``...)."""
+    pths = sorted(directory.glob("*.pth")) + sorted(directory.glob("*.pt"))
+    return [p for p in pths if not is_derived_artifact(p)]
+
+
 def _try_load_sidecar(path: str, model_version: str) -> None:
     p = Path(path)
     preferred_label = p.parent / (p.stem + "-label.json")
@@ -452,7 +728,8 @@ def _try_load_sidecar(path: str, model_version: str) -> None:
             data = json.load(fh)
             if isinstance(data, dict) and "classes" in data and isinstance(
                     data["classes"], list):
-                LABELS_CACHE[model_version] = [str(x) for x in data["classes"]]
+                model_cache.set_labels(
+                    model_version, [str(x) for x in data["classes"]])
             else:
                 raise ValueError("label sidecar malformed")
 
@@ -460,11 +737,11 @@ def _try_load_sidecar(path: str, model_version: str) -> None:
     if preferred_preprocess.is_file():
         try:
             with open(preferred_preprocess, "r") as fh:
-                PREPROCESS_CACHE[model_version] = json.load(fh)
+                model_cache.set_preprocess(model_version, json.load(fh))
         except Exception:
             pass
 
-    if model_version not in LABELS_CACHE:
+    if model_cache.get_labels(model_version) is None:
         raise FileNotFoundError(
             "Label sidecar not found for model at %s; expected %s"
             % (p, preferred_label)
@@ -480,7 +757,7 @@ def _build_module_from_state(
     if device is None:
         device = torch.device("cpu")
 
-    state = torch.load(path, map_location="cpu")
+    state = load_checkpoint(path, mmap=settings.MODEL_MMAP_ENABLED)
     if isinstance(state, dict):
         if "state_dict" in state:
             state_dict = state["state_dict"]
@@ -520,7 +797,9 @@ def _build_module_from_state(
         in_feat = model.fc.in_features
         model.fc = nn.Linear(in_feat, num_classes)
 
-    model.load_state_dict(new_state, strict=False)
+    # assign=True keeps the (mmap-backed) loaded tensors instead of copying
+    # them into freshly allocated parameters
+    model.load_state_dict(new_state, strict=False, assign=True)
     model.to(device)
     model.eval()
     return model
@@ -0,0 +1,209 @@
+# app/model/domain/service/prediction_cache.py
+"""Prediction cache for duplicate and near-duplicate uploads.
+
+Retries after a network error resend the exact same bytes, and users often
+re-scan a room from the same spot. Results are cached per active model
+version and keyed by the SHA-256 of the upload; a 64-bit difference hash
+(dHash) of the decoded image additionally matches near-duplicates within a
+configurable Hamming distance.
+
+Entries expire after ``ttl_s`` and the least recently used ones are evicted
+beyond ``max_entries``. The cache is per process, like the model cache.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from PIL import Image
+
+EXACT = "exact"
+SIMILAR = "similar"
+MISS = "miss"
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def dhash(image: Image.Image, hash_size: int = 8) -> int:
+    """Hash perceptuel par différence (``hash_size**2`` bits)."""
+    small = image.convert("L").resize(
+        (hash_size + 1, hash_size), Image.Resampling.BILINEAR)
+    pixels = list(small.getdata())
+    value = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            left = pixels[offset + col]
+            right = pixels[offset + col + 1]
+            value = (value << 1) | int(left > right)
+    return value
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def is_distinctive(phash: int, bits: int = 64, margin: int = 8) -> bool:
+    """False pour une image quasi uniforme (mur blanc, image noire...).
+
+    Flat images hash to (almost) all zeros or ones whatever their content,
+    so they would all match each other as near-duplicates.
+    """
+    ones = bin(phash).count("1")
+    return margin <= ones <= bits - margin
+
+
+@dataclass
+class _Entry:
+    result: Dict[str, Any]
+    phash: Optional[int]
+    expires_at: float
+
+
+class PredictionCache:
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_s: float = 600.0,
+        hamming_threshold: int = 4,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max(int(max_entries), 1)
+        self.ttl_s = float(ttl_s)
+        self.hamming_threshold = int(hamming_threshold)
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        # (model_version, variant, digest) -> entry
+        self._entries: "OrderedDict[Tuple[str, Hashable, str], _Entry]" = (
+            OrderedDict())
+
+        self._exact_hits = 0
+        self._similar_hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def lookup(
+        self,
+        model_version: str,
+        digest: str,
+        phash: Optional[int] = None,
+        variant: Hashable = None,
+        is_valid: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    ) -> Tuple[Optional[Dict[str, Any]], str]:
+        """Retourne (copie du résultat, EXACT|SIMILAR) ou (None, MISS).
+
+        ``is_valid`` lets the caller reject an entry whose side effects are
+        gone (e.g. activation files removed); rejected entries are dropped.
+        """
+        now = self._clock()
+        with self._lock:
+            key = (model_version, variant, digest)
+            entry = self._live_entry(key, now)
+            if entry is not None and (is_valid is None
+                                      or is_valid(entry.result)):
+                self._entries.move_to_end(key)
+                self._exact_hits += 1
+                return copy.deepcopy(entry.result), EXACT
+            if entry is not None:
+                del self._entries[key]
+
+            if (phash is not None and self.hamming_threshold >= 0
+                    and is_distinctive(phash)):
+                match = self._find_similar(
+                    model_version, variant, phash, now, is_valid)
+                if match is not None:
+                    self._entries.move_to_end(match)
+                    self._similar_hits += 1
+                    return copy.deepcopy(self._entries[match].result), SIMILAR
+
+            self._misses += 1
+            return None, MISS
+
+    def store(
+        self,
+        model_version: str,
+        digest: str,
+        result: Dict[str, Any],
+        phash: Optional[int] = None,
+        variant: Hashable = None,
+    ) -> None:
+        key = (model_version, variant, digest)
+        if phash is not None and not is_distinctive(phash):
+            phash = None
+        entry = _Entry(
+            result=copy.deepcopy(result),
+            phash=phash,
+            expires_at=self._clock() + self.ttl_s,
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate_model(self, model_version: str) -> int:
+        """Supprime les entrées d'une version de modèle."""
+        with self._lock:
+            keys = [k for k in self._entries if k[0] == model_version]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self._exact_hits + self._similar_hits
+            lookups = hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_s": self.ttl_s,
+                "hamming_threshold": self.hamming_threshold,
+                "exact_hits": self._exact_hits,
+                "similar_hits": self._similar_hits,
+                "misses": self._misses,
+                "hit_rate": (hits / lookups) if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+            }
+
+    # ------------------------------------------------------------------
+    # Internals (lock held)
+    # ------------------------------------------------------------------
+
+    def _live_entry(self, key, now: float) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= now:
+            del self._entries[key]
+            self._expirations += 1
+            return None
+        return entry
+
+    def _find_similar(self, model_version, variant, phash, now, is_valid):
+        best_key = None
+        best_distance = self.hamming_threshold + 1
+        for key in list(self._entries):
+            if key[0] != model_version or key[1] != variant:
+                continue
+            entry = self._live_entry(key, now)
+            if entry is None or entry.phash is None:
+                continue
+            distance = hamming(entry.phash, phash)
+            if distance < best_distance and (
+                    is_valid is None or is_valid(entry.result)):
+                best_key, best_distance = key, distance
+        return best_key
@@ -0,0 +1,285 @@
+# app/model/domain/service/training_jobs.py
+"""Asynchronous training jobs.
+
+``POST /models/train`` only records a ``training_jobs`` row. A
+``TrainingWorker`` claims queued jobs and runs them outside any request.
+It runs either as a thread of the API process or as a standalone process
+(``python -m app.scripts.training_worker``). A fine-tune that lasts hours
+no longer holds an HTTP worker and survives client disconnects.
+
+Claiming relies on ``SELECT ... FOR UPDATE SKIP LOCKED``, so any number of
+workers can poll the same table. While a job trains, its worker refreshes
+``heartbeat_at`` and records per-epoch progress. A job whose worker died
+stops heartbeating, and another worker claims it again after
+``stale_after_s``, up to ``max_attempts`` attempts in total.
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+import threading
+import uuid
+from contextlib import AbstractContextManager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional
+from uuid import UUID
+
+from app.model.domain.DTO.modelTrainingDTO import ModelTrainingDTO
+from app.model.domain.catalog.training_job_catalog import TrainingJobCatalog
+from app.model.domain.entity.training_job import FAILED, SUCCEEDED
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non POSIX
+    fcntl = None
+
+
+def epoch_progress(
+    epoch: int,
+    epochs: int,
+    loss: float,
+    samples: int,
+    epoch_s: float,
+    elapsed_s: float,
+    data_wait_s: Optional[float] = None,
+    compute_s: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Avancement après un epoch : loss, débit (images/s) et ETA.
+
+    ``data_wait_s`` / ``compute_s`` : temps passé à attendre le DataLoader
+    et à calculer (forward/backward/step) pendant l'epoch.
+    """
+    progress = {
+        "epoch": epoch,
+        "epochs": epochs,
+        "loss": float(loss),
+        "samples": samples,
+        "epoch_s": round(epoch_s, 3),
+        "throughput": round(samples / epoch_s, 2) if epoch_s > 0 else None,
+        "elapsed_s": round(elapsed_s, 3),
+        "eta_s": round(elapsed_s / epoch * (epochs - epoch), 3),
+    }
+    if data_wait_s is not None:
+        progress["data_wait_s"] = round(data_wait_s, 3)
+    if compute_s is not None:
+        progress["compute_s"] = round(compute_s, 3)
+    return progress
+
+
+def describe_training_error(exc: Exception) -> str:
+    """Message lisible pour les erreurs de configuration des couches."""
+    msg = str(exc)
+    if not isinstance(exc, RuntimeError):
+        return msg or type(exc).__name__
+    if "mat1 and mat2 shapes cannot be multiplied" in msg:
+        return (
+            "Les dimensions entre les couches sont incompatibles. "
+            "Vérifiez les paramètres in_channels/out_channels "
+            "et in_features/out_features de vos couches."
+        )
+    if "spatial targets supported" in msg:
+        return (
+            "Le modèle produit une sortie incompatible avec "
+            "la classification. Vérifiez l'architecture "
+            "de vos couches."
+        )
+    if "negative dimensions" in msg or "invalid argument" in msg:
+        return (
+            "Les paramètres des couches produisent des dimensions "
+            "invalides. Vérifiez les valeurs de kernel_size, "
+            "stride et padding."
+        )
+    return f"Erreur lors de l'entraînement : {msg}"
+
+
+class TrainingWorker:
+    def __init__(
+        self,
+        job_catalog_scope: Callable[
+            [], AbstractContextManager[TrainingJobCatalog]],
+        training_scope: Callable[[], AbstractContextManager[Any]],
+        poll_interval_s: float = 5.0,
+        heartbeat_interval_s: float = 15.0,
+        stale_after_s: float = 120.0,
+        max_attempts: int = 2,
+        lock_path: Optional[str] = None,
+    ) -> None:
+        self._job_catalog_scope = job_catalog_scope
+        # Fournit un ModelTraining avec sa propre session
+        self._training_scope = training_scope
+        self.poll_interval_s = max(float(poll_interval_s), 0.1)
+        self.heartbeat_interval_s = max(float(heartbeat_interval_s), 0.1)
+        self.stale_after_s = float(stale_after_s)
+        self.max_attempts = max(int(max_attempts), 1)
+        # Un seul worker par nœud quand plusieurs process uvicorn tournent
+        self.lock_path = lock_path
+        self.worker_id = (
+            f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}")
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock_fh = None
+
+        self._current_job: Optional[str] = None
+        self._succeeded = 0
+        self._failed = 0
+        self._lost = 0
+        self._errors = 0
+
+    # ------------------------------------------------------------------
+    # Jobs
+    # ------------------------------------------------------------------
+
+    def run_once(self) -> bool:
+        """Réclame et exécute un job ; False si la file est vide."""
+        stale_before = (datetime.now(timezone.utc)
+                        - timedelta(seconds=self.stale_after_s))
+        with self._job_catalog_scope() as catalog:
+            job = catalog.claim_next(self.worker_id, stale_before)
+            if job is None:
+                return False
+            job_id, params, attempts = (
+                job.job_id, dict(job.params), job.attempts)
+
+        if attempts > self.max_attempts:
+            # Son worker est mort à chaque tentative (OOM, pod tué...)
+            self._finish(job_id, FAILED, error=(
+                f"Abandonné après {attempts - 1} tentative(s) interrompue(s)"))
+            return True
+
+        print(f"[TRAINING] job {job_id} claimed by {self.worker_id} "
+              f"(attempt {attempts}/{self.max_attempts})")
+        self._run(job_id, params)
+        return True
+
+    def _run(self, job_id: UUID, params: Dict[str, Any]) -> None:
+        with self._lock:
+            self._current_job = str(job_id)
+        latest: Dict[str, Any] = {}
+        done = threading.Event()
+
+        def _beat() -> None:
+            while not done.wait(self.heartbeat_interval_s):
+                self._heartbeat(job_id, None)
+
+        def _on_epoch(progress: Dict[str, Any]) -> None:
+            latest.update(progress)
+            self._heartbeat(job_id, dict(latest))
+
+        beat = threading.Thread(
+            target=_beat, name="training-heartbeat", daemon=True)
+        beat.start()
+        model_name = None
+        error = None
+        try:
+            dto = ModelTrainingDTO.model_validate(params)
+            with self._training_scope() as trainer:
+                model_name = trainer.train(dto, on_epoch=_on_epoch)
+            status = SUCCEEDED
+        except Exception as e:
+            print(f"[ERROR] training job {job_id} failed: {e}")
+            status = FAILED
+            error = describe_training_error(e)
+        finally:
+            done.set()
+            beat.join()
+
+        self._finish(job_id, status, model_name=model_name, error=error)
+        print(f"[TRAINING] job {job_id} {status}"
+              + (f": {model_name}" if model_name else ""))
+
+    def _heartbeat(
+        self, job_id: UUID, progress: Optional[Dict[str, Any]]
+    ) -> None:
+        try:
+            with self._job_catalog_scope() as catalog:
+                owned = catalog.heartbeat(job_id, self.worker_id, progress)
+            if not owned:
+                print(f"[WARN] training job {job_id} reclaimed by another "
+                      "worker")
+        except Exception as e:
+            with self._lock:
+                self._errors += 1
+            print(f"[WARN] training heartbeat failed for {job_id}: {e}")
+
+    def _finish(
+        self,
+        job_id: UUID,
+        status: str,
+        model_name: Optional[str] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        with self._job_catalog_scope() as catalog:
+            owned = catalog.finish(
+                job_id, self.worker_id, status, model_name, error)
+        with self._lock:
+            self._current_job = None
+            if not owned:
+                self._lost += 1
+            elif status == SUCCEEDED:
+                self._succeeded += 1
+            else:
+                self._failed += 1
+
+    # ------------------------------------------------------------------
+    # Loop
+    # ------------------------------------------------------------------
+
+    def run(self, drain: bool = False) -> None:
+        """Boucle de polling ; ``drain`` s'arrête dès que la file est vide."""
+        while not self._stop.is_set():
+            worked = False
+            if self._try_lock():
+                try:
+                    worked = self.run_once()
+                except Exception as e:
+                    with self._lock:
+                        self._errors += 1
+                    print(f"[WARN] training worker poll failed: {e}")
+            if not worked:
+                if drain:
+                    return
+                self._stop.wait(self.poll_interval_s)
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self.run, name="training-worker", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        # Un entraînement en cours n'est pas interrompu : le job sera
+        # repris par un autre worker quand son heartbeat expirera
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "worker_id": self.worker_id,
+                "active": self._lock_fh is not None or self.lock_path is None,
+                "current_job": self._current_job,
+                "succeeded": self._succeeded,
+                "failed": self._failed,
+                "lost": self._lost,
+                "errors": self._errors,
+            }
+
+    def _try_lock(self) -> bool:
+        """Verrou de nœud tenu pour la vie du process (sans fcntl : oui)."""
+        if self.lock_path is None or fcntl is None or self._lock_fh:
+            return True
+        fh = open(self.lock_path, "a")
+        try:
+            fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            fh.close()
+            return False
+        with self._lock:
+            self._lock_fh = fh
+        return True
@@ -28,11 +28,11 @@ def default_preprocess(image: Image.Image, size: int = 224,
     if std is None:
         std = (0.229, 0.224, 0.225)
 
-    transforms = T.Compose([
-        T.Resize(size),
-        T.CenterCrop(size),
-        T.ToTensor(),
-        T.Normalize(mean=mean, std=std),
-    ])
+    steps = [T.ToTensor(), T.Normalize(mean=mean, std=std)]
+    if image.size != (size, size):
+        # Already-square inputs at the target size (ingestion pipeline)
+        # skip the resize/crop round trip.
+        steps = [T.Resize(size), T.CenterCrop(size)] + steps
+    transforms = T.Compose(steps)
     tensor = transforms(image)
     return tensor.unsqueeze(0)  # add batch dim
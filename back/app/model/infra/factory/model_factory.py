@@ -1,3 +1,8 @@
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator
+
 from sqlalchemy.orm import Session
 from fastapi import Depends
 
@@ -11,22 +16,45 @@ from app.model.infra.repository.model_stats_repository import (
 from app.model.infra.repository.model_stats_sqlalchemy_adapter import (
     ModelStatsSQLAlchemyAdapter,
 )
+from app.model.infra.repository.training_job_repository import (
+    TrainingJobRepository,
+)
+from app.model.infra.repository.training_job_sqlalchemy_adapter import (
+    TrainingJobSQLAlchemyAdapter,
+)
 from app.model.infra.model_loader.GitModelLoaderImpl import GitModelLoaderImpl
 from app.model.domain.catalog.model_catalog import ModelCatalog
 from app.model.domain.catalog.model_stats_catalog import ModelStatsCatalog
+from app.model.domain.catalog.training_job_catalog import TrainingJobCatalog
 from app.model.domain.service.model_loader import ModelLoader
 from app.model.domain.service.model_training import ModelTraining
+from app.model.domain.service.training_jobs import TrainingWorker
 from app.room.infra.factory.room_factory import get_room_catalog
 from app.room.domain.catalog.room_catalog import RoomCatalog
 from app.picture.domain.catalog.picture_catalog import PictureCatalog
 from app.picture.infra.factory.picture_factory import get_picture_catalog
-from app.database import get_session
+from app.database import get_session, SessionLocal
+from app.config import settings
+from app.metrics import register_metrics
 from app.model.domain.service.model_namer import ModelNamer
 from app.model.domain.service.model_stats_service import ModelStatsService
 from app.model.domain.catalog.layers_catalog import LayersCatalog
 from app.model.infra.layer_service.layer_service_adapter import (
     LayerServiceAdapter,
 )
+from app.model.domain.service.inference_executor import InferenceExecutor
+from app.model.domain.service.model_warmup import ModelWarmup
+from app.storage.infra.factory.storage_factory import get_blob_storage
+
+_inference_executor = InferenceExecutor(
+    max_workers=settings.INFERENCE_EXECUTOR_WORKERS,
+    max_queue=settings.INFERENCE_EXECUTOR_MAX_QUEUE,
+    retry_after_seconds=settings.INFERENCE_RETRY_AFTER_SECONDS,
+)
+register_metrics("inference_executor", _inference_executor.stats)
+
+_model_warmup = ModelWarmup(iterations=settings.WARMUP_ITERATIONS)
+register_metrics("warmup", _model_warmup.status)
 
 
 def get_model_catalog(db: Session = Depends(get_session)) -> ModelCatalog:
@@ -34,6 +62,70 @@ def get_model_catalog(db: Session = Depends(get_session)) -> ModelCatalog:
     return ModelSQLAlchemyAdapter(repo)
 
 
+@contextmanager
+def model_catalog_session() -> Iterator[ModelCatalog]:
+    """ModelCatalog with its own session, for work outside a request."""
+    db = SessionLocal()
+    try:
+        yield ModelSQLAlchemyAdapter(ModelRepository(db))
+    finally:
+        db.close()
+
+
+def get_training_job_catalog(
+    db: Session = Depends(get_session),
+) -> TrainingJobCatalog:
+    return TrainingJobSQLAlchemyAdapter(TrainingJobRepository(db))
+
+
+@contextmanager
+def training_job_catalog_session() -> Iterator[TrainingJobCatalog]:
+    """TrainingJobCatalog with its own session, for the training worker."""
+    db = SessionLocal()
+    try:
+        yield TrainingJobSQLAlchemyAdapter(TrainingJobRepository(db))
+    finally:
+        db.close()
+
+
+@contextmanager
+def model_training_session() -> Iterator[ModelTraining]:
+    """ModelTraining with its own session, for work outside a request."""
+    db = SessionLocal()
+    try:
+        model_catalog = ModelSQLAlchemyAdapter(ModelRepository(db))
+        yield ModelTraining(
+            room_catalog=get_room_catalog(db),
+            model_catalog=model_catalog,
+            picture_catalog=get_picture_catalog(db),
+            model_namer=ModelNamer(model_catalog),
+            blob_storage=get_blob_storage(),
+        )
+    finally:
+        db.close()
+
+
+def build_training_worker(lock_path=None) -> TrainingWorker:
+    return TrainingWorker(
+        job_catalog_scope=training_job_catalog_session,
+        training_scope=model_training_session,
+        poll_interval_s=settings.TRAINING_POLL_SECONDS,
+        heartbeat_interval_s=settings.TRAINING_HEARTBEAT_SECONDS,
+        stale_after_s=settings.TRAINING_STALE_SECONDS,
+        max_attempts=settings.TRAINING_MAX_ATTEMPTS,
+        lock_path=lock_path,
+    )
+
+
+# Worker dans l'API (TRAINING_WORKER_ENABLED) : verrou dans le /tmp du
+# conteneur, un seul de ses process uvicorn entraîne
+_training_worker = build_training_worker(
+    lock_path=os.path.join(
+        tempfile.gettempdir(), f"{settings.APP_NAME}-training.lock"),
+)
+register_metrics("training_worker", _training_worker.stats)
+
+
 def get_model_stats_catalog(
     db: Session = Depends(get_session),
 ) -> ModelStatsCatalog:
@@ -66,7 +158,8 @@ def get_model_training(
         room_catalog=room_catalog,
         model_catalog=model_catalog,
         picture_catalog=picture_catalog,
-        model_namer=model_namer
+        model_namer=model_namer,
+        blob_storage=get_blob_storage(),
     )
 
 
@@ -82,3 +175,15 @@ def get_model_stats_service(
 
 def get_layers_catalog() -> LayersCatalog:
     return LayerServiceAdapter()
+
+
+def get_inference_executor() -> InferenceExecutor:
+    return _inference_executor
+
+
+def get_model_warmup() -> ModelWarmup:
+    return _model_warmup
+
+
+def get_training_worker() -> TrainingWorker:
+    return _training_worker
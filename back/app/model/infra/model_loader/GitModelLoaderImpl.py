@@ -2,7 +2,13 @@ import os
 from typing import Collection, Optional, Union
 from pathlib import Path
 
+from app.config import settings
 from app.model.domain.service.model_loader import ModelLoader
+from app.model.domain.service.model_artifacts import (
+    is_derived_artifact,
+    load_checkpoint,
+    load_mmap_module,
+)
 from app.model.domain.catalog.model_catalog import ModelCatalog
 from app.model.domain.entity.model import Model
 
@@ -39,6 +45,9 @@ class GitModelLoaderImpl(ModelLoader):
         for filename in os.listdir(self.models_dir):
             if not (filename.endswith(".pth") or filename.endswith(".pt")):
                 continue
+            # Artefacts dérivés d'un checkpoint (ex. -mmap.pt)
+            if is_derived_artifact(filename):
+                continue
 
             model_name = os.path.splitext(filename)[0]
             # Store only the filename as the model path so the DB entry
@@ -116,16 +125,26 @@ class GitModelLoaderImpl(ModelLoader):
 
             # Lazy import heavy libs to avoid module-level dependency.
             try:
-                import torch
                 import torch.nn as nn
             except Exception:
                 # If torch is not available, return the path so caller can
                 # decide how to handle it.
                 return (path, labels, preprocess_config)
 
-            # Attempt to load the checkpoint
+            # Eager module saved next to the checkpoint: its weights are
+            # mapped from the page cache and shared between workers.
+            if settings.MODEL_MMAP_ENABLED:
+                try:
+                    module = load_mmap_module(resolved)
+                    return (module, None, preprocess_config)
+                except FileNotFoundError:
+                    pass
+
+            # Attempt to load the checkpoint (mmap so that load_state_dict
+            # with assign=True does not copy the weights)
             try:
-                state = torch.load(resolved, map_location="cpu")
+                state = load_checkpoint(
+                    resolved, mmap=settings.MODEL_MMAP_ENABLED)
             except Exception as e:
                 raise FileNotFoundError(
                     f"Cannot load state dict at {resolved}: {e}"
@@ -181,7 +200,8 @@ class GitModelLoaderImpl(ModelLoader):
                         in_feat = base.fc.in_features
                         base.fc = nn.Linear(in_feat, int(num_classes))
 
-                    base.load_state_dict(new_state, strict=False)
+                    base.load_state_dict(
+                        new_state, strict=False, assign=True)
                     module = base
                 except Exception as e:
                     raise RuntimeError(
@@ -0,0 +1,106 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app.model.domain.entity.training_job import (
+    QUEUED,
+    RUNNING,
+    TrainingJob,
+)
+
+
+class TrainingJobRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def save(self, job: TrainingJob) -> TrainingJob:
+        self.db.add(job)
+        self.db.commit()
+        self.db.refresh(job)
+        return job
+
+    def find_by_id(self, job_id: UUID) -> Optional[TrainingJob]:
+        return (
+            self.db.query(TrainingJob)
+            .filter(TrainingJob.job_id == job_id)
+            .populate_existing()
+            .first()
+        )
+
+    def claim_next(
+        self, worker_id: str, stale_before: datetime
+    ) -> Optional[TrainingJob]:
+        # FOR UPDATE SKIP LOCKED : la ligne verrouillée par un autre worker
+        # est sautée au lieu de bloquer, chacun prend un job différent
+        job = (
+            self.db.query(TrainingJob)
+            .filter(or_(
+                TrainingJob.status == QUEUED,
+                and_(
+                    TrainingJob.status == RUNNING,
+                    TrainingJob.heartbeat_at < stale_before,
+                ),
+            ))
+            .order_by(TrainingJob.created_at)
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+        if job is None:
+            self.db.rollback()
+            return None
+
+        now = datetime.now(timezone.utc)
+        job.status = RUNNING
+        job.worker_id = worker_id
+        job.attempts = (job.attempts or 0) + 1
+        job.started_at = now
+        job.heartbeat_at = now
+        job.error = None
+        self.db.commit()
+        self.db.refresh(job)
+        return job
+
+    def heartbeat(
+        self,
+        job_id: UUID,
+        worker_id: str,
+        progress: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        values: Dict[str, Any] = {
+            "heartbeat_at": datetime.now(timezone.utc)}
+        if progress is not None:
+            values["progress"] = progress
+        return self._update_owned(job_id, worker_id, values)
+
+    def finish(
+        self,
+        job_id: UUID,
+        worker_id: str,
+        status: str,
+        model_name: Optional[str] = None,
+        error: Optional[str] = None,
+    ) -> bool:
+        return self._update_owned(job_id, worker_id, {
+            "status": status,
+            "model_name": model_name,
+            "error": error,
+            "finished_at": datetime.now(timezone.utc),
+        })
+
+    def _update_owned(
+        self, job_id: UUID, worker_id: str, values: Dict[str, Any]
+    ) -> bool:
+        updated = (
+            self.db.query(TrainingJob)
+            .filter(
+                TrainingJob.job_id == job_id,
+                TrainingJob.worker_id == worker_id,
+                TrainingJob.status == RUNNING,
+            )
+            .update(values, synchronize_session=False)
+        )
+        self.db.commit()
+        return updated == 1
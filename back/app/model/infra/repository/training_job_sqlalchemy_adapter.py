@@ -0,0 +1,44 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from app.model.domain.catalog.training_job_catalog import TrainingJobCatalog
+from app.model.domain.entity.training_job import TrainingJob
+from app.model.infra.repository.training_job_repository import (
+    TrainingJobRepository,
+)
+
+
+class TrainingJobSQLAlchemyAdapter(TrainingJobCatalog):
+    def __init__(self, repository: TrainingJobRepository):
+        self.repository = repository
+
+    def save(self, job: TrainingJob) -> TrainingJob:
+        return self.repository.save(job)
+
+    def find_by_id(self, job_id: UUID) -> Optional[TrainingJob]:
+        return self.repository.find_by_id(job_id)
+
+    def claim_next(
+        self, worker_id: str, stale_before: datetime
+    ) -> Optional[TrainingJob]:
+        return self.repository.claim_next(worker_id, stale_before)
+
+    def heartbeat(
+        self,
+        job_id: UUID,
+        worker_id: str,
+        progress: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        return self.repository.heartbeat(job_id, worker_id, progress)
+
+    def finish(
+        self,
+        job_id: UUID,
+        worker_id: str,
+        status: str,
+        model_name: Optional[str] = None,
+        error: Optional[str] = None,
+    ) -> bool:
+        return self.repository.finish(
+            job_id, worker_id, status, model_name, error)
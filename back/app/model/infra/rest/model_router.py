@@ -1,4 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from app.config import settings
 from app.model.domain.catalog.model_catalog import ModelCatalog
 from app.model.domain.DTO.modelDTO import ModelDTO
 from app.model.infra.factory.model_factory import get_model_catalog
@@ -11,8 +15,20 @@ from app.authentification.core.admin_required import (
     require_role,
     AuthenticatedUser,
 )
-from app.model.domain.service.model_training import ModelTraining
-from app.model.infra.factory.model_factory import get_model_training
+from app.model.domain.catalog.training_job_catalog import TrainingJobCatalog
+from app.model.domain.DTO.trainingJobDTO import TrainingJobDTO
+from app.model.domain.entity.training_job import (
+    QUEUED,
+    TERMINAL_STATUSES,
+    TrainingJob,
+)
+from app.model.domain.mapper.training_job_to_trainingJobDTO_mapper import (
+    training_job_to_trainingJobDTO_mapper,
+)
+from app.model.infra.factory.model_factory import (
+    get_training_job_catalog,
+    training_job_catalog_session,
+)
 from app.model.domain.DTO.modelTrainingDTO import ModelTrainingDTO
 from app.model.domain.DTO.modelStatsSummaryDTO import ModelStatsSummaryDTO
 from app.model.domain.DTO.modelStatsDetailedDTO import ModelStatsDetailedDTO
@@ -22,10 +38,25 @@ from app.model.domain.catalog.layers_catalog import LayersCatalog
 from app.model.infra.factory.model_factory import (
     get_layers_catalog,
 )
-from typing import Any, Dict, List
-from app.model.domain.service.predict import load_model
+from typing import Any, Dict, List, Optional
+from app.model.domain.service.predict import (
+    ACTIVE_MODEL_REGISTRY,
+    load_model,
+    resolve_active_model,
+)
 from uuid import UUID
 
+SSE_KEEPALIVE_SECONDS = 15.0
+
+
+def _load_training_job(job_id: UUID) -> Optional[TrainingJobDTO]:
+    # Session courte par lecture : le flux SSE peut durer des heures
+    with training_job_catalog_session() as catalog:
+        job = catalog.find_by_id(job_id)
+        if job is None:
+            return None
+        return training_job_to_trainingJobDTO_mapper.apply(job)
+
 
 class ModelController:
     def __init__(self):
@@ -58,9 +89,23 @@ class ModelController:
         self.router.add_api_route(
             "/train",
             self.train_model,
+            status_code=status.HTTP_202_ACCEPTED,
             methods=["POST"],
         )
 
+        self.router.add_api_route(
+            "/train/{job_id}",
+            self.get_training_job,
+            response_model=TrainingJobDTO,
+            methods=["GET"],
+        )
+
+        self.router.add_api_route(
+            "/train/{job_id}/events",
+            self.stream_training_job,
+            methods=["GET"],
+        )
+
         self.router.add_api_route(
             "/{model_id}/stats/summary",
             self.get_model_stats_summary,
@@ -119,6 +164,9 @@ class ModelController:
             model.is_active = True
             model_catalog.save(model)
 
+            # Les autres workers le verront au prochain poll du registre
+            ACTIVE_MODEL_REGISTRY.invalidate()
+
             return {
                 "message": "Modèle activé", "id": str(model_to_activate.id)
             }
@@ -148,57 +196,84 @@ class ModelController:
     def train_model(
         self,
         model_training_dto: ModelTrainingDTO,
-        model_training: ModelTraining = Depends(get_model_training),
+        training_job_catalog: TrainingJobCatalog = Depends(
+            get_training_job_catalog
+        ),
         user: AuthenticatedUser = Depends(require_role("admin")),
     ):
-        """Lance l'entraînement du modèle"""
-        try:
-            model_training.train(model_training_dto)
-            return {"message": "Entraînement terminé avec succès"}
-        except ValueError as e:
-            print(f"[ERROR] Erreur de configuration : {e}")
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=str(e),
-            )
-        except RuntimeError as e:
-            msg = str(e)
-            print(f"[ERROR] Erreur runtime lors de l'entraînement : {msg}")
-            # Rendre les erreurs PyTorch plus lisibles
-            if "mat1 and mat2 shapes cannot be multiplied" in msg:
-                detail = (
-                    "Les dimensions entre les couches sont incompatibles. "
-                    "Vérifiez les paramètres in_channels/out_channels "
-                    "et in_features/out_features de vos couches."
-                )
-            elif "spatial targets supported" in msg:
-                detail = (
-                    "Le modèle produit une sortie incompatible avec "
-                    "la classification. Vérifiez l'architecture "
-                    "de vos couches."
-                )
-            elif "negative dimensions" in msg or "invalid argument" in msg:
-                detail = (
-                    "Les paramètres des couches produisent des dimensions "
-                    "invalides. Vérifiez les valeurs de kernel_size, "
-                    "stride et padding."
-                )
-            else:
-                detail = f"Erreur lors de l'entraînement : {msg}"
+        """Met l'entraînement en file ; un worker l'exécute hors requête"""
+        job = training_job_catalog.save(TrainingJob(
+            status=QUEUED,
+            params=model_training_dto.model_dump(mode="json"),
+            user_id=UUID(user.user_id),
+        ))
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content={"job_id": str(job.job_id), "status": job.status},
+            headers={"Location": f"/models/train/{job.job_id}"},
+        )
+
+    def get_training_job(
+        self,
+        job_id: UUID,
+        training_job_catalog: TrainingJobCatalog = Depends(
+            get_training_job_catalog
+        ),
+        user: AuthenticatedUser = Depends(require_role("admin")),
+    ) -> TrainingJobDTO:
+        job = training_job_catalog.find_by_id(job_id)
+        if job is None:
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=detail,
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Training job not found",
             )
-        except Exception as e:
-            print(f"[ERROR] Erreur inattendue : {e}")
+        return training_job_to_trainingJobDTO_mapper.apply(job)
+
+    async def stream_training_job(
+        self,
+        job_id: UUID,
+        request: Request,
+        user: AuthenticatedUser = Depends(require_role("admin")),
+    ):
+        """Avancement du job en Server-Sent Events (progress puis done)"""
+        first = await asyncio.to_thread(_load_training_job, job_id)
+        if first is None:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=(
-                    "Une erreur inattendue est survenue lors de "
-                    "l'entraînement. Consultez les logs du serveur."
-                ),
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Training job not found",
             )
 
+        async def events():
+            dto = first
+            last = None
+            idle = 0.0
+            while True:
+                payload = dto.model_dump_json()
+                if dto.status in TERMINAL_STATUSES:
+                    yield f"event: done\ndata: {payload}\n\n"
+                    return
+                if payload != last:
+                    last = payload
+                    idle = 0.0
+                    yield f"event: progress\ndata: {payload}\n\n"
+                elif idle >= SSE_KEEPALIVE_SECONDS:
+                    # Garde la connexion ouverte derrière les proxies
+                    idle = 0.0
+                    yield ": keep-alive\n\n"
+                await asyncio.sleep(settings.TRAINING_EVENTS_POLL_SECONDS)
+                idle += settings.TRAINING_EVENTS_POLL_SECONDS
+                if await request.is_disconnected():
+                    return
+                dto = await asyncio.to_thread(_load_training_job, job_id)
+                if dto is None:
+                    return
+
+        return StreamingResponse(
+            events(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
     def get_model_stats_summary(
         self,
         model_id: UUID,
@@ -269,7 +344,7 @@ class ModelController:
         model_catalog: ModelCatalog = Depends(get_model_catalog),
         user: AuthenticatedUser = Depends(require_role("admin")),
     ) -> Dict[str, Any]:
-        active = model_catalog.find_active_model()
+        active = resolve_active_model(model_catalog)
         if not active:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -306,7 +381,7 @@ class ModelController:
         model_catalog: ModelCatalog = Depends(get_model_catalog),
         user: AuthenticatedUser = Depends(require_role("admin")),
     ) -> Dict[str, Any]:
-        active = model_catalog.find_active_model()
+        active = resolve_active_model(model_catalog)
         if not active:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
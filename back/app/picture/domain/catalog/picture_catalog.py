@@ -7,6 +7,7 @@ from app.room.domain.entity.room import Room
 class PictureCatalog(Protocol):
     def find_all(self) -> Collection[Picture]: ...
     def save(self, picture: Picture) -> None: ...
+    def save_all(self, pictures: Collection[Picture]) -> None: ...
     def find_by_id(self, picture_id: Union[str, UUID]) -> Picture: ...
 
     def find_all_validated_by_room_ids(
@@ -0,0 +1,72 @@
+# app/picture/domain/service/batch_import.py
+"""Enumerate the images of a batch import (multipart files or a ZIP).
+
+Items are yielded lazily: a ZIP member is only read when its turn comes,
+so a large archive is never fully loaded in memory. The uploaded archive
+stays in the spooled temporary file Starlette already wrote to disk.
+"""
+
+from __future__ import annotations
+
+import zipfile
+from dataclasses import dataclass
+from pathlib import PurePosixPath
+from typing import BinaryIO, Callable, Iterator, Optional
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png"}
+
+
+class BatchImportError(ValueError):
+    """Requête d'import par lot invalide (à traduire en 400)."""
+
+
+@dataclass
+class BatchItem:
+    index: int
+    filename: str
+    # Lecture différée des octets (membre ZIP lu à la demande)
+    read: Callable[[], bytes]
+    error: Optional[str] = None
+
+
+def iter_zip_items(
+    archive: BinaryIO,
+    max_files: int,
+    max_file_bytes: int,
+    start_index: int = 0,
+) -> Iterator[BatchItem]:
+    """Images d'une archive ZIP, dans l'ordre de l'archive.
+
+    Directories, macOS metadata and non-image members are skipped; members
+    bigger than ``max_file_bytes`` once inflated are reported as errors
+    without being read.
+
+    Raises:
+        BatchImportError: archive illisible ou trop d'images.
+    """
+    try:
+        zf = zipfile.ZipFile(archive)
+    except zipfile.BadZipFile as e:
+        raise BatchImportError(f"Archive ZIP invalide : {e}")
+
+    members = [
+        info for info in zf.infolist()
+        if not info.is_dir()
+        and not PurePosixPath(info.filename).name.startswith(".")
+        and "__MACOSX" not in PurePosixPath(info.filename).parts
+        and PurePosixPath(info.filename).suffix.lower() in IMAGE_EXTENSIONS
+    ]
+    if len(members) > max_files:
+        raise BatchImportError(
+            f"Trop d'images dans l'archive ({len(members)} > {max_files})")
+
+    for offset, info in enumerate(members):
+        error = None
+        if info.file_size > max_file_bytes:
+            error = "Fichier trop volumineux"
+        yield BatchItem(
+            index=start_index + offset,
+            filename=info.filename,
+            read=(lambda name=info.filename: zf.read(name)),
+            error=error,
+        )
@@ -0,0 +1,238 @@
+# app/picture/domain/service/content_store.py
+"""Content-addressed storage for uploaded pictures.
+
+Pictures used to land in a flat ``uploads/<uuid>.jpg`` layout: with
+hundreds of thousands of files every directory operation slows down, and
+the same bytes uploaded twice are stored twice. A blob is now stored once
+under its SHA-256, sharded by hash prefix::
+
+    uploads/ab/cd/abcd…ef.jpg
+    uploads/ab/cd/abcd…ef.jpg.refs   # number of pictures using it
+
+``put`` increments the reference count of an existing blob instead of
+writing it again; ``release`` decrements it and deletes the blob with its
+last reference. Each refcount update holds an exclusive ``flock`` on the
+``.refs`` file, so workers sharing the volume do not lose updates.
+
+The import route splits ``put`` in two: ``acquire`` takes the reference
+under a digest known on the request path (the decoded pixels), ``write``
+stores the encoded bytes later from a background task.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Union
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non POSIX
+    fcntl = None
+
+PathLike = Union[str, Path]
+
+REFS_SUFFIX = ".refs"
+# Extensions des blobs écrits par le store (import : .jpg ; migration : celle
+# de l'ancien fichier). Les renditions ``<sha>.full.jpg`` n'en sont pas
+BLOB_EXTENSIONS = (".jpg", ".jpeg", ".png")
+
+
+class ContentStore:
+    def __init__(self, root: PathLike, depth: int = 2, width: int = 2):
+        self.root = Path(root)
+        self.depth = int(depth)
+        self.width = int(width)
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._dedup_hits = 0
+        self._releases = 0
+        self._blobs_deleted = 0
+
+    # ------------------------------------------------------------------
+    # Layout
+    # ------------------------------------------------------------------
+
+    def path_for(self, digest: str, extension: str = ".jpg") -> Path:
+        shards = [digest[i * self.width:(i + 1) * self.width]
+                  for i in range(self.depth)]
+        return self.root.joinpath(*shards, f"{digest}{extension}")
+
+    def address(self, data: bytes, extension: str = ".jpg") -> Path:
+        """Chemin du blob qui contiendrait ``data``."""
+        return self.path_for(hashlib.sha256(data).hexdigest(), extension)
+
+    def owns(self, path: PathLike) -> bool:
+        """``path`` est-il un blob de ce store (et non un ancien fichier) ?
+
+        Comparé après résolution : ``uploads/ab/cd/…`` (chemin en base) et
+        ``/app/uploads/ab/cd/…`` (racine absolue) désignent le même blob.
+        """
+        path = Path(path)
+        digest = path.name.split(".", 1)[0]
+        extension = path.name[len(digest):]
+        if len(digest) != 64 or extension not in BLOB_EXTENSIONS:
+            return False
+        expected = self.path_for(digest, extension)
+        return path == expected or path.resolve() == expected.resolve()
+
+    # ------------------------------------------------------------------
+    # References
+    # ------------------------------------------------------------------
+
+    def put(self, data: bytes, extension: str = ".jpg") -> Path:
+        """Stocke ``data`` (ou réutilise le blob identique) ; +1 référence."""
+        path = self.acquire(hashlib.sha256(data).hexdigest(), extension)
+        self.write(path, data)
+        return path
+
+    def acquire(self, digest: str, extension: str = ".jpg") -> Path:
+        """+1 référence sur le blob ``digest``, écrit ou non.
+
+        Le contenu d'un blob encore absent est écrit ensuite par ``write``
+        (hors requête) ; ``release`` rend la référence si l'écriture échoue.
+        """
+        path = self.path_for(digest, extension)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._locked_refs(path) as refs:
+            count = _read_count(refs)
+            if count or path.is_file():
+                with self._lock:
+                    self._dedup_hits += 1
+            _write_count(refs, count + 1)
+        return path
+
+    def write(self, path: PathLike, data: bytes) -> bool:
+        """Écrit le contenu d'un blob acquis ; False s'il existait déjà
+        (ou n'est plus référencé)."""
+        path = Path(path)
+        with self._locked_refs(path) as refs:
+            if _read_count(refs) == 0:
+                # Référence déjà rendue : ne pas laisser de .refs vide
+                self._refs_path(path).unlink(missing_ok=True)
+                return False
+            if path.is_file():
+                return False
+            tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        with self._lock:
+            self._writes += 1
+        return True
+
+    def release(self, path: PathLike) -> int:
+        """Retire une référence ; supprime le blob à la dernière.
+
+        Un fichier hors du store (ancien chemin plat) n'est référencé que
+        par une picture : il est supprimé directement. Renvoie le nombre de
+        références restantes.
+        """
+        path = Path(path)
+        with self._lock:
+            self._releases += 1
+        if not self.owns(path):
+            path.unlink(missing_ok=True)
+            return 0
+        if not path.is_file() and not self._refs_path(path).is_file():
+            return 0
+
+        # Blob acquis mais pas encore écrit : la référence compte aussi
+        with self._locked_refs(path) as refs:
+            count = max(_read_count(refs) - 1, 0)
+            if count:
+                _write_count(refs, count)
+                return count
+            path.unlink(missing_ok=True)
+            # Supprimé sous le verrou : un put concurrent qui attendait
+            # détecte le changement d'inode et recrée le fichier
+            self._refs_path(path).unlink(missing_ok=True)
+        with self._lock:
+            self._blobs_deleted += 1
+        return 0
+
+    def refcount(self, path: PathLike) -> int:
+        try:
+            return int(self._refs_path(Path(path)).read_text() or 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def set_refcount(self, path: PathLike, count: int) -> None:
+        """Fixe le compteur (recomptage en base) ; 0 supprime le blob."""
+        path = Path(path)
+        with self._locked_refs(path) as refs:
+            if count > 0:
+                _write_count(refs, count)
+                return
+            path.unlink(missing_ok=True)
+            self._refs_path(path).unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "writes": self._writes,
+                "dedup_hits": self._dedup_hits,
+                "releases": self._releases,
+                "blobs_deleted": self._blobs_deleted,
+            }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _refs_path(path: Path) -> Path:
+        return path.with_name(path.name + REFS_SUFFIX)
+
+    def _locked_refs(self, path: Path) -> "_RefsLock":
+        return _RefsLock(self._refs_path(path))
+
+
+class _RefsLock:
+    """``flock`` exclusif sur le fichier ``.refs``, ouvert en ``r+``.
+
+    Si le fichier a été supprimé (dernière référence libérée) entre
+    l'ouverture et l'obtention du verrou, on rouvre le nouveau fichier.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._fh = None
+
+    def __enter__(self):
+        while True:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            fh = os.fdopen(fd, "r+")
+            if fcntl is None:
+                break
+            fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                if os.fstat(fh.fileno()).st_ino == os.stat(self.path).st_ino:
+                    break
+            except FileNotFoundError:
+                pass
+            fh.close()
+        self._fh = fh
+        return fh
+
+    def __exit__(self, *exc):
+        # La fermeture libère le flock
+        self._fh.close()
+        return False
+
+
+def _read_count(refs) -> int:
+    refs.seek(0)
+    try:
+        return int(refs.read() or 0)
+    except ValueError:
+        return 0
+
+
+def _write_count(refs, count: int) -> None:
+    refs.seek(0)
+    refs.truncate()
+    refs.write(str(count))
+    refs.flush()
@@ -0,0 +1,106 @@
+# app/picture/domain/service/image_ingestion.py
+"""Single-decode ingestion pipeline for uploaded pictures.
+
+An upload is decoded exactly once. For JPEG sources, Pillow's draft mode
+lets libjpeg decode directly at a reduced DCT scale, so a 12 MP camera
+photo never materialises at full resolution. The resulting RGB buffer feeds
+both the model tensor and the persisted copy, whose JPEG encoding is left to
+the caller to schedule off the request path.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Tuple
+
+from PIL import Image
+
+
+@dataclass
+class IngestedImage:
+    image: Image.Image
+    source_size: Tuple[int, int]
+    source_format: str | None
+    timings_ms: Dict[str, float] = field(default_factory=dict)
+
+
+class ImageIngestionPipeline:
+    def __init__(self, target_size: int = 384, jpeg_quality: int = 100):
+        self.target_size = int(target_size)
+        self.jpeg_quality = int(jpeg_quality)
+        self._lock = threading.Lock()
+        self._stages: Dict[str, Dict[str, float]] = {}
+
+    def decode(self, contents: bytes) -> IngestedImage:
+        """Décode l'upload une seule fois et le ramène à target_size²."""
+        timings: Dict[str, float] = {}
+        size = (self.target_size, self.target_size)
+
+        t0 = time.perf_counter()
+        img = Image.open(io.BytesIO(contents))
+        source_size = img.size
+        source_format = img.format
+        if source_format == "JPEG":
+            # libjpeg scales by 1/2, 1/4 or 1/8 while decoding, keeping
+            # both sides >= the requested size.
+            img.draft("RGB", size)
+        img = img.convert("RGB")
+        timings["decode"] = self._record("decode", t0)
+
+        t0 = time.perf_counter()
+        if img.size != size:
+            img = img.resize(size)
+        timings["resize"] = self._record("resize", t0)
+
+        return IngestedImage(
+            image=img,
+            source_size=source_size,
+            source_format=source_format,
+            timings_ms=timings,
+        )
+
+    def encode(self, image: Image.Image) -> bytes:
+        t0 = time.perf_counter()
+        buffer = io.BytesIO()
+        image.save(
+            buffer, format="JPEG", quality=self.jpeg_quality, optimize=True)
+        self._record("encode", t0)
+        return buffer.getvalue()
+
+    def digest(self, image: Image.Image) -> str:
+        """SHA-256 des pixels décodés : adresse du blob, connue avant
+        l'encodage JPEG."""
+        t0 = time.perf_counter()
+        h = hashlib.sha256(f"{image.mode}:{image.size}:".encode())
+        h.update(image.tobytes())
+        self._record("digest", t0)
+        return h.hexdigest()
+
+    def record_stage(self, stage: str, elapsed_ms: float) -> None:
+        """Agrège une durée mesurée ailleurs (preprocess, inference…)."""
+        with self._lock:
+            s = self._stages.setdefault(
+                stage, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            s["count"] += 1
+            s["total_ms"] += elapsed_ms
+            s["max_ms"] = max(s["max_ms"], elapsed_ms)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                stage: {
+                    "count": int(s["count"]),
+                    "avg_ms": s["total_ms"] / s["count"] if s["count"] else 0,
+                    "max_ms": s["max_ms"],
+                }
+                for stage, s in self._stages.items()
+            }
+
+    def _record(self, stage: str, started: float) -> float:
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        self.record_stage(stage, elapsed_ms)
+        return elapsed_ms
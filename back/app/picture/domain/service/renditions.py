@@ -0,0 +1,121 @@
+# app/picture/domain/service/renditions.py
+"""Pre-encoded renditions of stored pictures.
+
+``GET /pictures/{id}/recover`` used to open the original, downscale it with
+LANCZOS and re-encode an optimized JPEG on every call. Each rendition is now
+encoded once, at import time from the already decoded buffer or lazily on
+first access, and written next to the original as
+``<stem>.<rendition>.jpg``; the endpoint then serves the file as is.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import threading
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from PIL import Image
+
+PathLike = Union[str, Path]
+
+
+@dataclass(frozen=True)
+class Rendition:
+    max_size: int
+    quality: int
+
+
+RENDITIONS: Dict[str, Rendition] = {
+    "thumbnail": Rendition(max_size=150, quality=70),
+    "full": Rendition(max_size=384, quality=90),
+}
+
+
+def rendition_path(original: PathLike, name: str) -> Path:
+    original = Path(original)
+    return original.with_name(f"{original.stem}.{name}.jpg")
+
+
+def encode_rendition(image: Image.Image, rendition: Rendition) -> bytes:
+    image = image.copy()
+    image.thumbnail(
+        (rendition.max_size, rendition.max_size), Image.Resampling.LANCZOS)
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=rendition.quality,
+               optimize=True)
+    return buffer.getvalue()
+
+
+class RenditionStore:
+    def __init__(self, renditions: Optional[Dict[str, Rendition]] = None):
+        self.renditions = dict(renditions or RENDITIONS)
+        self._lock = threading.Lock()
+        self._generated = 0
+        self._lazy = 0
+        self._hits = 0
+        self._deleted = 0
+
+    def generate(self, image: Image.Image, original: PathLike) -> None:
+        """Écrit toutes les renditions depuis l'image déjà décodée."""
+        for name, rendition in self.renditions.items():
+            self._write(rendition_path(original, name),
+                        encode_rendition(image, rendition))
+        with self._lock:
+            self._generated += len(self.renditions)
+
+    def ensure(self, original: PathLike, name: str) -> Path:
+        """Chemin de la rendition ``name``, créée depuis l'original au besoin.
+
+        Raises:
+            KeyError: rendition inconnue.
+            FileNotFoundError: original absent.
+        """
+        rendition = self.renditions[name]
+        path = rendition_path(original, name)
+        if path.is_file():
+            with self._lock:
+                self._hits += 1
+            return path
+
+        with Image.open(original) as image:
+            data = encode_rendition(image, rendition)
+        self._write(path, data)
+        with self._lock:
+            self._lazy += 1
+        return path
+
+    def delete(self, original: PathLike) -> int:
+        """Supprime les renditions d'un original ; renvoie leur nombre."""
+        removed = 0
+        for name in self.renditions:
+            try:
+                rendition_path(original, name).unlink()
+                removed += 1
+            except FileNotFoundError:
+                pass
+        with self._lock:
+            self._deleted += removed
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "generated_at_import": self._generated,
+                "generated_lazily": self._lazy,
+                "hits": self._hits,
+                "deleted": self._deleted,
+            }
+
+    @staticmethod
+    def _write(path: Path, data: bytes) -> None:
+        # Écriture atomique : deux requêtes concurrentes peuvent générer
+        # la même rendition, la dernière gagne
+        tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
@@ -1,3 +1,6 @@
+import os
+from pathlib import Path
+
 from sqlalchemy.orm import session
 from fastapi import Depends
 
@@ -7,8 +10,70 @@ from app.picture.infra.repository.picture_sqlalchemy_adapter import (
 )
 from app.picture.domain.catalog.picture_catalog import PictureCatalog
 from app.database import get_session
+from app.config import settings
+from app.metrics import register_metrics
+from app.picture.domain.service.content_store import ContentStore
+from app.picture.domain.service.image_ingestion import ImageIngestionPipeline
+from app.picture.domain.service.renditions import RenditionStore
+from app.model.domain.service.activation_reaper import ActivationReaper
+from app.model.domain.service.activation_store import (
+    ActivationRenderer,
+    EncoderOptions,
+)
+
+_ingestion_pipeline = ImageIngestionPipeline(
+    target_size=settings.UPLOAD_IMAGE_SIZE,
+    jpeg_quality=settings.UPLOAD_JPEG_QUALITY,
+)
+register_metrics("ingestion", _ingestion_pipeline.stats)
+
+_content_store = ContentStore(
+    root=Path(os.environ.get("UPLOAD_DIR") or "uploads"),
+)
+register_metrics("content_store", _content_store.stats)
+
+_rendition_store = RenditionStore()
+register_metrics("renditions", _rendition_store.stats)
+
+_activation_renderer = ActivationRenderer(
+    max_entries=settings.ACTIVATION_RENDER_CACHE_ENTRIES,
+    workers=settings.ACTIVATION_RENDER_WORKERS,
+    encoder=EncoderOptions(
+        png_compress_level=settings.ACTIVATION_PNG_COMPRESS_LEVEL,
+        quality=settings.ACTIVATION_IMAGE_QUALITY,
+    ),
+)
+register_metrics("activation_renderer", _activation_renderer.stats)
+
+_activation_reaper = ActivationReaper(
+    root=Path(os.environ.get("UPLOAD_DIR") or "uploads") / "activations",
+    ttl_s=settings.ACTIVATION_TTL_HOURS * 3600.0,
+    max_bytes=settings.ACTIVATION_MAX_MB * 1024 * 1024,
+    interval_s=settings.ACTIVATION_REAPER_INTERVAL_SECONDS,
+)
+register_metrics("activation_reaper", _activation_reaper.stats)
 
 
 def get_picture_catalog(db: session = Depends(get_session)) -> PictureCatalog:
     repo = PictureRepository(db)
     return PictureSQLAlchemyAdapter(repo)
+
+
+def get_ingestion_pipeline() -> ImageIngestionPipeline:
+    return _ingestion_pipeline
+
+
+def get_content_store() -> ContentStore:
+    return _content_store
+
+
+def get_rendition_store() -> RenditionStore:
+    return _rendition_store
+
+
+def get_activation_renderer() -> ActivationRenderer:
+    return _activation_renderer
+
+
+def get_activation_reaper() -> ActivationReaper:
+    return _activation_reaper
@@ -18,6 +18,15 @@ class PictureRepository:
         self.db.refresh(picture)
         return picture
 
+    def save_all(self, pictures) -> None:
+        """Insert many pictures in one transaction (batch import)."""
+        try:
+            self.db.add_all(list(pictures))
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
     def find_by_id(self, picture_id: Union[str, UUID]) -> PictureModel:
         lookup_id = picture_id
         if isinstance(picture_id, str):
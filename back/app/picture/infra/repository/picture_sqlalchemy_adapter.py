@@ -16,6 +16,9 @@ class PictureSQLAlchemyAdapter(PictureCatalog):
     def save(self, picture: Picture):
         return self.repository.save(picture)
 
+    def save_all(self, pictures: Collection[Picture]):
+        return self.repository.save_all(pictures)
+
     def find_by_id(self, picture_id: Union[str, UUID]):
         return self.repository.find_by_id(picture_id)
 
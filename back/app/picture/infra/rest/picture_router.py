@@ -1,6 +1,7 @@
 # app/picture/api/picture_controller.py
 from fastapi import (
     APIRouter,
+    BackgroundTasks,
     Depends,
     UploadFile,
     File,
@@ -9,12 +10,17 @@ from fastapi import (
     Form,
     Path as FastAPIPath,
     Body,
+    Request,
 )
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from PIL import Image
 from pathlib import Path
-from typing import Literal, Optional, List
-import io
+from typing import AsyncIterator, Dict, Literal, Optional, List
+import asyncio
+import base64
+import json
+import threading
+import time
 import uuid
 from datetime import datetime, timezone
 
@@ -30,19 +36,54 @@ from app.picture.domain.entity.picture import Picture
 from app.picture.domain.DTO.pictureDTO import PictureDTO
 from app.picture.domain.DTO.picturePvaDTO import PicturePvaDTO
 from app.picture.domain.catalog.picture_catalog import PictureCatalog
-from app.picture.infra.factory.picture_factory import get_picture_catalog
+from app.picture.infra.factory.picture_factory import (
+    get_activation_renderer,
+    get_content_store,
+    get_picture_catalog,
+    get_ingestion_pipeline,
+    get_rendition_store,
+)
+from app.picture.domain.service.image_ingestion import (
+    ImageIngestionPipeline,
+)
+from app.picture.domain.service.content_store import ContentStore
+from app.picture.domain.service.renditions import RenditionStore
+from app.picture.domain.service.batch_import import (
+    BatchImportError,
+    BatchItem,
+    IMAGE_EXTENSIONS,
+    iter_zip_items,
+)
 
 from app.room.infra.factory.room_factory import get_room_catalog
 from app.room.domain.catalog.room_catalog import RoomCatalog
 
 from app.model.domain.service.predict import (
-    predict_image,
+    cached_predict_image,
     load_model,
-    PREPROCESS_CACHE,
+    resolve_active_model,
+    model_cache,
 )
 from app.model.domain.service.activations import generate_activations
-from app.model.infra.factory.model_factory import get_model_catalog
+from app.model.domain.service.activation_store import (
+    ActivationRenderer,
+    activation_token,
+    bundle_etag,
+    iter_zip,
+    media_type_for,
+    read_cached_result,
+    read_manifest,
+)
+from app.model.domain.service.prediction_cache import content_hash
+from app.model.infra.factory.model_factory import (
+    get_model_catalog,
+    get_inference_executor,
+)
 from app.model.domain.catalog.model_catalog import ModelCatalog
+from app.model.domain.service.inference_executor import (
+    InferenceExecutor,
+    InferenceQueueFullError,
+)
 
 from app.authentification.core.admin_required import (
     require_role,
@@ -53,9 +94,18 @@ from app.authentification.core.admin_required import (
 from app.history.infra.factory.history_factory import get_history_catalog
 from app.history.domain.entity.history import History
 from app.config import settings
+from app.http_cache import (
+    IMMUTABLE,
+    cached_file_response,
+    etag_matches,
+    not_modified,
+)
 
 
 UPLOAD_DIR = Path("uploads")
+ACTIVATION_IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg", ".webp")
+# Le fichier d'une picture ne change pas ; il peut être supprimé (PVA)
+PICTURE_CACHE_CONTROL = "private, max-age=86400"
 
 
 class ActivationsRequestDTO(BaseModel):
@@ -79,6 +129,11 @@ class PictureController:
             self.import_picture,
             methods=["POST"],
         )
+        self.router.add_api_route(
+            "/import/batch",
+            self.import_pictures_batch,
+            methods=["POST"],
+        )
         self.router.add_api_route(
             "/to-validate",
             self.find_picture_to_validate,
@@ -134,7 +189,7 @@ class PictureController:
             methods=["GET"],
         )
 
-        # Activation visualisations (static files)
+        # Activation visualisations (rendered on demand)
         self.router.add_api_route(
             "/activations/{token}",
             self.list_activation_images,
@@ -145,6 +200,11 @@ class PictureController:
             self.get_activation_image,
             methods=["GET"],
         )
+        self.router.add_api_route(
+            "/activations/{token}/bundle",
+            self.get_activation_bundle,
+            methods=["GET"],
+        )
 
         # Activations generation (decoupled from inference)
         self.router.add_api_route(
@@ -162,6 +222,7 @@ class PictureController:
 
     async def import_picture(
         self,
+        background_tasks: BackgroundTasks,
         type: Optional[Literal["analyse", "database"]] = Query(
             None,
             alias="type",
@@ -178,6 +239,12 @@ class PictureController:
         room_catalog: RoomCatalog = Depends(get_room_catalog),
         model_catalog: ModelCatalog = Depends(get_model_catalog),
         history_catalog=Depends(get_history_catalog),
+        inference_executor: InferenceExecutor = Depends(
+            get_inference_executor),
+        ingestion_pipeline: ImageIngestionPipeline = Depends(
+            get_ingestion_pipeline),
+        content_store: ContentStore = Depends(get_content_store),
+        rendition_store: RenditionStore = Depends(get_rendition_store),
         user: AuthenticatedUser | None = Depends(optional_user()),
     ):
         upload_file = file or image
@@ -202,33 +269,31 @@ class PictureController:
                 detail="Type de fichier non supporté",
             )
 
-        UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
-
-        extension = Path(upload_file.filename).suffix or ".jpg"
-        filename = f"{uuid.uuid4()}{extension}"
-        dest_path = UPLOAD_DIR / filename
-
         contents = await upload_file.read()
 
-        # Resize to 384x384 for consistent inference
-        img = Image.open(io.BytesIO(contents)).convert("RGB")
-        img = img.resize((384, 384))
-
-        buffer = io.BytesIO()
-        img.save(buffer, format="JPEG", quality=100, optimize=True)
-        resized_bytes = buffer.getvalue()
-
-        if settings.PVA_ENABLED:
-            # Persist the resized image
-            dest_path.write_bytes(resized_bytes)
-
-        # Inference only (no activations here)
+        # Decode, resize and inference run on the bounded inference pool so
+        # a slow image never blocks the event loop.
         try:
-            inference_result = predict_image(
-                image_bytes=resized_bytes,
-                top_k=5,
-                confidence_threshold=0.0,
-                catalog=model_catalog,
+            inference_result, ingested = await inference_executor.run(
+                self._analyse_upload,
+                contents,
+                model_catalog,
+                ingestion_pipeline,
+            )
+            if settings.PVA_ENABLED:
+                # Adresse tirée des pixels décodés : l'encodage et l'écriture
+                # partent en tâche de fond
+                dest_path = await inference_executor.run(
+                    self._reserve_picture,
+                    ingestion_pipeline,
+                    content_store,
+                    ingested.image,
+                )
+        except InferenceQueueFullError as exc:
+            raise HTTPException(
+                status_code=503,
+                detail="Serveur d'inférence saturé, réessayez plus tard",
+                headers={"Retry-After": str(exc.retry_after)},
             )
         except Exception as exc:
             raise HTTPException(
@@ -236,6 +301,13 @@ class PictureController:
                 detail=f"Inference failed: {exc}",
             )
 
+        if settings.PVA_ENABLED:
+            # The stored copy and the renditions reuse the decoded buffer;
+            # their JPEG encoding runs after the response has been sent.
+            background_tasks.add_task(
+                self._write_picture, ingestion_pipeline, content_store,
+                rendition_store, ingested.image, dest_path)
+
         recognition_percentage = None
         try:
             top_score = inference_result.get("top_score")
@@ -264,11 +336,15 @@ class PictureController:
             }
 
             picture = Picture(**picture_payload)
-            picture = picture_catalog.save(picture)
+            try:
+                picture = picture_catalog.save(picture)
+            except Exception:
+                content_store.release(dest_path)
+                raise
 
             if user is not None:
                 try:
-                    active_model = model_catalog.find_active_model()
+                    active_model = resolve_active_model(model_catalog)
                     model_id = active_model.model_id if active_model else None
                     room_id = room_obj.room_id if room_obj else None
                     history_catalog.save(
@@ -287,6 +363,397 @@ class PictureController:
 
         return inference_result
 
+    async def import_pictures_batch(
+        self,
+        files: List[UploadFile] | None = File(None),
+        archive: UploadFile | None = File(None),
+        picture_catalog: PictureCatalog = Depends(get_picture_catalog),
+        room_catalog: RoomCatalog = Depends(get_room_catalog),
+        model_catalog: ModelCatalog = Depends(get_model_catalog),
+        history_catalog=Depends(get_history_catalog),
+        inference_executor: InferenceExecutor = Depends(
+            get_inference_executor),
+        ingestion_pipeline: ImageIngestionPipeline = Depends(
+            get_ingestion_pipeline),
+        content_store: ContentStore = Depends(get_content_store),
+        rendition_store: RenditionStore = Depends(get_rendition_store),
+        user: AuthenticatedUser | None = Depends(optional_user()),
+    ):
+        """Import de plusieurs images (fichiers multiples et/ou ZIP).
+
+        Results are streamed as NDJSON, one line per file in completion
+        order, followed by a summary line. Pictures and histories are
+        inserted in bulk every ``BATCH_IMPORT_FLUSH_SIZE`` files.
+        """
+        max_files = settings.BATCH_IMPORT_MAX_FILES
+        max_file_bytes = settings.BATCH_IMPORT_MAX_FILE_MB * 1024 * 1024
+
+        items: List[BatchItem] = []
+        for upload in files or []:
+            suffix = Path(upload.filename or "").suffix.lower()
+            error = None
+            if (upload.content_type not in {
+                    "image/jpeg", "image/png", "image/jpg"}
+                    and suffix not in IMAGE_EXTENSIONS):
+                error = "Type de fichier non supporté"
+            elif upload.size is not None and upload.size > max_file_bytes:
+                error = "Fichier trop volumineux"
+            items.append(BatchItem(
+                index=len(items),
+                filename=upload.filename or f"file-{len(items)}",
+                read=upload.file.read,
+                error=error,
+            ))
+        if archive is not None:
+            try:
+                items.extend(iter_zip_items(
+                    archive.file,
+                    max_files=max_files,
+                    max_file_bytes=max_file_bytes,
+                    start_index=len(items),
+                ))
+            except BatchImportError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+
+        if not items:
+            raise HTTPException(
+                status_code=422,
+                detail="Champ 'files' ou 'archive' requis",
+            )
+        if len(items) > max_files:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Trop de fichiers ({len(items)} > {max_files})",
+            )
+
+        stream = self._stream_batch_import(
+            items,
+            picture_catalog=picture_catalog,
+            room_catalog=room_catalog,
+            model_catalog=model_catalog,
+            history_catalog=history_catalog,
+            inference_executor=inference_executor,
+            ingestion_pipeline=ingestion_pipeline,
+            content_store=content_store,
+            rendition_store=rendition_store,
+            user=user,
+        )
+        return StreamingResponse(stream, media_type="application/x-ndjson")
+
+    async def _stream_batch_import(
+        self,
+        items: List[BatchItem],
+        picture_catalog: PictureCatalog,
+        room_catalog: RoomCatalog,
+        model_catalog: ModelCatalog,
+        history_catalog,
+        inference_executor: InferenceExecutor,
+        ingestion_pipeline: ImageIngestionPipeline,
+        content_store: ContentStore,
+        rendition_store: RenditionStore,
+        user: AuthenticatedUser | None,
+    ) -> AsyncIterator[bytes]:
+        started = time.perf_counter()
+        # Concurrent files share micro-batches in the inference batcher
+        semaphore = asyncio.Semaphore(settings.BATCH_IMPORT_CONCURRENCY)
+        active_model = resolve_active_model(model_catalog)
+        model_id = active_model.model_id if active_model else None
+        rooms_by_label: Dict[str, object] = {}
+        pending_pictures: List[Picture] = []
+        pending_histories: List[History] = []
+        # Références du store prises pour ce lot et pas encore en base
+        acquired: List[Path] = []
+        acquired_lock = threading.Lock()
+        closed = threading.Event()
+        ok = failed = 0
+
+        def _discard(path: Path) -> None:
+            if content_store.release(path) == 0:
+                rendition_store.delete(path)
+
+        def _store(image: Image.Image) -> Optional[Path]:
+            """Copie stockée + renditions (pool d'inférence), enregistrée
+            dans ``acquired`` sauf si le flux est déjà fermé."""
+            dest_path = self._store_picture(
+                ingestion_pipeline, content_store, image)
+            self._generate_renditions(rendition_store, image, dest_path)
+            with acquired_lock:
+                if not closed.is_set():
+                    acquired.append(dest_path)
+                    return dest_path
+            _discard(dest_path)
+            return None
+
+        def _settle(paths: List[Path], release: bool) -> None:
+            """Retire ``paths`` d'``acquired`` ; rend les références si
+            ``release`` (lignes non insérées)."""
+            with acquired_lock:
+                for path in paths:
+                    acquired.remove(path)
+            if release:
+                for path in paths:
+                    _discard(path)
+
+        async def _process(item: BatchItem) -> dict:
+            if item.error:
+                return {"index": item.index, "filename": item.filename,
+                        "status": "error", "error": item.error}
+            async with semaphore:
+                try:
+                    # ZIP members / spooled files are read one at a time
+                    contents = await asyncio.to_thread(item.read)
+                    result, ingested = await self._run_with_retry(
+                        inference_executor,
+                        self._analyse_upload,
+                        contents,
+                        model_catalog,
+                        ingestion_pipeline,
+                        with_activations=False,
+                    )
+                    dest_path = None
+                    if settings.PVA_ENABLED:
+                        dest_path = await inference_executor.run(
+                            _store, ingested.image)
+                except Exception as e:
+                    return {"index": item.index, "filename": item.filename,
+                            "status": "error", "error": str(e)}
+            return {"index": item.index, "filename": item.filename,
+                    "status": "ok", "result": result, "dest": dest_path}
+
+        def _error_line(stage: str, pictures: List[Picture], e) -> bytes:
+            return (json.dumps({
+                "status": "error",
+                "stage": stage,
+                "picture_ids": [str(p.image_id) for p in pictures],
+                "error": str(e),
+            }) + "\n").encode()
+
+        async def _flush() -> Optional[bytes]:
+            """Insère les lignes en attente ; ligne d'erreur si échec."""
+            pictures = list(pending_pictures)
+            histories = list(pending_histories)
+            pending_pictures.clear()
+            pending_histories.clear()
+            paths = [Path(p.path) for p in pictures]
+            try:
+                if pictures:
+                    await asyncio.to_thread(
+                        picture_catalog.save_all, pictures)
+            except Exception as e:
+                print(f"[WARNING] Batch import persistence failed: {e}")
+                # Aucune picture insérée : blobs et renditions rendus
+                await asyncio.to_thread(_settle, paths, True)
+                return _error_line("persist", pictures, e)
+            # Les références appartiennent désormais aux lignes en base
+            _settle(paths, False)
+            try:
+                if histories:
+                    await asyncio.to_thread(
+                        history_catalog.save_all, histories)
+            except Exception as e:
+                # Pictures déjà en base : seul l'historique manque
+                print(f"[WARNING] Batch import history failed: {e}")
+                return _error_line("history", pictures, e)
+            return None
+
+        tasks = [asyncio.create_task(_process(item)) for item in items]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                outcome = await next_done
+                line = {k: v for k, v in outcome.items()
+                        if k not in ("result", "dest")}
+                if outcome["status"] != "ok":
+                    failed += 1
+                    yield (json.dumps(line) + "\n").encode()
+                    continue
+
+                ok += 1
+                result = outcome["result"]
+                top_label = result.get("top_label")
+                line.update({
+                    "top_label": top_label,
+                    "top_score": result.get("top_score"),
+                    "predictions": result.get("predictions"),
+                    "model_version": result.get("model_version"),
+                    "cache": result.get("cache"),
+                })
+
+                if outcome["dest"] is not None:
+                    if top_label not in rooms_by_label:
+                        rooms_by_label[top_label] = room_catalog.find_by_name(
+                            top_label)
+                    room_obj = rooms_by_label[top_label]
+                    picture = Picture(
+                        image_id=uuid.uuid4(),
+                        path=str(outcome["dest"]),
+                        analyzed_by=result.get("model_version"),
+                        room=room_obj,
+                        recognition_percentage=result.get("top_score"),
+                        analyse_date=datetime.now(timezone.utc),
+                        validation_date=None,
+                        is_validated=False,
+                        room_id=room_obj.room_id if room_obj else None,
+                    )
+                    pending_pictures.append(picture)
+                    line["picture_id"] = str(picture.image_id)
+                    if user is not None:
+                        pending_histories.append(History(
+                            room=room_obj,
+                            room_id=room_obj.room_id if room_obj else None,
+                            image_id=picture.image_id,
+                            model_id=model_id,
+                            user_id=user.user_id,
+                        ))
+                yield (json.dumps(line) + "\n").encode()
+                if len(pending_pictures) >= settings.BATCH_IMPORT_FLUSH_SIZE:
+                    error_line = await _flush()
+                    if error_line:
+                        yield error_line
+            error_line = await _flush()
+            if error_line:
+                yield error_line
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Client parti : les fichiers traités mais pas insérés ne sont
+            # référencés par aucune picture
+            with acquired_lock:
+                closed.set()
+                leftover = list(acquired)
+                acquired.clear()
+            for path in leftover:
+                _discard(path)
+
+        yield (json.dumps({
+            "status": "done",
+            "total": len(items),
+            "ok": ok,
+            "failed": failed,
+            "time_ms": (time.perf_counter() - started) * 1000.0,
+        }) + "\n").encode()
+
+    @staticmethod
+    async def _run_with_retry(executor: InferenceExecutor, fn, *args,
+                              attempts: int = 3, **kwargs):
+        """Sur file pleine, attend ``Retry-After`` puis réessaie."""
+        for attempt in range(attempts):
+            try:
+                return await executor.run(fn, *args, **kwargs)
+            except InferenceQueueFullError as exc:
+                if attempt == attempts - 1:
+                    raise
+                await asyncio.sleep(exc.retry_after)
+
+    @staticmethod
+    def _reserve_picture(
+        ingestion_pipeline: ImageIngestionPipeline,
+        content_store: ContentStore,
+        image: Image.Image,
+    ) -> Path:
+        """Référence le blob des pixels décodés, sans encoder ni écrire."""
+        return content_store.acquire(ingestion_pipeline.digest(image), ".jpg")
+
+    @staticmethod
+    def _persist_picture(
+        ingestion_pipeline: ImageIngestionPipeline,
+        content_store: ContentStore,
+        image: Image.Image,
+        dest_path: Path,
+    ) -> None:
+        """Encode et écrit un blob réservé ; rend la référence si échec."""
+        try:
+            if dest_path.is_file():
+                # Déjà stocké par un autre import : rien à encoder
+                return
+            data = ingestion_pipeline.encode(image)
+            t0 = time.perf_counter()
+            content_store.write(dest_path, data)
+            ingestion_pipeline.record_stage(
+                "write", (time.perf_counter() - t0) * 1000.0)
+        except Exception:
+            content_store.release(dest_path)
+            raise
+
+    @classmethod
+    def _store_picture(
+        cls,
+        ingestion_pipeline: ImageIngestionPipeline,
+        content_store: ContentStore,
+        image: Image.Image,
+    ) -> Path:
+        """Réserve puis écrit la copie stockée (import par lot)."""
+        dest_path = cls._reserve_picture(
+            ingestion_pipeline, content_store, image)
+        cls._persist_picture(
+            ingestion_pipeline, content_store, image, dest_path)
+        return dest_path
+
+    @classmethod
+    def _write_picture(
+        cls,
+        ingestion_pipeline: ImageIngestionPipeline,
+        content_store: ContentStore,
+        rendition_store: RenditionStore,
+        image: Image.Image,
+        dest_path: Path,
+    ) -> None:
+        """Tâche de fond de l'import : copie stockée puis renditions."""
+        try:
+            cls._persist_picture(
+                ingestion_pipeline, content_store, image, dest_path)
+        except Exception as e:
+            print(f"[ERROR] storing {dest_path} failed: {e}")
+            return
+        cls._generate_renditions(rendition_store, image, dest_path)
+
+    @staticmethod
+    def _generate_renditions(
+        rendition_store: RenditionStore,
+        image: Image.Image,
+        dest_path: Path,
+    ) -> None:
+        if not settings.PICTURE_RENDITIONS_AT_IMPORT:
+            return
+        try:
+            rendition_store.generate(image, dest_path)
+        except Exception as e:
+            # Recréées à la demande par recover_picture
+            print(f"[WARN] renditions of {dest_path} failed: {e}")
+
+    def _analyse_upload(
+        self,
+        contents: bytes,
+        model_catalog: ModelCatalog,
+        ingestion_pipeline: ImageIngestionPipeline,
+        with_activations: bool = True,
+    ) -> tuple:
+        """CPU-bound part of the import, run on the inference executor.
+
+        The upload is decoded once (resized to 384x384 for consistent
+        inference) and the same pixels feed the model.
+        """
+        ingested = ingestion_pipeline.decode(contents)
+
+        # Duplicate uploads (retries, same spot) are served from the
+        # prediction cache without a forward pass.
+        inference_result = cached_predict_image(
+            image_bytes=contents,
+            image=ingested.image,
+            top_k=5,
+            confidence_threshold=0.0,
+            catalog=model_catalog,
+            with_activations=with_activations,
+        )
+
+        predict_timings = inference_result.get("timings_ms") or {}
+        for stage, elapsed_ms in predict_timings.items():
+            ingestion_pipeline.record_stage(stage, elapsed_ms)
+        inference_result["timings_ms"] = {
+            **ingested.timings_ms,
+            **predict_timings,
+        }
+        return inference_result, ingested
+
     async def generate_picture_activations(
         self,
         picture_id: uuid.UUID = FastAPIPath(
@@ -296,6 +763,8 @@ class PictureController:
         payload: ActivationsRequestDTO = Body(...),
         picture_catalog: PictureCatalog = Depends(get_picture_catalog),
         model_catalog: ModelCatalog = Depends(get_model_catalog),
+        inference_executor: InferenceExecutor = Depends(
+            get_inference_executor),
         user: AuthenticatedUser = Depends(require_role("admin")),
     ):
         picture = picture_catalog.find_by_id(picture_id)
@@ -309,7 +778,7 @@ class PictureController:
                 status_code=400, detail="Cannot read picture file"
                 )
 
-        active_model = model_catalog.find_active_model()
+        active_model = resolve_active_model(model_catalog)
         if not active_model:
             raise HTTPException(
                 status_code=500,
@@ -317,30 +786,65 @@ class PictureController:
             )
 
         model_version = active_model.path
-        model = load_model(model_version)
-
-        pc = PREPROCESS_CACHE.get(model_version, {}).copy()
-        input_size = int(pc.get("size", active_model.input_size))
-        mean = pc.get("mean")
-        std = pc.get("std")
-
         layers_list: Optional[List[str]] = payload.layers or None
         include_heatmaps: bool = bool(payload.include_heatmaps)
         include_overlays: bool = bool(payload.include_overlays)
 
         UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
-        try:
-            activations_payload = generate_activations(
+        # Même image, même modèle, mêmes options -> même bundle
+        token = None
+        if settings.ACTIVATION_CACHE_ENABLED:
+            token = activation_token(
+                picture_id=str(picture_id),
+                model_version=model_version,
+                image=content_hash(image_bytes),
+                image_format=settings.ACTIVATION_IMAGE_FORMAT,
+                reduction=settings.ACTIVATION_REDUCTION,
+                max_channels=settings.ACTIVATION_MAX_CHANNELS,
+                layers=layers_list,
+                include_heatmaps=include_heatmaps,
+                include_overlays=include_overlays,
+            )
+            cached = read_cached_result(UPLOAD_DIR / "activations" / token)
+            if cached is not None:
+                return {
+                    "picture_id": str(picture_id),
+                    "model_version": model_version,
+                    "activations": cached,
+                    "cached": True,
+                }
+
+        def _generate() -> dict:
+            model = load_model(model_version)
+
+            pc = model_cache.get_preprocess(model_version)
+            input_size = int(pc.get("size", active_model.input_size))
+
+            return generate_activations(
                 model=model,
                 image_bytes=image_bytes,
                 input_size=input_size,
-                mean=mean,
-                std=std,
+                mean=pc.get("mean"),
+                std=pc.get("std"),
                 layers=layers_list,
                 include_heatmaps=include_heatmaps,
                 include_overlays=include_overlays,
                 uploads_dir=str(UPLOAD_DIR),
+                token=token,
+                model_version=model_version,
+                image_format=settings.ACTIVATION_IMAGE_FORMAT,
+                max_channels=settings.ACTIVATION_MAX_CHANNELS or None,
+                reduction=settings.ACTIVATION_REDUCTION,
+            )
+
+        try:
+            activations_payload = await inference_executor.run(_generate)
+        except InferenceQueueFullError as exc:
+            raise HTTPException(
+                status_code=503,
+                detail="Serveur d'inférence saturé, réessayez plus tard",
+                headers={"Retry-After": str(exc.retry_after)},
             )
         except Exception as exc:
             raise HTTPException(
@@ -352,6 +856,7 @@ class PictureController:
             "picture_id": str(picture_id),
             "model_version": model_version,
             "activations": activations_payload,
+            "cached": False,
         }
 
     async def find_picture_to_validate(
@@ -416,6 +921,7 @@ class PictureController:
 
     async def recover_picture(
         self,
+        request: Request,
         picture_id: uuid.UUID = FastAPIPath(
             ...,
             description="ID de la picture à récupérer",
@@ -425,69 +931,190 @@ class PictureController:
             description="Type d'image à récupérer",
         ),
         picture_catalog: PictureCatalog = Depends(get_picture_catalog),
+        rendition_store: RenditionStore = Depends(get_rendition_store),
     ):
         picture = picture_catalog.find_by_id(picture_id)
-        image = Image.open(picture.path)
-
-        if type == "thumbnail":
-            max_size = (150, 150)
-            quality = 70
-        else:
-            max_size = (384, 384)
-            quality = 90
-
-        image.thumbnail(max_size, Image.Resampling.LANCZOS)
-
-        if image.mode != "RGB":
-            image = image.convert("RGB")
+        if not picture:
+            raise HTTPException(status_code=404, detail="Picture not found")
 
-        buffer = io.BytesIO()
-        image.save(buffer, format="JPEG", quality=quality, optimize=True)
-        buffer.seek(0)
+        # Rendition pré-encodée ; créée une fois pour les images importées
+        # avant son introduction (ou si l'import n'a pas pu l'écrire)
+        try:
+            path = await asyncio.to_thread(
+                rendition_store.ensure, picture.path, type)
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail="Picture not found")
 
-        return StreamingResponse(buffer, media_type="image/jpeg")
+        return await asyncio.to_thread(
+            cached_file_response,
+            request,
+            path,
+            "image/jpeg",
+            PICTURE_CACHE_CONTROL,
+        )
 
     async def list_activation_images(self, token: str):
         act_dir = UPLOAD_DIR / "activations" / token
-        if not act_dir.exists() or not act_dir.is_dir():
+        # ".trash", ".reaper.lock", ".." : jamais servis
+        if token.startswith(".") or not act_dir.is_dir():
             raise HTTPException(
                 status_code=404,
                 detail="Activation token not found",
             )
 
-        files = []
-        for p in sorted(act_dir.iterdir()):
-            if p.is_file() and p.suffix.lower() in (".png", ".jpg", ".jpeg"):
-                files.append(
-                    {
-                        "name": p.name,
-                        "url": f"/pictures/activations/{token}/image/{p.name}",
-                    }
-                )
+        manifest = read_manifest(act_dir)
+        if manifest is not None:
+            names = sorted(manifest.get("files", {}))
+        else:
+            # Anciens tokens : PNG écrits sur disque
+            names = [
+                p.name for p in sorted(act_dir.iterdir())
+                if p.is_file()
+                and p.suffix.lower() in ACTIVATION_IMAGE_SUFFIXES
+            ]
+
+        files = [
+            {
+                "name": name,
+                "url": f"/pictures/activations/{token}/image/{name}",
+            }
+            for name in names
+        ]
 
         return {"token": token, "images": files}
 
-    async def get_activation_image(self, token: str, filename: str):
-        act_file = UPLOAD_DIR / "activations" / token / filename
-        if not act_file.exists() or not act_file.is_file():
+    async def get_activation_image(
+        self,
+        request: Request,
+        token: str,
+        filename: str,
+        renderer: ActivationRenderer = Depends(get_activation_renderer),
+    ):
+        # ".trash", ".reaper.lock", ".." : jamais servis
+        if token.startswith(".") or filename.startswith("."):
             raise HTTPException(
                 status_code=404,
                 detail="Activation image not found",
             )
+        act_dir = UPLOAD_DIR / "activations" / token
+        act_file = act_dir / filename
+        if act_file.suffix.lower() in ACTIVATION_IMAGE_SUFFIXES \
+                and act_file.is_file():
+            # Anciens tokens : PNG sur disque, servis par sendfile
+            return await asyncio.to_thread(
+                cached_file_response,
+                request,
+                act_file,
+                media_type=media_type_for(filename),
+            )
 
-        ext = act_file.suffix.lower()
-        media_type = "image/jpeg" if ext in (".jpg", ".jpeg") else "image/png"
-
+        # Rendu à la demande depuis le bundle compressé (pool borné + LRU) ;
+        # l'ETag ne dépend que du bundle : 304 sans rendu
+        etag = bundle_etag(act_dir, filename, renderer.encoder)
+        if etag is not None and etag_matches(request, etag):
+            return not_modified(etag, IMMUTABLE)
         try:
-            f = act_file.open("rb")
-            return StreamingResponse(f, media_type=media_type)
+            data = await asyncio.wrap_future(
+                renderer.submit(act_dir, filename))
         except Exception as exc:
             raise HTTPException(status_code=500, detail=str(exc))
+        if data is None:
+            raise HTTPException(
+                status_code=404,
+                detail="Activation image not found",
+            )
+        headers = {"Cache-Control": IMMUTABLE}
+        if etag is not None:
+            # Bundle retiré par le reaper entre-temps : pas d'ETag
+            headers["ETag"] = etag
+        return Response(
+            content=data,
+            media_type=media_type_for(filename),
+            headers=headers,
+        )
+
+    async def get_activation_bundle(
+        self,
+        request: Request,
+        token: str,
+        format: Literal["zip", "sprite"] = Query(
+            "zip",
+            description="zip : toutes les images ; sprite : planche + "
+                        "positions (JSON)",
+        ),
+        renderer: ActivationRenderer = Depends(get_activation_renderer),
+    ):
+        """Toutes les images d'un token en une seule réponse."""
+        act_dir = UPLOAD_DIR / "activations" / token
+        # ".trash", ".reaper.lock", ".." : jamais servis
+        if token.startswith(".") or not act_dir.is_dir():
+            raise HTTPException(
+                status_code=404,
+                detail="Activation token not found",
+            )
+
+        # Contenu immuable pour un token : revalidation par ETag seulement
+        etag = bundle_etag(act_dir, format, renderer.encoder)
+        headers = {"Cache-Control": IMMUTABLE}
+        if etag is not None:
+            headers["ETag"] = etag
+            if etag_matches(request, etag):
+                return not_modified(etag, IMMUTABLE)
+
+        if format == "sprite":
+            sprite = await asyncio.wrap_future(
+                renderer.submit_sprite(act_dir))
+            if sprite is None:
+                raise HTTPException(
+                    status_code=404,
+                    detail="No sprite for this activation token",
+                )
+            data, layout = sprite
+            return JSONResponse(
+                content={
+                    "token": token,
+                    **layout,
+                    "atlas": base64.b64encode(data).decode("ascii"),
+                },
+                headers=headers,
+            )
+
+        rendered = await asyncio.to_thread(renderer.render_all, act_dir)
+        if rendered is None:
+            # Anciens tokens : PNG écrits sur disque
+            rendered = await asyncio.to_thread(
+                self._read_legacy_activations, act_dir)
+        manifest = read_manifest(act_dir) or {}
+        index = {
+            "token": token,
+            "activations": manifest.get("result"),
+            "files": list(rendered),
+        }
+        entries = [("index.json", json.dumps(index).encode("utf-8"))]
+        entries.extend(rendered.items())
+
+        headers["Content-Disposition"] = (
+            f'attachment; filename="activations-{token}.zip"')
+        return StreamingResponse(
+            iter_zip(entries),
+            media_type="application/zip",
+            headers=headers,
+        )
+
+    @staticmethod
+    def _read_legacy_activations(act_dir: Path) -> Dict[str, bytes]:
+        return {
+            p.name: p.read_bytes() for p in sorted(act_dir.iterdir())
+            if p.is_file()
+            and p.suffix.lower() in ACTIVATION_IMAGE_SUFFIXES
+        }
 
     async def delete_pictures_pva(
         self,
         pictures: list[PicturePvaDTO] = Body(...),
         picture_catalog: PictureCatalog = Depends(get_picture_catalog),
+        content_store: ContentStore = Depends(get_content_store),
+        rendition_store: RenditionStore = Depends(get_rendition_store),
         user: AuthenticatedUser = Depends(require_role("admin")),
     ):
         deleted_pictures = []
@@ -497,7 +1124,10 @@ class PictureController:
                 if pic_obj:
                     picture_catalog.delete(picture.id)
                     try:
-                        Path(pic_obj.path).unlink()
+                        # Blob partagé par des doublons : supprimé (avec ses
+                        # renditions) à la dernière référence seulement
+                        if content_store.release(pic_obj.path) == 0:
+                            rendition_store.delete(pic_obj.path)
                     except Exception as exc:
                         print(f"Erreur suppression {pic_obj.path}: {exc}")
                     deleted_pictures.append(picture.id)
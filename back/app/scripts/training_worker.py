@@ -0,0 +1,34 @@
+"""Worker d'entraînement autonome (hors process API).
+
+    python -m app.scripts.training_worker [--drain]
+
+Sans ``--drain`` il tourne indéfiniment ; avec, il s'arrête dès que la file
+est vide (Job Kubernetes).
+"""
+
+import argparse
+
+from app.model.infra.factory.model_factory import build_training_worker
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--drain",
+        action="store_true",
+        help="s'arrêter quand il n'y a plus de job en file",
+    )
+    args = parser.parse_args()
+
+    # Pas de verrou de nœud : ce process ne sert que l'entraînement
+    worker = build_training_worker()
+    print(f"[TRAINING] worker {worker.worker_id} started")
+    try:
+        worker.run(drain=args.drain)
+    except KeyboardInterrupt:
+        worker.stop()
+    print(f"[TRAINING] worker stopped: {worker.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Storage package - blob storage port and its adapters"""
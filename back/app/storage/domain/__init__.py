@@ -0,0 +1 @@
+"""Domain package for storage"""
@@ -0,0 +1,32 @@
+from pathlib import Path
+from typing import Iterator, Protocol, Union
+
+PathLike = Union[str, Path]
+
+# Taille des morceaux lus en streaming
+CHUNK_SIZE = 1024 * 1024
+
+
+class BlobStorage(Protocol):
+    """Stockage d'objets adressés par clé (``models/resnet.3.pth``...).
+
+    Une clé absente lève ``FileNotFoundError``, comme un fichier local.
+    """
+
+    def exists(self, key: str) -> bool: ...
+
+    def size(self, key: str) -> int: ...
+
+    def keys(self, prefix: str = "") -> Iterator[str]: ...
+
+    def iter_bytes(
+        self, key: str, chunk_size: int = CHUNK_SIZE
+    ) -> Iterator[bytes]: ...
+
+    def put_bytes(self, key: str, data: bytes) -> None: ...
+
+    def upload_file(self, key: str, path: PathLike) -> None: ...
+
+    def download_file(self, key: str, path: PathLike) -> None: ...
+
+    def delete(self, key: str) -> None: ...
@@ -0,0 +1 @@
+"""Infra (adapters) for storage domain"""
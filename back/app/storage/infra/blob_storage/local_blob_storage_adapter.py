@@ -0,0 +1,76 @@
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Iterator
+
+from app.storage.domain.catalog.blob_storage import CHUNK_SIZE, PathLike
+
+
+class LocalBlobStorageAdapter:
+    """Implémentation du BlobStorage sur un répertoire local (ou monté)."""
+
+    def __init__(self, root: PathLike):
+        self.root = Path(root)
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).is_file()
+
+    def size(self, key: str) -> int:
+        return self._path(key).stat().st_size
+
+    def keys(self, prefix: str = "") -> Iterator[str]:
+        """Clés commençant par ``prefix``, dans l'ordre lexicographique."""
+        base = self.root / os.path.dirname(prefix)
+        if not base.is_dir():
+            return
+        for path in sorted(base.rglob("*")):
+            if not path.is_file() or path.name.startswith("."):
+                continue
+            key = path.relative_to(self.root).as_posix()
+            if key.startswith(prefix):
+                yield key
+
+    def iter_bytes(
+        self, key: str, chunk_size: int = CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        with open(self._path(key), "rb") as fh:
+            for chunk in iter(lambda: fh.read(chunk_size), b""):
+                yield chunk
+
+    def put_bytes(self, key: str, data: bytes) -> None:
+        tmp = self._tmp_path(key)
+        tmp.write_bytes(data)
+        os.replace(tmp, self._path(key))
+
+    def upload_file(self, key: str, path: PathLike) -> None:
+        if os.path.abspath(path) == os.path.abspath(self._path(key)):
+            return
+        tmp = self._tmp_path(key)
+        shutil.copyfile(path, tmp)
+        os.replace(tmp, self._path(key))
+
+    def download_file(self, key: str, path: PathLike) -> None:
+        src = self._path(key)
+        if os.path.abspath(path) == os.path.abspath(src):
+            return
+        dest = Path(path)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(f".{dest.name}.{uuid.uuid4().hex}.tmp")
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, dest)
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if not path.is_relative_to(self.root.resolve()):
+            raise ValueError(f"Clé hors du stockage: {key}")
+        return path
+
+    def _tmp_path(self, key: str) -> Path:
+        # Écriture atomique : un lecteur ne voit jamais un objet partiel
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
@@ -0,0 +1,119 @@
+import os
+import uuid
+from pathlib import Path
+from typing import Iterator, Optional
+
+from app.storage.domain.catalog.blob_storage import CHUNK_SIZE, PathLike
+
+MB = 1024 * 1024
+
+
+class S3BlobStorageAdapter:
+    """Implémentation du BlobStorage sur un bucket S3 (AWS, MinIO...).
+
+    Un seul client boto3 (thread-safe) et son pool de connexions HTTP sont
+    partagés par tous les appels. Les gros fichiers (modèles) passent par
+    le transfer manager : upload multipart au-delà de
+    ``multipart_threshold``, parties envoyées en parallèle. Les lectures
+    sont streamées par morceaux, jamais chargées entièrement en mémoire.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        endpoint_url: Optional[str] = None,
+        region: Optional[str] = None,
+        access_key_id: Optional[str] = None,
+        secret_access_key: Optional[str] = None,
+        max_pool_connections: int = 20,
+        multipart_threshold: int = 64 * MB,
+        multipart_chunksize: int = 16 * MB,
+        max_concurrency: int = 4,
+    ):
+        # Dépendance optionnelle : seulement requise avec STORAGE_BACKEND=s3
+        import boto3
+        from boto3.s3.transfer import TransferConfig
+        from botocore.config import Config
+
+        self.bucket = bucket
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url or None,
+            region_name=region or None,
+            aws_access_key_id=access_key_id or None,
+            aws_secret_access_key=secret_access_key or None,
+            config=Config(
+                max_pool_connections=max_pool_connections,
+                retries={"max_attempts": 5, "mode": "standard"},
+            ),
+        )
+        self.transfer_config = TransferConfig(
+            multipart_threshold=multipart_threshold,
+            multipart_chunksize=multipart_chunksize,
+            max_concurrency=max_concurrency,
+        )
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.size(key)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def size(self, key: str) -> int:
+        try:
+            head = self.client.head_object(Bucket=self.bucket, Key=key)
+        except self.client.exceptions.ClientError as e:
+            raise self._not_found(e, key)
+        return int(head["ContentLength"])
+
+    def keys(self, prefix: str = "") -> Iterator[str]:
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+            for obj in page.get("Contents", []):
+                yield obj["Key"]
+
+    def iter_bytes(
+        self, key: str, chunk_size: int = CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        try:
+            body = self.client.get_object(
+                Bucket=self.bucket, Key=key)["Body"]
+        except self.client.exceptions.ClientError as e:
+            raise self._not_found(e, key)
+        try:
+            yield from body.iter_chunks(chunk_size)
+        finally:
+            # Rend la connexion au pool même si le lecteur s'arrête avant
+            body.close()
+
+    def put_bytes(self, key: str, data: bytes) -> None:
+        self.client.put_object(Bucket=self.bucket, Key=key, Body=data)
+
+    def upload_file(self, key: str, path: PathLike) -> None:
+        self.client.upload_file(
+            str(path), self.bucket, key, Config=self.transfer_config)
+
+    def download_file(self, key: str, path: PathLike) -> None:
+        dest = Path(path)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(f".{dest.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            self.client.download_file(
+                self.bucket, key, str(tmp), Config=self.transfer_config)
+        except BaseException as e:
+            tmp.unlink(missing_ok=True)
+            if isinstance(e, self.client.exceptions.ClientError):
+                raise self._not_found(e, key)
+            raise
+        os.replace(tmp, dest)
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    @staticmethod
+    def _not_found(error, key: str) -> Exception:
+        code = str(error.response.get("Error", {}).get("Code"))
+        if code in ("404", "NoSuchKey", "NotFound"):
+            return FileNotFoundError(key)
+        return error
@@ -0,0 +1 @@
+"""Factory for storage infra"""
@@ -0,0 +1,50 @@
+import threading
+from typing import Optional
+
+from app.config import settings
+from app.storage.domain.catalog.blob_storage import BlobStorage
+from app.storage.infra.blob_storage.local_blob_storage_adapter import (
+    LocalBlobStorageAdapter,
+)
+
+MB = 1024 * 1024
+
+_blob_storage: Optional[BlobStorage] = None
+_blob_storage_lock = threading.Lock()
+
+
+def build_blob_storage(backend: str) -> Optional[BlobStorage]:
+    if not backend:
+        return None
+    if backend == "local":
+        return LocalBlobStorageAdapter(settings.STORAGE_LOCAL_ROOT)
+    if backend == "s3":
+        from app.storage.infra.blob_storage.s3_blob_storage_adapter import (
+            S3BlobStorageAdapter,
+        )
+
+        return S3BlobStorageAdapter(
+            bucket=settings.S3_BUCKET,
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            region=settings.S3_REGION,
+            access_key_id=settings.S3_ACCESS_KEY_ID,
+            secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+            max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+            multipart_threshold=settings.S3_MULTIPART_THRESHOLD_MB * MB,
+            multipart_chunksize=settings.S3_MULTIPART_CHUNK_MB * MB,
+            max_concurrency=settings.S3_TRANSFER_CONCURRENCY,
+        )
+    raise ValueError(f"STORAGE_BACKEND inconnu: {backend}")
+
+
+def get_blob_storage() -> Optional[BlobStorage]:
+    """Stockage partagé configuré, ou None (fichiers locaux seulement).
+
+    Créé au premier appel : boto3 n'est importé que s'il est utilisé.
+    """
+    global _blob_storage
+    if _blob_storage is None and settings.STORAGE_BACKEND:
+        with _blob_storage_lock:
+            if _blob_storage is None:
+                _blob_storage = build_blob_storage(settings.STORAGE_BACKEND)
+    return _blob_storage
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark du rendu des images d'activation (heatmaps + overlays).
+
+Un ResNet50 (aléatoire ou checkpoint) est instrumenté sur tous ses enfants
+de premier niveau, comme ``POST /pictures/{id}/activations``. Le bundle
+est généré une fois, puis tous ses fichiers sont rendus et encodés pour
+chaque réglage d'encodeur, en série (1 worker) puis sur le pool.
+
+Usage:
+    python benchmarks/bench_activation_rendering.py [--image photo.jpg]
+        [--checkpoint /app/models/resnet-1.0.pth] [--size 384]
+        [--workers 4] [--runs 3]
+"""
+
+import argparse
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.model.domain.service.activation_store import (  # noqa: E402
+    ActivationRenderer,
+    EncoderOptions,
+    read_manifest,
+)
+from app.model.domain.service.activations import (  # noqa: E402
+    ActivationGenerator,
+)
+from app.model.domain.service.model_artifacts import (  # noqa: E402
+    load_mmap_module,
+)
+
+ENCODERS = [
+    ("png", "level 6", EncoderOptions(png_compress_level=6)),
+    ("png", "level 1", EncoderOptions(png_compress_level=1)),
+    ("webp", "q85", EncoderOptions(quality=85)),
+    ("jpeg", "q85", EncoderOptions(quality=85)),
+]
+
+
+def sample_image(path, size: int) -> bytes:
+    if path is not None:
+        return Path(path).read_bytes()
+    # Dégradé + bruit léger : compressible comme une vraie photo
+    y, x = np.mgrid[0:size, 0:size]
+    rgb = np.stack([x, y, (x + y) // 2], axis=-1) * (255.0 / size)
+    rgb += np.random.default_rng(0).normal(0, 8, rgb.shape)
+    image = Image.fromarray(rgb.clip(0, 255).astype(np.uint8), mode="RGB")
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=90)
+    return buffer.getvalue()
+
+
+def time_render(base: Path, names, workers: int, encoder, runs: int):
+    timings = []
+    total_bytes = 0
+    for _ in range(runs):
+        # max_entries=0 : pas de LRU, chaque passe rend tout
+        renderer = ActivationRenderer(
+            max_entries=0, workers=workers, encoder=encoder)
+        started = time.perf_counter()
+        rendered = renderer.render_many(base, names)
+        timings.append((time.perf_counter() - started) * 1000.0)
+        total_bytes = sum(len(v) for v in rendered.values() if v)
+    return statistics.median(timings), total_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark du rendu des activations"
+    )
+    parser.add_argument("--checkpoint", type=Path, default=None)
+    parser.add_argument("--image", type=str, default=None)
+    parser.add_argument("--size", type=int, default=384)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.checkpoint:
+        model = load_mmap_module(args.checkpoint).eval()
+    else:
+        from torchvision import models
+
+        model = models.resnet50(weights=None).eval()
+
+    image_bytes = sample_image(args.image, args.size)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        generator = ActivationGenerator(uploads_dir=tmp)
+        print(f"Entrée {args.size}x{args.size}, "
+              f"{len(list(model.named_children()))} couches instrumentées")
+        print()
+        print(f"{'format':>6} | {'réglage':>8} | {'génération (ms)':>15} | "
+              f"{'1 worker (ms)':>13} | "
+              f"{f'{args.workers} workers (ms)':>15} | {'taille (Ko)':>11}")
+        print("-" * 86)
+        for image_format, label, encoder in ENCODERS:
+            started = time.perf_counter()
+            result = generator.generate_activations(
+                model=model,
+                image_bytes=image_bytes,
+                input_size=args.size,
+                image_format=image_format,
+            )
+            generate_ms = (time.perf_counter() - started) * 1000.0
+
+            base = Path(tmp) / "activations" / result["token"]
+            names = list(read_manifest(base)["files"])
+            serial_ms, size = time_render(
+                base, names, 1, encoder, args.runs)
+            pool_ms, _ = time_render(
+                base, names, args.workers, encoder, args.runs)
+            print(f"{image_format:>6} | {label:>8} | {generate_ms:>15.1f} | "
+                  f"{serial_ms:>13.1f} | {pool_ms:>15.1f} | "
+                  f"{size / 1024:>11.1f}")
+        print()
+        print(f"{len(names)} fichiers par bundle")
+
+
+if __name__ == "__main__":
+    main()
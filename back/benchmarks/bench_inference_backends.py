@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark des backends d'exécution : TorchScript vs ONNX Runtime (CPU).
+
+Les deux backends reçoivent exactement les mêmes tenseurs (images d'un
+dossier prétraitées comme à l'inférence, ou tenseurs aléatoires). Le
+rapport donne la latence médiane batch=1, le débit en batch et l'écart
+maximal entre les logits des deux backends.
+
+Usage:
+    python benchmarks/bench_inference_backends.py [--images DIR]
+        [--checkpoint /app/models/resnet-1.0.pth] [--size 384]
+        [--batch-size 8] [--runs 20]
+
+Sans ``--checkpoint``, un resnet50 aléatoire est utilisé. Avec un
+checkpoint, le modèle eager est lu depuis ``<stem>-mmap.pt`` et
+``<stem>.onnx`` est exporté s'il n'existe pas encore.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import torch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.model.domain.service.execution_backend import (  # noqa: E402
+    OnnxRuntimeModule,
+    export_onnx,
+    onnx_artifact_path,
+)
+from app.model.domain.service.model_artifacts import (  # noqa: E402
+    load_mmap_module,
+)
+from app.model.domain.service.model_quantizer import (  # noqa: E402
+    iter_calibration_batches,
+)
+
+
+def load_inputs(images_dir, size: int, count: int) -> torch.Tensor:
+    if images_dir is None:
+        return torch.randn(count, 3, size, size)
+    paths = sorted(
+        p for p in Path(images_dir).iterdir()
+        if p.suffix.lower() in (".jpg", ".jpeg", ".png")
+    )[:count]
+    batches = list(iter_calibration_batches(paths, size=size))
+    if not batches:
+        raise SystemExit(f"Aucune image lisible dans {images_dir}")
+    return torch.cat(batches)
+
+
+def median_ms(fn, x: torch.Tensor, runs: int) -> float:
+    timings = []
+    with torch.inference_mode():
+        for _ in range(3):
+            fn(x)
+        for _ in range(runs):
+            started = time.perf_counter()
+            fn(x)
+            timings.append((time.perf_counter() - started) * 1000.0)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark TorchScript vs ONNX Runtime"
+    )
+    parser.add_argument("--checkpoint", type=Path, default=None)
+    parser.add_argument("--images", type=str, default=None)
+    parser.add_argument("--size", type=int, default=384)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--threads", type=int, default=0,
+                        help="threads intra-op (0 = défaut)")
+    args = parser.parse_args()
+
+    if args.threads > 0:
+        torch.set_num_threads(args.threads)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.checkpoint:
+            checkpoint = args.checkpoint
+            eager = load_mmap_module(checkpoint).eval()
+        else:
+            from torchvision import models
+
+            checkpoint = Path(tmp) / "bench-resnet50.pth"
+            eager = models.resnet50(weights=None).eval()
+
+        onnx_path = onnx_artifact_path(checkpoint)
+        if not onnx_path.is_file():
+            export_onnx(eager, checkpoint,
+                        torch.randn(1, 3, args.size, args.size))
+
+        backends = [
+            ("torchscript", torch.jit.freeze(torch.jit.script(eager))),
+            ("onnxruntime", OnnxRuntimeModule(
+                onnx_path, intra_op_threads=args.threads)),
+        ]
+
+        inputs = load_inputs(args.images, args.size, args.batch_size)
+        single = inputs[:1]
+        batch = inputs[:args.batch_size]
+
+        with torch.inference_mode():
+            reference = backends[0][1](batch)
+
+        print(f"Entrée {args.size}x{args.size}, batch={batch.shape[0]}, "
+              f"torch threads={torch.get_num_threads()}")
+        print()
+        print(f"{'backend':>12} | {'b=1 (ms)':>9} | {'batch (img/s)':>13} | "
+              f"{'écart max':>10}")
+        print("-" * 54)
+        for name, module in backends:
+            lat = median_ms(module, single, args.runs)
+            batch_ms = median_ms(module, batch, max(args.runs // 4, 3))
+            with torch.inference_mode():
+                diff = float((module(batch) - reference).abs().max())
+            ips = batch.shape[0] / (batch_ms / 1000.0)
+            print(f"{name:>12} | {lat:>9.2f} | {ips:>13.2f} | {diff:>10.2e}")
+
+
+if __name__ == "__main__":
+    main()
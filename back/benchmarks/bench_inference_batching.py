@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark du micro-batching d'inférence (images/seconde).
+
+Compare une passe forward batch=1 par requête (comportement historique)
+avec l'`InferenceBatcher` à différents niveaux de concurrence.
+
+Usage:
+    python benchmarks/bench_inference_batching.py [--requests 128]
+        [--concurrency 1 8 32] [--max-batch-size 16] [--max-wait-ms 5]
+        [--size 384]
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import torch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.model.domain.service.inference_batcher import (  # noqa: E402
+    InferenceBatcher,
+    run_batch,
+)
+
+
+def build_model(num_classes: int) -> torch.nn.Module:
+    from torchvision import models
+
+    model = models.resnet50(weights=None)
+    model.fc = torch.nn.Linear(model.fc.in_features, num_classes)
+    model.eval()
+    return model
+
+
+def run(concurrency: int, requests: int, call) -> float:
+    """Retourne le débit en images/seconde."""
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lambda _: call(), range(requests)))
+    return requests / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark du micro-batching d'inférence"
+    )
+    parser.add_argument("--requests", type=int, default=128)
+    parser.add_argument("--concurrency", type=int, nargs="+",
+                        default=[1, 8, 32])
+    parser.add_argument("--max-batch-size", type=int, default=16)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--size", type=int, default=384)
+    parser.add_argument("--num-classes", type=int, default=10)
+    args = parser.parse_args()
+
+    model = build_model(args.num_classes)
+    image = torch.randn(1, 3, args.size, args.size)
+
+    # Warmup (sélection des kernels oneDNN, allocations)
+    run_batch(model, image, top_k=[5])
+
+    batcher = InferenceBatcher(
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+    )
+
+    def direct():
+        return run_batch(model, image, top_k=[5])[0]
+
+    def batched():
+        return batcher.submit(model, "bench", image, top_k=5)
+
+    print(f"Modèle: resnet50, entrée {args.size}x{args.size}, "
+          f"{args.requests} requêtes, torch threads={torch.get_num_threads()}")
+    print(f"Batcher: max_batch_size={args.max_batch_size}, "
+          f"max_wait_ms={args.max_wait_ms}")
+    print()
+    print(f"{'concurrence':>12} | {'direct (img/s)':>15} | "
+          f"{'batché (img/s)':>15} | {'batch moyen':>11}")
+    print("-" * 64)
+
+    for concurrency in args.concurrency:
+        direct_ips = run(concurrency, args.requests, direct)
+        before = batcher.stats()
+        batched_ips = run(concurrency, args.requests, batched)
+        after = batcher.stats()
+        batches = after["batches"] - before["batches"]
+        avg = (after["requests"] - before["requests"]) / batches \
+            if batches else 0.0
+        print(f"{concurrency:>12} | {direct_ips:>15.2f} | "
+              f"{batched_ips:>15.2f} | {avg:>11.2f}")
+
+    batcher.shutdown()
+
+
+if __name__ == "__main__":
+    main()
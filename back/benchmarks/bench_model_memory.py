@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark mémoire : poids copiés par worker vs poids mappés (mmap).
+
+Lance N processus (comme ``uvicorn --workers N``) qui chargent chacun le
+même modèle, puis relève RSS et PSS de chaque worker. Le PSS répartit les
+pages partagées entre les processus qui les utilisent : avec ``torch.load
+(mmap=True)`` les poids ne sont comptés qu'une fois pour tout le pod.
+
+Modes comparés :
+  - jit  : ``torch.jit.load`` du checkpoint TorchScript (comportement
+           historique, une copie des poids par worker)
+  - mmap : ``<stem>-mmap.pt`` chargé via ``load_mmap_module``
+
+Usage:
+    python benchmarks/bench_model_memory.py [--workers 1 2 4]
+        [--checkpoint /app/models/resnet-1.0.pth]
+
+Sans ``--checkpoint``, un resnet50 aléatoire est généré dans un dossier
+temporaire. Linux uniquement (lit /proc/self/smaps_rollup).
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import torch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.model.domain.service.model_artifacts import (  # noqa: E402
+    load_mmap_module,
+    mmap_artifact_path,
+    save_mmap_artifact,
+)
+
+
+def read_memory_kb() -> dict:
+    """RSS / PSS du processus courant, en kB."""
+    values = {}
+    with open("/proc/self/smaps_rollup") as fh:
+        for line in fh:
+            parts = line.split()
+            if parts[0] in ("Rss:", "Pss:"):
+                values[parts[0][:-1].lower()] = int(parts[1])
+    return values
+
+
+def worker(mode: str, checkpoint: str, ready, release, results) -> None:
+    torch.set_num_threads(1)
+    # Le module eager dépickle des classes torchvision : l'importer avant
+    # la mesure pour ne compter que les poids dans les deux modes
+    import torchvision  # noqa: F401
+
+    baseline = read_memory_kb()
+    if mode == "mmap":
+        model = load_mmap_module(checkpoint)
+    else:
+        model = torch.jit.load(checkpoint, map_location="cpu")
+    model.eval()
+
+    # Une passe forward touche toutes les pages de poids
+    with torch.inference_mode():
+        model(torch.randn(1, 3, 224, 224))
+
+    ready.wait()
+    loaded = read_memory_kb()
+    results.put({
+        "rss": loaded["rss"] - baseline["rss"],
+        "pss": loaded["pss"] - baseline["pss"],
+    })
+    # Rester en vie tant que les autres workers mesurent
+    release.wait()
+
+
+def measure(mode: str, checkpoint: str, workers: int) -> list:
+    ctx = mp.get_context("spawn")
+    ready = ctx.Barrier(workers)
+    release = ctx.Event()
+    results = ctx.Queue()
+    procs = [
+        ctx.Process(target=worker,
+                    args=(mode, checkpoint, ready, release, results))
+        for _ in range(workers)
+    ]
+    for p in procs:
+        p.start()
+    samples = [results.get() for _ in procs]
+    release.set()
+    for p in procs:
+        p.join()
+    return samples
+
+
+def build_checkpoint(directory: Path) -> Path:
+    from torchvision import models
+
+    model = models.resnet50(weights=None).eval()
+    checkpoint = directory / "bench-resnet50.pth"
+    torch.jit.script(model).save(str(checkpoint))
+    save_mmap_artifact(model, checkpoint)
+    return checkpoint
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark mémoire des workers (copie vs mmap)"
+    )
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--checkpoint", type=str, default=None,
+                        help="checkpoint TorchScript avec son -mmap.pt")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.checkpoint:
+            checkpoint = Path(args.checkpoint)
+            if not mmap_artifact_path(checkpoint).is_file():
+                parser.error(f"{mmap_artifact_path(checkpoint)} introuvable")
+        else:
+            checkpoint = build_checkpoint(Path(tmp))
+
+        size_mb = os.path.getsize(mmap_artifact_path(checkpoint)) / 2**20
+        print(f"Checkpoint: {checkpoint} ({size_mb:.1f} MB de poids)")
+        print()
+        print(f"{'mode':>6} | {'workers':>7} | {'RSS/worker (MB)':>15} | "
+              f"{'PSS/worker (MB)':>15} | {'PSS total (MB)':>14}")
+        print("-" * 70)
+
+        for mode in ("jit", "mmap"):
+            for workers in args.workers:
+                samples = measure(mode, str(checkpoint), workers)
+                rss = sum(s["rss"] for s in samples) / len(samples) / 1024
+                pss = sum(s["pss"] for s in samples) / len(samples) / 1024
+                print(f"{mode:>6} | {workers:>7} | {rss:>15.1f} | "
+                      f"{pss:>15.1f} | {pss * workers:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Rapport de quantification INT8 : latence, taille et précision top-1.
+
+Quantifie (sauf ``--skip-export``) un modèle entraîné puis compare la
+version fp32 et la variante ``<stem>-int8.pth`` sur les images validées
+en base (labels = nom de la salle, classes lues dans ``-label.json``).
+
+Le modèle fp32 doit être disponible en eager : ``<stem>-mmap.pt`` (écrit
+par l'entraînement) ou un checkpoint state_dict.
+
+Usage:
+    python benchmarks/report_quantization.py --checkpoint
+        /app/models/resnet-1.0.pth [--size 384] [--calibration 128]
+        [--eval-limit 500] [--uploads-dir .] [--skip-export]
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import torch
+from PIL import Image
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.model.domain.service.model_artifacts import (  # noqa: E402
+    int8_artifact_path,
+    load_mmap_module,
+    mmap_artifact_path,
+)
+from app.model.domain.service.model_quantizer import (  # noqa: E402
+    ModelQuantizer,
+    iter_calibration_batches,
+)
+from app.model.domain.service.transforms import (  # noqa: E402
+    default_preprocess,
+)
+
+
+def load_eager(checkpoint: Path) -> torch.nn.Module:
+    try:
+        return load_mmap_module(checkpoint).eval()
+    except FileNotFoundError:
+        from app.model.domain.service.predict import _build_module_from_state
+
+        return _build_module_from_state(str(checkpoint))
+
+
+def load_validated_set(checkpoint: Path, uploads_dir: Path):
+    """(chemin image, index de classe) des images validées en base."""
+    from app.database import SessionLocal
+    from app.picture.infra.repository.picture_repository import (
+        PictureRepository,
+    )
+    from app.picture.infra.repository.picture_sqlalchemy_adapter import (
+        PictureSQLAlchemyAdapter,
+    )
+    from app.room.infra.repository.room_repository import RoomRepository
+    from app.room.infra.repository.room_sqlalchemy_adapter import (
+        RoomSQLAlchemyAdapter,
+    )
+
+    label_file = checkpoint.parent / f"{checkpoint.stem}-label.json"
+    with open(label_file) as fh:
+        classes = json.load(fh)["classes"]
+    class_to_idx = {name: i for i, name in enumerate(classes)}
+
+    db = SessionLocal()
+    try:
+        rooms = RoomSQLAlchemyAdapter(RoomRepository(db)).find_all()
+        pictures = PictureSQLAlchemyAdapter(
+            PictureRepository(db)).find_all_validated_by_room_ids(rooms)
+        samples = [
+            (uploads_dir / pic.path, class_to_idx[pic.room.name])
+            for pic in pictures
+            if pic.room is not None and pic.room.name in class_to_idx
+        ]
+    finally:
+        db.close()
+    return samples
+
+
+def top1_accuracy(model, samples, size: int) -> float:
+    correct = 0
+    total = 0
+    with torch.inference_mode():
+        for path, target in samples:
+            try:
+                with Image.open(path) as img:
+                    x = default_preprocess(img.convert("RGB"), size=size)
+            except Exception as e:
+                print(f"✗ {path}: {e}", file=sys.stderr)
+                continue
+            correct += int(model(x).argmax(dim=1).item() == target)
+            total += 1
+    return correct / total if total else 0.0
+
+
+def latency_ms(model, size: int, runs: int = 20) -> float:
+    x = torch.randn(1, 3, size, size)
+    timings = []
+    with torch.inference_mode():
+        for _ in range(3):
+            model(x)
+        for _ in range(runs):
+            started = time.perf_counter()
+            model(x)
+            timings.append((time.perf_counter() - started) * 1000.0)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Rapport de quantification INT8 (fp32 vs int8)"
+    )
+    parser.add_argument("--checkpoint", type=Path, required=True)
+    parser.add_argument("--size", type=int, default=384)
+    parser.add_argument("--calibration", type=int, default=128)
+    parser.add_argument("--eval-limit", type=int, default=500)
+    parser.add_argument("--uploads-dir", type=Path, default=Path("."))
+    parser.add_argument("--skip-export", action="store_true",
+                        help="réutiliser un -int8.pth existant")
+    args = parser.parse_args()
+
+    fp32 = load_eager(args.checkpoint)
+    samples = load_validated_set(args.checkpoint, args.uploads_dir)
+    rng = random.Random(0)
+    rng.shuffle(samples)
+    print(f"Images validées: {len(samples)}")
+
+    int8_path = int8_artifact_path(args.checkpoint)
+    if not args.skip_export:
+        calibration = [p for p, _ in samples[:args.calibration]]
+        quantizer = ModelQuantizer()
+        quantizer.export(
+            fp32,
+            args.checkpoint,
+            example_input=torch.randn(1, 3, args.size, args.size),
+            calibration=iter_calibration_batches(calibration, size=args.size),
+        )
+        print(f"Mode: {quantizer.last_mode}")
+    int8 = torch.jit.load(str(int8_path), map_location="cpu")
+
+    # Les images de calibration sont exclues de l'évaluation
+    evaluation = samples[args.calibration:][:args.eval_limit] \
+        or samples[:args.eval_limit]
+
+    fp32_file = mmap_artifact_path(args.checkpoint)
+    if not fp32_file.is_file():
+        fp32_file = args.checkpoint
+
+    rows = [
+        ("fp32", fp32, fp32_file),
+        ("int8", int8, int8_path),
+    ]
+    print()
+    print(f"{'variante':>8} | {'taille (MB)':>11} | {'latence b=1 (ms)':>16} | "
+          f"{'top-1':>7}")
+    print("-" * 54)
+    for name, model, path in rows:
+        size_mb = os.path.getsize(path) / 2**20
+        lat = latency_ms(model, args.size)
+        acc = top1_accuracy(model, evaluation, args.size)
+        print(f"{name:>8} | {size_mb:>11.1f} | {lat:>16.2f} | {acc:>7.2%}")
+    print(f"\n{len(evaluation)} images évaluées, "
+          f"torch threads={torch.get_num_threads()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Script de migration des images vers le stockage adressé par contenu.
+
+Chaque image encore stockée à plat (uploads/<uuid>.jpg) est copiée dans
+le store (uploads/ab/cd/<sha256>.jpg, dédupliquée), puis Picture.path est
+réécrit par lots. L'ancien fichier et ses renditions ne sont supprimés
+qu'après le commit du lot : une interruption laisse au pire des blobs en
+trop, corrigés par --recount. Le script peut être relancé sans risque.
+
+Usage:
+    python migrate_content_store.py [--uploads-dir UPLOADS_DIR]
+        [--batch-size 500] [--dry-run] [--recount]
+
+Options:
+    --uploads-dir: Racine du store (défaut: $UPLOAD_DIR ou ./uploads)
+    --batch-size: Nombre de pictures par transaction
+    --dry-run: Afficher ce qui serait fait sans rien modifier
+    --recount: Recalculer les compteurs de références depuis la base
+"""
+
+import argparse
+import os
+import sys
+from collections import Counter
+from pathlib import Path
+
+from sqlalchemy import func, select
+
+from app.database import SessionLocal
+from app.picture.domain.entity.picture import Picture
+from app.picture.domain.service.content_store import (
+    BLOB_EXTENSIONS,
+    REFS_SUFFIX,
+    ContentStore,
+)
+from app.picture.domain.service.renditions import RenditionStore
+
+# Entités liées à Picture, à déclarer avant la première requête
+import app.history.domain.entity.history  # noqa: F401
+import app.model.domain.entity.model  # noqa: F401
+import app.role.domain.entity.role  # noqa: F401
+import app.room.domain.entity.room  # noqa: F401
+import app.user.domain.entity.user  # noqa: F401
+
+
+def migrate(session, store: ContentStore, batch_size: int,
+            dry_run: bool) -> Counter:
+    renditions = RenditionStore()
+    totals = Counter()
+    last_id = None
+    while True:
+        query = select(Picture).order_by(Picture.image_id).limit(batch_size)
+        if last_id is not None:
+            query = query.where(Picture.image_id > last_id)
+        batch = session.scalars(query).all()
+        if not batch:
+            break
+        last_id = batch[-1].image_id
+
+        moved = []
+        for picture in batch:
+            old = Path(picture.path)
+            if store.owns(old):
+                totals["already"] += 1
+                continue
+            if not old.is_file():
+                print(f"✗ {picture.image_id}: fichier absent {old}",
+                      file=sys.stderr)
+                totals["missing"] += 1
+                continue
+            data = old.read_bytes()
+            extension = old.suffix.lower()
+            if extension not in BLOB_EXTENSIONS:
+                extension = ".jpg"
+            if store.address(data, extension).resolve() == old.resolve():
+                # Déjà un blob, sous une autre écriture du chemin : un put
+                # puis l'unlink de l'ancien chemin supprimeraient l'unique
+                # copie
+                totals["already"] += 1
+                continue
+            if dry_run:
+                print(f"→ {old} serait migré")
+                totals["migrated"] += 1
+                continue
+            new = store.put(data, extension)
+            picture.path = str(new)
+            moved.append((old, new))
+
+        if dry_run or not moved:
+            session.rollback()
+            continue
+        try:
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            for _, new in moved:
+                store.release(new)
+            print(f"✗ Lot non migré: {e}", file=sys.stderr)
+            totals["errors"] += len(moved)
+            continue
+
+        for old, new in moved:
+            if old.resolve() == new.resolve():
+                continue
+            old.unlink(missing_ok=True)
+            renditions.delete(old)
+        totals["migrated"] += len(moved)
+        print(f"✓ {totals['migrated']} image(s) migrée(s)")
+    return totals
+
+
+def recount(session, store: ContentStore, dry_run: bool) -> Counter:
+    """Aligne les fichiers .refs sur le nombre de pictures par blob.
+
+    Un blob est identifié par son nom (sha256 + extension), quelle que soit
+    l'écriture du chemin en base (relatif, absolu, autre racine).
+    """
+    references = Counter()
+    rows = session.execute(
+        select(Picture.path, func.count()).group_by(Picture.path))
+    for path, count in rows:
+        references[Path(path).name] += count
+
+    plan = []
+    for dirpath, dirnames, filenames in os.walk(store.root):
+        # Pas de descente dans activations/, .trash/, etc.
+        dirnames[:] = [d for d in dirnames
+                       if len(d) == store.width and not d.startswith(".")]
+        for name in filenames:
+            path = Path(dirpath) / name
+            if name.endswith(REFS_SUFFIX) or not store.owns(path):
+                continue
+            plan.append((path, references.get(name, 0)))
+
+    totals = Counter()
+    if references and plan and not any(expected for _, expected in plan):
+        # Aucun blob ne correspond à la base : mauvaise racine, ou base
+        # vide/incorrecte. Tout mettre à 0 viderait le store.
+        print(f"✗ Aucun blob de {store.root} n'est référencé en base : "
+              "recomptage annulé", file=sys.stderr)
+        totals["refused"] += len(plan)
+        return totals
+
+    for path, expected in plan:
+        if store.refcount(path) == expected:
+            continue
+        print(f"→ {path}: {store.refcount(path)} → {expected}")
+        totals["orphans" if expected == 0 else "fixed"] += 1
+        if not dry_run:
+            store.set_refcount(path, expected)
+            if expected == 0:
+                RenditionStore().delete(path)
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Migre les images vers le stockage adressé par contenu"
+    )
+    parser.add_argument(
+        "--uploads-dir",
+        type=Path,
+        default=Path(os.environ.get("UPLOAD_DIR") or "uploads"),
+        help="Racine du store (défaut: $UPLOAD_DIR ou ./uploads)"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=500,
+        help="Nombre de pictures par transaction (défaut: 500)"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Afficher ce qui serait fait sans rien modifier"
+    )
+    parser.add_argument(
+        "--recount",
+        action="store_true",
+        help="Recalculer les compteurs de références depuis la base"
+    )
+    args = parser.parse_args()
+
+    store = ContentStore(root=args.uploads_dir)
+    if args.dry_run:
+        print("\n⚠️  MODE DRY-RUN: Aucun fichier ne sera modifié\n")
+
+    session = SessionLocal()
+    try:
+        totals = migrate(session, store, args.batch_size, args.dry_run)
+        if args.recount:
+            totals.update(recount(session, store, args.dry_run))
+    finally:
+        session.close()
+
+    print()
+    print("=" * 50)
+    print("Résumé:")
+    print(f"  Images migrées: {totals['migrated']}")
+    print(f"  Déjà dans le store: {totals['already']}")
+    if totals["missing"]:
+        print(f"  Fichiers absents: {totals['missing']}")
+    if totals["errors"]:
+        print(f"  Erreurs: {totals['errors']}")
+    if args.recount:
+        print(f"  Compteurs corrigés: {totals['fixed']}")
+        print(f"  Blobs orphelins supprimés: {totals['orphans']}")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
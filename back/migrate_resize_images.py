@@ -12,11 +12,15 @@ Options:
 
 import argparse
 import io
+import os
 import sys
 from pathlib import Path
 from PIL import Image
 from typing import List, Tuple
 
+from app.picture.domain.service.content_store import ContentStore
+from app.picture.domain.service.renditions import RENDITIONS
+
 
 def resize_image(image_path: Path, target_size: Tuple[int, int] = (384, 384), quality: int = 100) -> bool:
     """
@@ -63,17 +67,32 @@ def find_images(uploads_dir: Path) -> List[Path]:
     """
     Trouve toutes les images dans le dossier uploads.
 
+    Parcourt la racine (anciens fichiers plats) et les dossiers de shards
+    du ContentStore (uploads/ab/cd/<sha256>.jpg), sans les fichiers .refs
+    ni les renditions (<stem>.thumbnail.jpg...), ni activations/ ou .trash/.
+
     Args:
         uploads_dir: Chemin vers le dossier uploads
 
     Returns:
         Liste des chemins d'images
     """
-    extensions = {".jpg", ".jpeg", ".png", ".JPG", ".JPEG", ".PNG"}
+    extensions = {".jpg", ".jpeg", ".png"}
+    rendition_names = set(RENDITIONS)
+    store = ContentStore(uploads_dir)
     images = []
 
-    for ext in extensions:
-        images.extend(uploads_dir.glob(f"*{ext}"))
+    for dirpath, dirnames, filenames in os.walk(uploads_dir):
+        # Dossiers de shards seulement (pas activations/, .trash/...)
+        dirnames[:] = [d for d in dirnames
+                       if len(d) == store.width and not d.startswith(".")]
+        for name in filenames:
+            path = Path(dirpath) / name
+            if path.suffix.lower() not in extensions:
+                continue
+            if Path(path.stem).suffix[1:] in rendition_names:
+                continue
+            images.append(path)
 
     return sorted(images)
 
@@ -0,0 +1,59 @@
+import os
+import threading
+
+from app.model.domain.service.activation_reaper import (
+    TRASH_DIR,
+    ActivationReaper,
+)
+
+NOW = 1_000_000.0
+
+
+def _token(root, name, size, age_s):
+    path = root / name
+    path.mkdir(parents=True)
+    (path / "activations.npz").write_bytes(b"x" * size)
+    ts = NOW - age_s
+    for p in (path / "activations.npz", path):
+        os.utime(p, (ts, ts))
+    return path
+
+
+def test_ttl_then_quota_oldest_first(tmp_path):
+    _token(tmp_path, "expired", 100, age_s=7200)
+    _token(tmp_path, "old", 100, age_s=1800)
+    _token(tmp_path, "mid", 100, age_s=600)
+    _token(tmp_path, "new", 100, age_s=60)
+
+    reaper = ActivationReaper(tmp_path, ttl_s=3600, max_bytes=250,
+                              clock=lambda: NOW)
+    result = reaper.sweep()
+
+    assert result == {"expired": 1, "evicted": 1, "bytes_reclaimed": 200}
+    assert sorted(p.name for p in tmp_path.iterdir()
+                  if not p.name.startswith(".")) == ["mid", "new"]
+    stats = reaper.stats()
+    assert stats["bytes_reclaimed"] == 200 and stats["total_bytes"] == 200
+
+
+def test_concurrent_sweeps_reclaim_each_dir_once(tmp_path):
+    for i in range(20):
+        _token(tmp_path, f"t{i}", 10, age_s=7200)
+    (tmp_path / TRASH_DIR / "leftover").mkdir(parents=True)
+
+    reapers = [ActivationReaper(tmp_path, ttl_s=3600, clock=lambda: NOW)
+               for _ in range(4)]
+    # Le verrou fcntl est contourné pour exercer la réclamation par rename
+    for reaper in reapers:
+        reaper._try_lock = lambda: None
+    threads = [threading.Thread(target=r.sweep) for r in reapers]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sum(r.stats()["bytes_reclaimed"] for r in reapers) == 200
+    assert sum(r.stats()["dirs_expired"] for r in reapers) == 20
+    assert [p.name for p in tmp_path.iterdir()
+            if not p.name.startswith(".")] == []
+    assert list((tmp_path / TRASH_DIR).iterdir()) == []
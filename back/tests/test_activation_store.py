@@ -0,0 +1,176 @@
+import io
+import zipfile
+
+import torch
+from PIL import Image
+from torch import nn
+
+from app.model.domain.service.activation_store import (
+    MAX,
+    ActivationRenderer,
+    ChannelReduction,
+    activation_token,
+    build_sprite,
+    bundle_etag,
+    bundle_exists,
+    iter_zip,
+    normalize_maps,
+    purge_model_bundles,
+    read_manifest,
+    reduce_activation,
+)
+from app.model.domain.service.inference_batcher import run_batch
+from app.model.domain.service.activations import ActivationGenerator
+
+
+def _jpeg_bytes():
+    buffer = io.BytesIO()
+    Image.new("RGB", (48, 40), (120, 30, 200)).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+def test_reduce_activation_shapes():
+    spatial = reduce_activation(torch.randn(1, 8, 5, 7), max_channels=2)
+    assert spatial.shape == (5, 7) and spatial.dtype.name == "uint8"
+    assert spatial.min() == 0 and spatial.max() >= 254
+
+    vector = reduce_activation(torch.randn(1, 10))
+    assert vector.shape == (4, 4)
+
+
+def test_normalize_maps_matches_per_map_normalization():
+    maps = {"a": torch.randn(5, 5), "b": torch.randn(5, 5) * 10,
+            "c": torch.randn(3, 4)}
+    normalized = normalize_maps(maps)
+    for key, fmap in maps.items():
+        assert (normalized[key] == reduce_activation(fmap)).all()
+
+
+def test_run_batch_reduces_channels_inside_the_hook():
+    model = nn.Sequential(nn.Conv2d(3, 6, 3, padding=1), nn.ReLU())
+    batch = torch.randn(2, 3, 8, 8)
+    with torch.no_grad():
+        full = model[0](batch)
+
+    for reduction, expected in (
+        (ChannelReduction(max_channels=4), full[:, :4].mean(dim=1)),
+        (ChannelReduction(mode=MAX), full.amax(dim=1)),
+    ):
+        results = run_batch(model, batch, top_k=[1, 1],
+                            capture_layers=[["0"], ["0"]],
+                            activation_reduction=reduction)
+        for i, res in enumerate(results):
+            assert list(res.activations["0"].shape) == [1, 8, 8]
+            assert torch.allclose(res.activations["0"][0], expected[i])
+
+
+def test_generator_stores_bundle_and_renders_on_demand(tmp_path):
+    model = nn.Sequential(
+        nn.Conv2d(3, 4, 3, padding=1),
+        nn.ReLU(),
+        nn.AdaptiveAvgPool2d(1),
+        nn.Flatten(),
+        nn.Linear(4, 2),
+    )
+    generator = ActivationGenerator(uploads_dir=str(tmp_path))
+    result = generator.generate_activations(
+        model=model, image_bytes=_jpeg_bytes(), input_size=32,
+    )
+
+    base = tmp_path / "activations" / result["token"]
+    assert bundle_exists(base)
+    assert not list(base.glob("*.png"))
+
+    names = [it["url"].rsplit("/", 1)[1] for it in result["items"]]
+    assert set(names) == set(read_manifest(base)["files"])
+    assert "step_00_0_heatmap.png" in names
+
+    renderer = ActivationRenderer(max_entries=2)
+    png = renderer.render(base, "step_00_0_overlay.png")
+    image = Image.open(io.BytesIO(png))
+    assert image.format == "PNG" and image.size == (32, 32)
+
+    assert renderer.render(base, "step_00_0_overlay.png") == png
+    assert renderer.render(base, "missing.png") is None
+    stats = renderer.stats()
+    assert stats["hits"] == 1 and stats["renders"] == 1
+
+
+class CountingModel(nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.conv = nn.Conv2d(3, 2, 3, padding=1)
+        self.calls = 0
+
+    def forward(self, x):
+        self.calls += 1
+        return self.conv(x)
+
+
+def test_deterministic_token_reuses_bundle(tmp_path):
+    key = dict(picture_id="p1", model_version="a.pth", layers=None)
+    token = activation_token(**key)
+    assert token == activation_token(**dict(reversed(key.items())))
+    assert token != activation_token(**{**key, "model_version": "b.pth"})
+
+    model = CountingModel()
+    generator = ActivationGenerator(uploads_dir=str(tmp_path))
+    kwargs = dict(model=model, image_bytes=_jpeg_bytes(), input_size=16,
+                  token=token, model_version="a.pth")
+    first = generator.generate_activations(**kwargs)
+    second = generator.generate_activations(**kwargs)
+
+    assert first["token"] == token and second == first
+    assert model.calls == 1
+
+
+def test_purge_model_bundles(tmp_path):
+    generator = ActivationGenerator(uploads_dir=str(tmp_path))
+    for version in ("a.pth", "a.pth", "b.pth"):
+        generator.generate_activations(
+            model=CountingModel(), image_bytes=_jpeg_bytes(), input_size=16,
+            model_version=version)
+
+    root = tmp_path / "activations"
+    assert purge_model_bundles(root, "a.pth") == 2
+    remaining = [read_manifest(p)["model_version"] for p in root.iterdir()]
+    assert remaining == ["b.pth"]
+
+
+def test_render_many_uses_format_from_extension(tmp_path):
+    generator = ActivationGenerator(uploads_dir=str(tmp_path))
+    result = generator.generate_activations(
+        model=CountingModel(), image_bytes=_jpeg_bytes(), input_size=16,
+        image_format="webp")
+    base = tmp_path / "activations" / result["token"]
+    names = sorted(read_manifest(base)["files"])
+    assert names == ["original.webp", "step_00_conv_heatmap.webp",
+                     "step_00_conv_overlay.webp"]
+
+    renderer = ActivationRenderer(workers=3)
+    rendered = renderer.render_many(base, names + ["missing.webp"])
+    assert rendered["missing.webp"] is None
+    for name in names:
+        assert Image.open(io.BytesIO(rendered[name])).format == "WEBP"
+    assert renderer.stats()["renders"] == 3
+
+
+def test_zip_stream_and_sprite(tmp_path):
+    generator = ActivationGenerator(uploads_dir=str(tmp_path))
+    result = generator.generate_activations(
+        model=CountingModel(), image_bytes=_jpeg_bytes(), input_size=16)
+    base = tmp_path / "activations" / result["token"]
+
+    rendered = ActivationRenderer().render_all(base)
+    chunks = list(iter_zip(rendered.items()))
+    assert len(chunks) == len(rendered) + 1
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+    assert archive.testzip() is None
+    assert archive.read("original.png") == rendered["original.png"]
+
+    data, layout = build_sprite(base)
+    assert layout["tile"] == [16, 16] and layout["columns"] == 2
+    assert Image.open(io.BytesIO(data)).size == (32, 32)
+    assert layout["frames"]["step_00_conv_overlay.png"] == {
+        "x": 0, "y": 16, "w": 16, "h": 16}
+    assert bundle_etag(base, "zip") != bundle_etag(base, "sprite")
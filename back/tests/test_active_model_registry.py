@@ -0,0 +1,73 @@
+from unittest.mock import MagicMock
+
+from app.model.domain.entity.model import Model
+from app.model.domain.service.active_model_registry import (
+    ActiveModelRegistry,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _catalog(model):
+    catalog = MagicMock()
+    catalog.find_active_model.return_value = model
+    return catalog
+
+
+def test_resolve_is_cached_until_poll_interval():
+    clock = FakeClock()
+    registry = ActiveModelRegistry(poll_interval_s=2.0, clock=clock)
+    catalog = _catalog(Model(name="a", path="a.pth", input_size=384))
+
+    first = registry.resolve(catalog)
+    clock.now = 1.0
+    second = registry.resolve(catalog)
+
+    assert first.path == "a.pth"
+    assert second is first
+    assert catalog.find_active_model.call_count == 1
+
+    clock.now = 2.5
+    registry.resolve(catalog)
+    assert catalog.find_active_model.call_count == 2
+
+
+def test_invalidate_forces_reload():
+    registry = ActiveModelRegistry(poll_interval_s=60.0, clock=FakeClock())
+    catalog = _catalog(Model(name="a", path="a.pth", input_size=384))
+
+    registry.resolve(catalog)
+    catalog.find_active_model.return_value = Model(
+        name="b", path="b.pth", input_size=224)
+    registry.invalidate()
+
+    assert registry.resolve(catalog).path == "b.pth"
+
+
+def test_previous_model_is_evicted_after_grace_period():
+    clock = FakeClock()
+    evicted = []
+    registry = ActiveModelRegistry(
+        poll_interval_s=0.0,
+        eviction_grace_s=30.0,
+        on_evict=evicted.append,
+        clock=clock,
+    )
+    catalog = _catalog(Model(name="a", path="a.pth", input_size=384))
+    registry.resolve(catalog)
+
+    catalog.find_active_model.return_value = Model(
+        name="b", path="b.pth", input_size=384)
+    clock.now = 10.0
+    registry.resolve(catalog)
+    assert evicted == []
+
+    clock.now = 45.0
+    registry.resolve(catalog)
+    assert evicted == ["a.pth"]
@@ -0,0 +1,50 @@
+import io
+import zipfile
+
+import pytest
+
+from app.picture.domain.service.batch_import import (
+    BatchImportError,
+    iter_zip_items,
+)
+
+
+def _zip(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        for name, data in members.items():
+            zf.writestr(name, data)
+    buffer.seek(0)
+    return buffer
+
+
+def test_zip_items_skip_non_images_and_metadata():
+    archive = _zip({
+        "F36/a.jpg": b"a",
+        "F36/b.PNG": b"b",
+        "F36/.hidden.jpg": b"h",
+        "__MACOSX/F36/._a.jpg": b"m",
+        "notes.txt": b"n",
+    })
+
+    items = list(iter_zip_items(archive, max_files=10, max_file_bytes=100,
+                                start_index=2))
+
+    assert [i.filename for i in items] == ["F36/a.jpg", "F36/b.PNG"]
+    assert [i.index for i in items] == [2, 3]
+    assert items[1].read() == b"b"
+
+
+def test_zip_items_flag_oversized_members():
+    archive = _zip({"big.jpg": b"x" * 50, "small.jpg": b"x"})
+    items = list(iter_zip_items(archive, max_files=10, max_file_bytes=10))
+    assert [i.error for i in items] == ["Fichier trop volumineux", None]
+
+
+def test_zip_items_limits():
+    with pytest.raises(BatchImportError):
+        list(iter_zip_items(io.BytesIO(b"not a zip"), 10, 100))
+
+    archive = _zip({f"{i}.jpg": b"x" for i in range(3)})
+    with pytest.raises(BatchImportError):
+        list(iter_zip_items(archive, max_files=2, max_file_bytes=100))
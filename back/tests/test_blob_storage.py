@@ -0,0 +1,92 @@
+import pytest
+
+from app.model.domain.service.model_artifacts import (
+    fetch_artifacts,
+    publish_artifacts,
+)
+from app.storage.infra.blob_storage.local_blob_storage_adapter import (
+    LocalBlobStorageAdapter,
+)
+
+
+def _roundtrip(storage, tmp_path):
+    src = tmp_path / "src.bin"
+    src.write_bytes(b"x" * 3000)
+
+    storage.upload_file("models/a.pth", src)
+    storage.put_bytes("models/a-label.json", b"{}")
+    storage.put_bytes("uploads/p.jpg", b"jpg")
+
+    assert storage.exists("models/a.pth")
+    assert storage.size("models/a.pth") == 3000
+    assert list(storage.keys("models/")) == [
+        "models/a-label.json", "models/a.pth"]
+    assert b"".join(storage.iter_bytes("models/a.pth", 1024)) == b"x" * 3000
+    assert [len(c) for c in storage.iter_bytes("models/a.pth", 1024)] == [
+        1024, 1024, 952]
+
+    dest = tmp_path / "out" / "a.pth"
+    storage.download_file("models/a.pth", dest)
+    assert dest.read_bytes() == b"x" * 3000
+
+    storage.delete("models/a.pth")
+    assert not storage.exists("models/a.pth")
+    with pytest.raises(FileNotFoundError):
+        b"".join(storage.iter_bytes("models/a.pth"))
+    with pytest.raises(FileNotFoundError):
+        storage.download_file("models/a.pth", tmp_path / "missing.pth")
+    assert not (tmp_path / "missing.pth").exists()
+
+
+def test_local_adapter(tmp_path):
+    storage = LocalBlobStorageAdapter(tmp_path / "blobs")
+    _roundtrip(storage, tmp_path)
+
+    with pytest.raises(ValueError):
+        storage.put_bytes("../escape", b"")
+
+
+def test_s3_adapter_against_moto(tmp_path):
+    moto = pytest.importorskip("moto")
+    import boto3
+
+    from app.storage.infra.blob_storage.s3_blob_storage_adapter import (
+        S3BlobStorageAdapter,
+    )
+
+    with moto.mock_aws():
+        boto3.client("s3", region_name="us-east-1").create_bucket(
+            Bucket="sae5")
+        storage = S3BlobStorageAdapter(
+            bucket="sae5",
+            region="us-east-1",
+            # Force le multipart même sur le petit fichier du test
+            multipart_threshold=1024,
+            multipart_chunksize=5 * 1024 * 1024,
+        )
+        _roundtrip(storage, tmp_path)
+
+
+def test_publish_then_fetch_model_artifacts(tmp_path):
+    storage = LocalBlobStorageAdapter(tmp_path / "blobs")
+    trainer_dir = tmp_path / "trainer"
+    trainer_dir.mkdir()
+    for name in ("resnet.3.pth", "resnet.3-mmap.pt", "resnet.3-label.json",
+                 "resnet.3.onnx", "resnet.31.pth", "other.pth"):
+        (trainer_dir / name).write_bytes(name.encode())
+
+    keys = publish_artifacts(storage, trainer_dir / "resnet.3.pth", "models/")
+    assert keys == ["models/resnet.3-label.json", "models/resnet.3.onnx",
+                    "models/resnet.3.pth"]
+
+    # Module picklé : jamais chargé depuis le stockage partagé
+    storage.put_bytes("models/resnet.3-mmap.pt", b"pickle")
+    pod_dir = tmp_path / "pod"
+    fetched = fetch_artifacts(storage, pod_dir / "resnet.3.pth", "models/")
+    assert sorted(p.name for p in fetched) == sorted(
+        k[len("models/"):] for k in keys)
+    assert (pod_dir / "resnet.3.pth").read_bytes() == b"resnet.3.pth"
+    assert not (pod_dir / "resnet.3-mmap.pt").exists()
+    # Déjà présents : rien à retélécharger
+    assert fetch_artifacts(
+        storage, pod_dir / "resnet.3.pth", "models/") == []
@@ -0,0 +1,69 @@
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+from app.picture.domain.service.content_store import ContentStore
+
+
+def test_put_shards_and_deduplicates(tmp_path):
+    store = ContentStore(tmp_path)
+    digest = hashlib.sha256(b"pixels").hexdigest()
+
+    first = store.put(b"pixels")
+    second = store.put(b"pixels")
+
+    assert first == second == (
+        tmp_path / digest[:2] / digest[2:4] / f"{digest}.jpg")
+    assert first.read_bytes() == b"pixels"
+    assert store.refcount(first) == 2
+    assert store.stats()["writes"] == 1
+    assert store.stats()["dedup_hits"] == 1
+    assert store.owns(first)
+    assert not store.owns(tmp_path / "legacy.jpg")
+
+
+def test_release_deletes_blob_with_last_reference(tmp_path):
+    store = ContentStore(tmp_path)
+    path = store.put(b"pixels")
+    store.put(b"pixels")
+
+    assert store.release(path) == 1 and path.is_file()
+    assert store.release(path) == 0 and not path.exists()
+    assert list(path.parent.iterdir()) == []
+
+
+def test_release_of_legacy_flat_file(tmp_path):
+    legacy = tmp_path / "0b6e.jpg"
+    legacy.write_bytes(b"old")
+
+    assert ContentStore(tmp_path).release(legacy) == 0
+    assert not legacy.exists()
+
+
+def test_concurrent_put_and_release_keep_count(tmp_path):
+    store = ContentStore(tmp_path)
+    path = store.put(b"pixels")
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda _: store.put(b"pixels"), range(50)))
+        list(pool.map(lambda _: store.release(path), range(25)))
+
+    assert store.refcount(path) == 26
+
+
+def test_acquired_blob_written_later_or_released(tmp_path):
+    store = ContentStore(tmp_path)
+    digest = hashlib.sha256(b"decoded").hexdigest()
+
+    path = store.acquire(digest)
+    assert store.acquire(digest) == path
+    assert not path.exists() and store.refcount(path) == 2
+
+    assert store.write(path, b"encoded")
+    assert not store.write(path, b"encoded")
+    assert path.read_bytes() == b"encoded"
+
+    # Écriture en échec : les références rendues suppriment tout
+    other = store.acquire(hashlib.sha256(b"other").hexdigest())
+    assert store.release(other) == 0
+    assert not store.write(other, b"late")
+    assert list(other.parent.iterdir()) == []
@@ -0,0 +1,117 @@
+import pickle
+
+import pytest
+import torch
+from PIL import Image
+
+from app.model.domain.service import dataset_cache
+from app.model.domain.service.dataset_cache import DatasetCache
+from app.model.domain.service.model_training import ModelTraining
+from app.model.domain.service.room_dataset import RoomDataset
+
+
+def _picture(path, color):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    Image.new("RGB", (64, 48), color).save(path, "JPEG")
+
+
+@pytest.fixture
+def decodes(monkeypatch):
+    calls = []
+    decode = dataset_cache.decode_image
+
+    def counting(path, size):
+        calls.append(path.name)
+        return decode(path, size)
+
+    monkeypatch.setattr(dataset_cache, "decode_image", counting)
+    return calls
+
+
+@pytest.fixture
+def records(tmp_path):
+    images = tmp_path / "images"
+    for name, color in (("a", (200, 10, 10)), ("b", (10, 200, 10)),
+                        ("c", (10, 10, 200))):
+        _picture(images / f"{name}.jpg", color)
+    return [
+        {"picture_id": "1", "filename": "a.jpg", "room": "F36"},
+        {"picture_id": "2", "filename": "b.jpg", "room": "F37"},
+        {"picture_id": "3", "filename": "c.jpg", "room": "F36"},
+    ]
+
+
+def test_same_tensors_as_room_dataset(tmp_path, records):
+    images = tmp_path / "images"
+    transform = ModelTraining(None, None, None, None).get_transforms()
+    reference = RoomDataset(records, images, transform=transform)
+
+    cached = DatasetCache(tmp_path / "cache").open(records, images)
+    try:
+        assert cached.room_to_idx == reference.room_to_idx
+        for i in range(len(records)):
+            image, label = cached[i]
+            expected, expected_label = reference[i]
+            assert image.shape == (3, 224, 224)
+            assert torch.equal(image, expected)
+            assert label == expected_label
+        # Transmis aux DataLoader workers sans ses mappings ni son verrou
+        clone = pickle.loads(pickle.dumps(cached))
+        assert torch.equal(clone[1][0], cached[1][0])
+    finally:
+        cached.close()
+
+
+def test_incremental_sync(tmp_path, records, decodes):
+    images = tmp_path / "images"
+    cache = DatasetCache(tmp_path / "cache", size=16, shard_size=2)
+
+    kept, slots = cache.sync(records, images)
+    assert sorted(decodes) == ["a.jpg", "b.jpg", "c.jpg"]
+    assert slots == [(0, 0), (0, 1), (1, 0)]
+
+    # Nouvel entraînement : rien à décoder, même sans changement d'ordre
+    decodes.clear()
+    assert cache.sync(records[::-1], images)[1] == slots[::-1]
+    assert decodes == []
+
+    # Image remplacée : seule celle-ci est décodée à nouveau
+    _picture(images / "b.jpg", (0, 0, 0))
+    kept, slots = cache.sync(records, images)
+    assert decodes == ["b.jpg"]
+    assert slots[1] == (0, 1)
+
+    # Picture supprimée : son slot sert à la suivante
+    decodes.clear()
+    (images / "a.jpg").unlink()
+    _picture(images / "d.jpg", (90, 90, 90))
+    new = {"picture_id": "4", "filename": "d.jpg", "room": "F37"}
+    kept, slots = cache.sync(records[1:] + [new], images)
+    assert decodes == ["d.jpg"]
+    assert slots == [(0, 1), (1, 0), (0, 0)]
+
+
+def test_freed_slots_not_reused_while_training_reads(
+        tmp_path, records, decodes):
+    images = tmp_path / "images"
+    cache = DatasetCache(tmp_path / "cache", size=16, shard_size=2)
+    reading = cache.open(records, images)
+    try:
+        before = reading[0][0]
+        (images / "a.jpg").unlink()
+        _picture(images / "d.jpg", (90, 90, 90))
+        new = {"picture_id": "4", "filename": "d.jpg", "room": "F37"}
+        kept, slots = cache.sync(records[1:] + [new], images)
+        # (0, 0) peut encore être lu par l'entraînement en cours
+        assert slots[-1] == (1, 1)
+        assert torch.equal(reading[0][0], before)
+    finally:
+        reading.close()
+
+
+def test_missing_file_is_skipped(tmp_path, records):
+    images = tmp_path / "images"
+    (images / "c.jpg").unlink()
+    dataset = DatasetCache(tmp_path / "cache", size=16).open(records, images)
+    dataset.close()
+    assert [r["picture_id"] for r in dataset.records] == ["1", "2"]
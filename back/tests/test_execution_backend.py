@@ -0,0 +1,70 @@
+import json
+
+import pytest
+import torch
+from torch import nn
+
+from app.config import settings
+from app.model.domain.service import predict
+from app.model.domain.service.execution_backend import (
+    ONNXRUNTIME,
+    export_onnx,
+    load_backend_module,
+    onnx_artifact_path,
+)
+
+pytest.importorskip("onnxruntime")
+
+
+def _model():
+    return nn.Sequential(
+        nn.Conv2d(3, 8, 3, padding=1),
+        nn.ReLU(),
+        nn.AdaptiveAvgPool2d((1, 1)),
+        nn.Flatten(),
+        nn.Linear(8, 3),
+    ).eval()
+
+
+def _checkpoint(tmp_path, model):
+    checkpoint = tmp_path / "scratch-1.0.pth"
+    torch.jit.script(model).save(str(checkpoint))
+    (tmp_path / "scratch-1.0-label.json").write_text(
+        json.dumps({"classes": ["a", "b", "c"]}))
+    return checkpoint
+
+
+def test_onnxruntime_matches_torch(tmp_path):
+    model = _model()
+    checkpoint = _checkpoint(tmp_path, model)
+    export_onnx(model, checkpoint, torch.randn(1, 3, 16, 16))
+
+    module = load_backend_module(ONNXRUNTIME, checkpoint)
+    x = torch.randn(4, 3, 16, 16)
+
+    assert onnx_artifact_path(checkpoint).is_file()
+    with torch.no_grad():
+        assert torch.allclose(module(x), model(x), atol=1e-4)
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        load_backend_module("tensorrt", "model.pth")
+
+
+def test_load_model_uses_configured_backend(tmp_path, monkeypatch):
+    model = _model()
+    checkpoint = _checkpoint(tmp_path, model)
+    export_onnx(model, checkpoint, torch.randn(1, 3, 16, 16))
+    monkeypatch.setattr(settings, "INFERENCE_BACKEND", ONNXRUNTIME)
+
+    version = str(checkpoint)
+    try:
+        loaded = predict.load_model(version)
+        assert type(loaded).__name__ == "OnnxRuntimeModule"
+        assert predict.model_cache.get_labels(version) == ["a", "b", "c"]
+        results = predict.run_batch(loaded, torch.randn(2, 3, 16, 16),
+                                    top_k=[2, 2])
+        assert [len(r.indices) for r in results] == [2, 2]
+    finally:
+        predict.model_cache.evict(version)
@@ -0,0 +1,47 @@
+import os
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.http_cache import IMMUTABLE, cached_file_response
+
+
+def _client(path):
+    app = FastAPI()
+
+    @app.get("/file")
+    def serve(request: Request):
+        return cached_file_response(request, path, media_type="image/png")
+
+    return TestClient(app)
+
+
+def test_strong_etag_304_and_range(tmp_path):
+    path = tmp_path / "a.png"
+    path.write_bytes(b"0123456789")
+    client = _client(path)
+
+    r = client.get("/file")
+    assert r.status_code == 200 and r.content == b"0123456789"
+    assert r.headers["cache-control"] == IMMUTABLE
+    assert r.headers["content-length"] == "10"
+    etag = r.headers["etag"]
+
+    r = client.get("/file", headers={"If-None-Match": f'"x", W/{etag}'})
+    assert r.status_code == 304 and r.content == b""
+    assert r.headers["etag"] == etag
+
+    r = client.get("/file", headers={"Range": "bytes=2-4"})
+    assert r.status_code == 206 and r.content == b"234"
+
+
+def test_etag_follows_content(tmp_path):
+    path = tmp_path / "a.png"
+    path.write_bytes(b"first")
+    client = _client(path)
+    first = client.get("/file").headers["etag"]
+
+    path.write_bytes(b"second!")
+    os.utime(path, ns=(1, 1))
+    r = client.get("/file", headers={"If-None-Match": first})
+    assert r.status_code == 200 and r.headers["etag"] != first
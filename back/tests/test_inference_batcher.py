@@ -0,0 +1,73 @@
+import threading
+
+import torch
+from torch import nn
+
+from app.model.domain.service.inference_batcher import (
+    InferenceBatcher,
+    run_batch,
+)
+
+
+def _tiny_model():
+    torch.manual_seed(0)
+    model = nn.Sequential(
+        nn.Conv2d(3, 4, 3, padding=1),
+        nn.ReLU(),
+        nn.AdaptiveAvgPool2d((1, 1)),
+        nn.Flatten(),
+        nn.Linear(4, 5),
+    )
+    model.eval()
+    return model
+
+
+def test_run_batch_matches_single_forward():
+    model = _tiny_model()
+    images = [torch.randn(1, 3, 8, 8) for _ in range(4)]
+
+    batched = run_batch(model, torch.cat(images), top_k=[3, 3, 2, 5])
+
+    for img, res, k in zip(images, batched, [3, 3, 2, 5]):
+        single = run_batch(model, img, top_k=[k])[0]
+        assert res.indices == single.indices
+        assert len(res.scores) == k
+        for a, b in zip(res.scores, single.scores):
+            assert abs(a - b) < 1e-5
+
+
+def test_run_batch_scatters_requested_activations_only():
+    model = _tiny_model()
+    batch = torch.randn(2, 3, 8, 8)
+
+    results = run_batch(model, batch, top_k=[1, 1],
+                        capture_layers=[["0"], []])
+
+    assert list(results[0].activations) == ["0"]
+    assert list(results[0].activations["0"].shape) == [1, 4, 8, 8]
+    assert results[1].activations == {}
+
+
+def test_batcher_groups_concurrent_requests():
+    model = _tiny_model()
+    batcher = InferenceBatcher(max_batch_size=8, max_wait_ms=200)
+    images = [torch.randn(1, 3, 8, 8) for _ in range(8)]
+    results = [None] * len(images)
+
+    def worker(i):
+        results[i] = batcher.submit(model, "tiny", images[i], top_k=2)
+
+    threads = [threading.Thread(target=worker, args=(i,))
+               for i in range(len(images))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    batcher.shutdown()
+
+    stats = batcher.stats()
+    assert stats["requests"] == len(images)
+    assert stats["batches"] < len(images)
+    for img, res in zip(images, results):
+        expected = run_batch(model, img, top_k=[2])[0]
+        assert res.indices == expected.indices
@@ -0,0 +1,77 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.model.domain.service.inference_executor import (
+    InferenceExecutor,
+    InferenceQueueFullError,
+)
+
+
+def test_run_returns_result_and_records_metrics():
+    executor = InferenceExecutor(max_workers=2, max_queue=2)
+
+    result = asyncio.run(executor.run(lambda a, b: a + b, 2, 3))
+
+    stats = executor.stats()
+    assert result == 5
+    assert stats["completed"] == 1
+    assert stats["queue_depth"] == 0
+    executor.shutdown()
+
+
+def test_rejects_when_queue_is_full():
+    executor = InferenceExecutor(
+        max_workers=1, max_queue=1, retry_after_seconds=3)
+    release = threading.Event()
+
+    async def scenario():
+        blocked = [
+            asyncio.ensure_future(executor.run(release.wait))
+            for _ in range(executor.capacity)
+        ]
+        await asyncio.sleep(0.05)
+        with pytest.raises(InferenceQueueFullError) as exc_info:
+            await executor.run(lambda: None)
+        depth = executor.stats()["queue_depth"]
+        release.set()
+        await asyncio.gather(*blocked)
+        return exc_info.value, depth
+
+    error, depth = asyncio.run(scenario())
+
+    assert error.retry_after == 3
+    assert depth == 1
+    assert executor.stats()["rejected"] == 1
+    executor.shutdown()
+
+
+def test_cancelled_callers_keep_pending_count_exact():
+    executor = InferenceExecutor(max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario():
+        running = asyncio.ensure_future(executor.run(release.wait))
+        queued = asyncio.ensure_future(executor.run(lambda: None))
+        await asyncio.sleep(0.05)
+        try:
+            # Le calcul en cours occupe toujours le worker
+            running.cancel()
+            await asyncio.sleep(0.01)
+            with pytest.raises(InferenceQueueFullError):
+                await asyncio.wait_for(executor.run(lambda: None), 1)
+
+            # Jamais exécuté : sa place dans la file est rendue
+            queued.cancel()
+            await asyncio.sleep(0.01)
+        finally:
+            release.set()
+        await asyncio.sleep(0.05)
+        return await executor.run(lambda: "ok")
+
+    assert asyncio.run(scenario()) == "ok"
+    stats = executor.stats()
+    assert executor._pending == 0
+    assert stats["completed"] == 2
+    executor.shutdown()
@@ -0,0 +1,76 @@
+import pytest
+from PIL import Image
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.picture.domain.entity.picture import Picture
+from app.picture.domain.service.content_store import ContentStore
+from app.picture.domain.service.renditions import (
+    RenditionStore,
+    rendition_path,
+)
+from migrate_content_store import migrate, recount
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Picture.__table__])
+    with sessionmaker(bind=engine)() as session:
+        yield session
+
+
+def _picture(session, path):
+    session.add(Picture(path=str(path)))
+    session.commit()
+
+
+def test_rerun_with_absolute_root_keeps_blobs(
+        tmp_path, monkeypatch, session):
+    monkeypatch.chdir(tmp_path)
+    # Chemins écrits par l'app (racine relative "uploads")
+    app_store = ContentStore("uploads")
+    blob = app_store.put(b"pixels")
+    _picture(session, blob)
+    legacy = tmp_path / "uploads" / "legacy.jpg"
+    legacy.write_bytes(b"legacy")
+    _picture(session, "uploads/legacy.jpg")
+
+    # Script lancé avec --uploads-dir absolu
+    store = ContentStore(tmp_path / "uploads")
+    assert store.owns(blob)
+    totals = migrate(session, store, batch_size=10, dry_run=False)
+
+    assert totals["already"] == 1 and totals["migrated"] == 1
+    assert blob.read_bytes() == b"pixels"
+    assert not legacy.exists()
+    paths = session.scalars(select(Picture.path)).all()
+    assert all(store.owns(p) and (tmp_path / p).is_file() for p in paths)
+
+    # Relancé : rien à faire, rien de supprimé
+    assert migrate(session, store, 10, False)["migrated"] == 0
+
+    assert recount(session, store, dry_run=False) == {}
+    assert store.refcount(blob) == 1 and blob.is_file()
+
+
+def test_recount_refuses_when_nothing_matches(tmp_path, session):
+    store = ContentStore(tmp_path / "uploads")
+    blob = store.put(b"pixels")
+    _picture(session, "elsewhere/legacy.jpg")
+
+    assert recount(session, store, dry_run=False)["refused"] == 1
+    assert blob.is_file() and store.refcount(blob) == 1
+
+
+def test_recount_keeps_renditions(tmp_path, session):
+    store = ContentStore(tmp_path / "uploads")
+    blob = store.put(b"pixels")
+    RenditionStore().generate(Image.new("RGB", (64, 48)), blob)
+    _picture(session, blob)
+    renditions = [rendition_path(blob, name) for name in ("thumbnail", "full")]
+
+    assert not any(store.owns(p) for p in renditions)
+    assert recount(session, store, dry_run=False) == {}
+    assert all(p.is_file() for p in renditions)
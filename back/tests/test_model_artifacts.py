@@ -0,0 +1,45 @@
+import pytest
+import torch
+from torch import nn
+
+from app.model.domain.service.model_artifacts import (
+    is_derived_artifact,
+    load_mmap_module,
+    mmap_artifact_path,
+    save_mmap_artifact,
+)
+
+
+def test_derived_artifacts_are_not_models():
+    assert is_derived_artifact("resnet-1.0-mmap.pt")
+    assert not is_derived_artifact("resnet-1.0.pth")
+    assert mmap_artifact_path("/m/resnet-1.0.pth").name == "resnet-1.0-mmap.pt"
+
+
+def test_mmap_roundtrip_shares_file_pages(tmp_path):
+    model = nn.Sequential(nn.Conv2d(3, 4, 3), nn.ReLU()).eval()
+    checkpoint = tmp_path / "tiny.pth"
+    torch.jit.script(model).save(str(checkpoint))
+    save_mmap_artifact(model, checkpoint)
+
+    loaded = load_mmap_module(checkpoint)
+    x = torch.randn(1, 3, 8, 8)
+    assert torch.equal(loaded(x), model(x))
+
+    with open("/proc/self/maps") as fh:
+        mapped = fh.read()
+    assert str(mmap_artifact_path(checkpoint)) in mapped
+
+
+def test_missing_mmap_artifact(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_mmap_module(tmp_path / "absent.pth")
+
+
+def test_save_mmap_artifact_leaves_model_untouched(tmp_path):
+    model = nn.Sequential(nn.Linear(4, 2), nn.Dropout()).train()
+    checkpoint = tmp_path / "tiny.pth"
+    save_mmap_artifact(model, checkpoint)
+
+    assert model.training
+    assert not load_mmap_module(checkpoint).training
@@ -0,0 +1,63 @@
+from torch import nn
+
+from app.model.domain.service.model_cache import ModelCache, module_nbytes
+
+
+def _linear():
+    # 10x10 weights + 10 bias, float32 -> 440 bytes
+    return nn.Linear(10, 10)
+
+
+def test_module_nbytes_counts_parameters():
+    assert module_nbytes(_linear()) == 440
+
+
+def test_lru_eviction_respects_budget():
+    cache = ModelCache(budget_bytes=1000)
+    cache.put_model("a", _linear())
+    cache.put_model("b", _linear())
+    cache.get_model("a")  # "b" becomes least recently used
+
+    cache.put_model("c", _linear())
+
+    assert cache.has_model("a")
+    assert not cache.has_model("b")
+    assert cache.has_model("c")
+    assert cache.stats()["evictions"] == 1
+
+
+def test_pinned_model_is_never_evicted_by_budget():
+    cache = ModelCache(budget_bytes=1000)
+    cache.pin("active")
+    cache.put_model("active", _linear())
+    cache.put_model("b", _linear())
+    cache.put_model("c", _linear())
+
+    assert cache.has_model("active")
+    assert not cache.has_model("b")
+
+
+def test_sidecars_are_evicted_with_their_model():
+    cache = ModelCache(budget_bytes=10_000)
+    cache.set_labels("a", ["x", "y"])
+    cache.set_preprocess("a", {"size": 224})
+    cache.put_model("a", _linear())
+
+    assert cache.get_labels("a") == ["x", "y"]
+    assert cache.get_preprocess("a") == {"size": 224}
+
+    cache.evict("a")
+
+    assert cache.get_labels("a") is None
+    assert cache.get_preprocess("a") == {}
+
+
+def test_hit_and_miss_counters():
+    cache = ModelCache()
+    assert cache.get_model("a") is None
+    cache.put_model("a", _linear())
+    cache.get_model("a")
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
@@ -0,0 +1,95 @@
+import json
+
+import pytest
+import torch
+from torch import nn
+
+from app.model.domain.service import predict
+from app.model.domain.service.model_artifacts import optimized_artifact_path
+from app.model.domain.service.model_exporter import (
+    ModelEquivalenceError,
+    ModelExporter,
+)
+
+
+def _model():
+    return nn.Sequential(
+        nn.Conv2d(3, 8, 3, padding=1),
+        nn.BatchNorm2d(8),
+        nn.ReLU(),
+        nn.AdaptiveAvgPool2d((1, 1)),
+        nn.Flatten(),
+        nn.Linear(8, 3),
+    ).eval()
+
+
+def _checkpoint(tmp_path, model):
+    checkpoint = tmp_path / "scratch-1.0.pth"
+    torch.jit.script(model).save(str(checkpoint))
+    (tmp_path / "scratch-1.0-label.json").write_text(
+        json.dumps({"classes": ["a", "b", "c"]}))
+    return checkpoint
+
+
+def test_optimize_folds_batchnorm():
+    frozen = ModelExporter().optimize(_model())
+    kinds = [node.kind() for node in frozen.graph.nodes()]
+    assert "aten::batch_norm" not in kinds
+
+
+def test_export_writes_verified_artifact(tmp_path):
+    model = _model()
+    checkpoint = _checkpoint(tmp_path, model)
+    exporter = ModelExporter()
+
+    dest = exporter.export(model, checkpoint, torch.randn(2, 3, 16, 16))
+
+    assert dest == optimized_artifact_path(checkpoint)
+    assert (tmp_path / "scratch-1.0-optimized-label.json").is_file()
+    assert exporter.last_report["max_abs_diff_frozen"] < 1e-3
+
+
+def test_export_refuses_diverging_model(tmp_path, monkeypatch):
+    model = _model()
+    checkpoint = _checkpoint(tmp_path, model)
+    exporter = ModelExporter()
+    other = _model()
+    with torch.no_grad():
+        other[5].bias.add_(1.0)
+    monkeypatch.setattr(
+        exporter, "optimize",
+        lambda m: torch.jit.freeze(torch.jit.script(other)))
+
+    with pytest.raises(ModelEquivalenceError):
+        exporter.export(model, checkpoint, torch.randn(2, 3, 16, 16))
+    assert not optimized_artifact_path(checkpoint).exists()
+
+
+def test_load_model_prefers_optimized_artifact(
+        tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(predict.settings, "MODEL_OPTIMIZED_ENABLED", True)
+    model = _model()
+    checkpoint = _checkpoint(tmp_path, model)
+    ModelExporter().export(model, checkpoint, torch.randn(2, 3, 16, 16))
+
+    sources = []
+    load_derived = predict._load_derived_artifact
+
+    def spy(resolved_path, model_version):
+        module, source = load_derived(resolved_path, model_version)
+        sources.append(source)
+        return module, source
+
+    monkeypatch.setattr(predict, "_load_derived_artifact", spy)
+    version = str(checkpoint)
+    try:
+        loaded = predict.load_model(version)
+        assert sources == [str(optimized_artifact_path(checkpoint))]
+        assert "artifact unusable" not in capsys.readouterr().out
+        assert predict.model_cache.get_labels(version) == ["a", "b", "c"]
+        assert predict.model_cache.stats()["used_bytes"] > 0
+        # Frozen graph: BatchNorm is gone from the served module
+        kinds = [node.kind() for node in loaded.graph.nodes()]
+        assert "aten::batch_norm" not in kinds
+    finally:
+        predict.model_cache.evict(version)
@@ -60,3 +60,28 @@ def test_ignore_non_pth_files(tmp_path):
     ml.scan_and_load()
 
     catalog.save.assert_not_called()
+
+
+def test_mmap_artifact_follows_setting(tmp_path, monkeypatch):
+    import torch
+    from torch import nn
+
+    from app.config import settings
+    from app.model.domain.service.model_artifacts import save_mmap_artifact
+
+    checkpoint = tmp_path / "resnet.1.pth"
+    torch.save({"fc.weight": torch.zeros(2, 2048)}, checkpoint)
+    eager = nn.Linear(2, 2)
+    save_mmap_artifact(eager, checkpoint)
+
+    catalog = MagicMock()
+    catalog.find_active_model.return_value = Model(
+        name="resnet.1", path=str(checkpoint), is_active=True)
+    ml = GitModelLoaderImpl(catalog, models_dir=str(tmp_path))
+
+    monkeypatch.setattr(settings, "MODEL_MMAP_ENABLED", True)
+    assert isinstance(ml()[0], nn.Linear)
+
+    # Désactivé : le checkpoint est chargé sans l'artefact -mmap.pt
+    monkeypatch.setattr(settings, "MODEL_MMAP_ENABLED", False)
+    assert not isinstance(ml()[0], nn.Linear)
@@ -0,0 +1,70 @@
+import json
+
+import torch
+from PIL import Image
+from torch import nn
+
+from app.model.domain.service.model_artifacts import (
+    int8_artifact_path,
+    is_derived_artifact,
+)
+from app.model.domain.service.model_quantizer import (
+    ModelQuantizer,
+    iter_calibration_batches,
+)
+
+
+def _model():
+    return nn.Sequential(
+        nn.Conv2d(3, 8, 3, padding=1),
+        nn.ReLU(),
+        nn.AdaptiveAvgPool2d((1, 1)),
+        nn.Flatten(),
+        nn.Linear(8, 3),
+    ).eval()
+
+
+def test_static_quantization_with_calibration():
+    quantizer = ModelQuantizer()
+    example = torch.randn(1, 3, 32, 32)
+    calibration = [torch.randn(4, 3, 32, 32) for _ in range(2)]
+
+    quantized = quantizer.quantize(_model(), example, calibration)
+
+    assert quantizer.last_mode == ModelQuantizer.STATIC
+    assert quantized(example).shape == (1, 3)
+
+
+def test_dynamic_quantization_without_calibration():
+    quantizer = ModelQuantizer()
+    quantized = quantizer.quantize(_model(), torch.randn(1, 3, 32, 32))
+
+    assert quantizer.last_mode == ModelQuantizer.DYNAMIC
+    assert isinstance(quantized[4], torch.ao.nn.quantized.dynamic.Linear)
+
+
+def test_export_writes_int8_artifact_and_sidecars(tmp_path):
+    checkpoint = tmp_path / "scratch-1.0.pth"
+    model = _model()
+    torch.jit.script(model).save(str(checkpoint))
+    (tmp_path / "scratch-1.0-label.json").write_text(
+        json.dumps({"classes": ["a", "b", "c"]}))
+
+    images = []
+    for i in range(3):
+        path = tmp_path / f"img{i}.jpg"
+        Image.new("RGB", (40, 40), (i * 60, 20, 20)).save(path)
+        images.append(path)
+
+    dest = ModelQuantizer().export(
+        model,
+        checkpoint,
+        example_input=torch.randn(1, 3, 32, 32),
+        calibration=iter_calibration_batches(images, size=32, batch_size=2),
+    )
+
+    assert dest == int8_artifact_path(checkpoint)
+    assert is_derived_artifact(dest)
+    assert (tmp_path / "scratch-1.0-int8-label.json").is_file()
+    loaded = torch.jit.load(str(dest))
+    assert loaded(torch.randn(2, 3, 32, 32)).shape == (2, 3)
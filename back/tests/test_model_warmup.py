@@ -0,0 +1,45 @@
+from unittest.mock import MagicMock
+
+from app.model.domain.service import predict
+from app.model.domain.service.model_warmup import ModelWarmup
+
+
+def setup_function():
+    predict.ACTIVE_MODEL_REGISTRY.invalidate()
+
+
+def test_not_ready_before_warmup():
+    warmup = ModelWarmup()
+    assert warmup.status()["ready"] is False
+    assert warmup.status()["state"] == ModelWarmup.PENDING
+
+
+def test_ready_when_no_active_model():
+    catalog = MagicMock()
+    catalog.find_active_model.return_value = None
+
+    warmup = ModelWarmup()
+    warmup.run(catalog)
+
+    status = warmup.status()
+    assert status["ready"] is True
+    assert status["state"] == ModelWarmup.READY
+
+
+def test_failed_warmup_does_not_block_readiness():
+    catalog = MagicMock()
+    catalog.find_active_model.side_effect = RuntimeError("db down")
+
+    warmup = ModelWarmup()
+    warmup.run(catalog)
+
+    status = warmup.status()
+    assert status["state"] == ModelWarmup.FAILED
+    assert status["ready"] is True
+    assert "db down" in status["error"]
+
+
+def test_skip_marks_ready():
+    warmup = ModelWarmup()
+    warmup.skip()
+    assert warmup.is_ready
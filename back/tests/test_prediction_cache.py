@@ -0,0 +1,143 @@
+import io
+
+from PIL import Image, ImageDraw
+
+from app.model.domain.service.prediction_cache import (
+    EXACT,
+    MISS,
+    SIMILAR,
+    PredictionCache,
+    content_hash,
+    dhash,
+    hamming,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _image(shift=0):
+    img = Image.new("RGB", (64, 64), (200, 200, 200))
+    ImageDraw.Draw(img).rectangle((10 + shift, 10, 40 + shift, 50),
+                                  fill=(20, 20, 20))
+    return img
+
+
+def test_exact_hit_and_miss_per_model_version():
+    cache = PredictionCache()
+    digest = content_hash(b"same bytes")
+    cache.store("a.pth", digest, {"top_label": "F36"})
+
+    result, kind = cache.lookup("a.pth", digest)
+    assert kind == EXACT and result["top_label"] == "F36"
+
+    result, kind = cache.lookup("b.pth", digest)
+    assert kind == MISS and result is None
+
+
+def test_returned_result_is_a_copy():
+    cache = PredictionCache()
+    cache.store("a.pth", "d", {"predictions": [1]})
+    result, _ = cache.lookup("a.pth", "d")
+    result["predictions"].append(2)
+    assert cache.lookup("a.pth", "d")[0]["predictions"] == [1]
+
+
+def test_near_duplicate_matches_within_threshold():
+    cache = PredictionCache(hamming_threshold=4)
+    cache.store("a.pth", "d1", {"top_label": "F36"}, phash=dhash(_image()))
+
+    near = dhash(_image(shift=1))
+    assert hamming(near, dhash(_image())) <= 4
+    result, kind = cache.lookup("a.pth", "d2", phash=near)
+    assert kind == SIMILAR and result["top_label"] == "F36"
+
+    far = dhash(_image()) ^ ((1 << 64) - 1)
+    assert cache.lookup("a.pth", "d3", phash=far)[1] == MISS
+
+
+def test_ttl_and_lru_eviction():
+    clock = FakeClock()
+    cache = PredictionCache(max_entries=2, ttl_s=10.0, clock=clock)
+    cache.store("a.pth", "d1", {"n": 1})
+    cache.store("a.pth", "d2", {"n": 2})
+    cache.lookup("a.pth", "d1")
+    cache.store("a.pth", "d3", {"n": 3})
+
+    assert cache.lookup("a.pth", "d2")[1] == MISS
+    assert cache.lookup("a.pth", "d1")[1] == EXACT
+
+    clock.now = 11.0
+    assert cache.lookup("a.pth", "d1")[1] == MISS
+    stats = cache.stats()
+    assert stats["evictions"] == 1 and stats["expirations"] >= 1
+
+
+def test_invalid_entries_are_dropped():
+    cache = PredictionCache()
+    cache.store("a.pth", "d1", {"activations": {"items": []}})
+    result, kind = cache.lookup("a.pth", "d1", is_valid=lambda r: False)
+    assert kind == MISS
+    assert cache.stats()["entries"] == 0
+
+
+def test_flat_images_are_not_near_duplicates():
+    cache = PredictionCache(hamming_threshold=4)
+    white = dhash(Image.new("RGB", (64, 64), (255, 255, 255)))
+    black = dhash(Image.new("RGB", (64, 64), (0, 0, 0)))
+    cache.store("a.pth", "d1", {"top_label": "F36"}, phash=white)
+
+    assert cache.lookup("a.pth", "d2", phash=black)[1] == MISS
+
+
+def test_similar_hit_carries_no_foreign_activations(monkeypatch):
+    from app.model.domain.service import predict
+
+    calls = []
+
+    def fake_predict(image_bytes, catalog, image=None, **kwargs):
+        calls.append(image_bytes)
+        activations = None
+        if kwargs.get("with_activations", True):
+            activations = {"token": f"t{len(calls)}", "bundle": None}
+        return {"model_version": "a.pth", "top_label": "F36",
+                "predictions": [{"label": "F36", "score": 0.9}],
+                "activations": activations}
+
+    class Active:
+        path = "a.pth"
+
+    monkeypatch.setattr(predict.settings, "PREDICTION_CACHE_ENABLED", True)
+    monkeypatch.setattr(predict, "resolve_active_model", lambda c: Active)
+    monkeypatch.setattr(predict, "predict_image", fake_predict)
+    hashed = []
+    monkeypatch.setattr(
+        predict, "dhash", lambda image: hashed.append(1) or dhash(image))
+    cache = PredictionCache(hamming_threshold=4)
+
+    def encoded(shift):
+        buffer = io.BytesIO()
+        _image(shift).save(buffer, format="PNG")
+        return buffer.getvalue()
+
+    first = predict.cached_predict_image(encoded(0), None, cache=cache)
+    near = predict.cached_predict_image(encoded(1), None, cache=cache)
+    assert first["activations"]["token"] == "t1"
+    assert near["cache"] == MISS and near["activations"]["token"] == "t2"
+    # Aucun quasi-doublon possible avec activations : dHash inutile
+    assert hashed == []
+
+    # Entrée d'une autre upload portant encore son token
+    variant = (3, 0.8, (), 64, False)
+    cache.store("a.pth", "other", dict(first, activations={"token": "t1"}),
+                phash=dhash(_image()), variant=variant)
+    near = predict.cached_predict_image(
+        encoded(1), None, cache=cache, with_activations=False)
+    assert near["cache"] == SIMILAR
+    assert near["top_label"] == "F36" and near["activations"] is None
+    assert len(calls) == 2
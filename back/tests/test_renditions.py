@@ -0,0 +1,43 @@
+from PIL import Image
+
+from app.picture.domain.service.renditions import (
+    RenditionStore,
+    rendition_path,
+)
+
+
+def _original(tmp_path):
+    path = tmp_path / "pic.jpg"
+    Image.new("RGB", (384, 256), (200, 40, 40)).save(path, format="JPEG")
+    return path
+
+
+def test_generate_at_import_and_delete(tmp_path):
+    original = _original(tmp_path)
+    store = RenditionStore()
+
+    with Image.open(original) as image:
+        store.generate(image, original)
+
+    thumb = rendition_path(original, "thumbnail")
+    assert thumb == tmp_path / "pic.thumbnail.jpg"
+    with Image.open(thumb) as image:
+        assert image.size == (150, 100)
+    assert store.ensure(original, "full") == tmp_path / "pic.full.jpg"
+    assert store.stats()["hits"] == 1
+
+    assert store.delete(original) == 2
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["pic.jpg"]
+
+
+def test_ensure_builds_missing_rendition_once(tmp_path):
+    original = _original(tmp_path)
+    store = RenditionStore()
+
+    path = store.ensure(original, "thumbnail")
+    mtime = path.stat().st_mtime_ns
+    assert store.ensure(original, "thumbnail").stat().st_mtime_ns == mtime
+
+    stats = store.stats()
+    assert stats["generated_lazily"] == 1 and stats["hits"] == 1
+    assert not any(p.name.endswith(".tmp") for p in tmp_path.iterdir())
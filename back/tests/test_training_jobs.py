@@ -0,0 +1,171 @@
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.model.domain.entity.training_job import (
+    FAILED,
+    QUEUED,
+    RUNNING,
+    SUCCEEDED,
+    TrainingJob,
+)
+from app.model.domain.service.training_jobs import (
+    TrainingWorker,
+    epoch_progress,
+)
+from app.model.infra.repository.training_job_repository import (
+    TrainingJobRepository,
+)
+from app.model.infra.repository.training_job_sqlalchemy_adapter import (
+    TrainingJobSQLAlchemyAdapter,
+)
+from app.role.domain.entity.role import Role
+from app.user.domain.entity.user import User
+
+PARAMS = {
+    "type": "base",
+    "epochs": 2,
+    "batchSize": 4,
+    "learningRate": 0.001,
+    "roomList": [],
+}
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    User.metadata.create_all(engine, tables=[
+        Role.__table__, User.__table__, TrainingJob.__table__])
+    return sessionmaker(bind=engine)
+
+
+def _scope(session_factory):
+    @contextmanager
+    def scope():
+        db = session_factory()
+        try:
+            yield TrainingJobSQLAlchemyAdapter(TrainingJobRepository(db))
+        finally:
+            db.close()
+    return scope
+
+
+def _enqueue(session_factory):
+    with _scope(session_factory)() as catalog:
+        return catalog.save(
+            TrainingJob(status=QUEUED, params=PARAMS)).job_id
+
+
+def _job(session_factory, job_id):
+    with _scope(session_factory)() as catalog:
+        return catalog.find_by_id(job_id)
+
+
+class FakeTrainer:
+    def __init__(self, error=None):
+        self.error = error
+        self.calls = []
+
+    def train(self, dto, on_epoch=None):
+        self.calls.append(dto)
+        for epoch in range(1, dto.epochs + 1):
+            on_epoch(epoch_progress(
+                epoch, dto.epochs, 0.5, 8, 2.0, 2.0 * epoch))
+        if self.error:
+            raise self.error
+        return "resnet.1.pth"
+
+
+def _worker(session_factory, trainer, **kwargs):
+    @contextmanager
+    def training_scope():
+        yield trainer
+    return TrainingWorker(
+        _scope(session_factory), training_scope,
+        heartbeat_interval_s=60, **kwargs)
+
+
+def test_claim_is_exclusive_and_reclaims_stale_jobs(session_factory):
+    job_id = _enqueue(session_factory)
+    now = datetime.now(timezone.utc)
+
+    with _scope(session_factory)() as catalog:
+        job = catalog.claim_next("w1", now - timedelta(minutes=2))
+        assert (job.job_id, job.status, job.attempts) == (job_id, RUNNING, 1)
+        assert catalog.claim_next("w2", now - timedelta(minutes=2)) is None
+
+        # w1 ne donne plus signe de vie : w2 reprend le job
+        catalog.claim_next("w2", now + timedelta(minutes=1))
+        assert not catalog.heartbeat(job_id, "w1", {"epoch": 1})
+        assert catalog.heartbeat(job_id, "w2", {"epoch": 1})
+
+    job = _job(session_factory, job_id)
+    assert (job.worker_id, job.attempts, job.progress) == ("w2", 2, {
+        "epoch": 1})
+
+
+def test_worker_runs_job_and_records_progress(session_factory):
+    job_id = _enqueue(session_factory)
+    trainer = FakeTrainer()
+    worker = _worker(session_factory, trainer)
+
+    assert worker.run_once()
+    assert not worker.run_once()
+
+    job = _job(session_factory, job_id)
+    assert job.status == SUCCEEDED
+    assert job.model_name == "resnet.1.pth"
+    assert job.finished_at is not None
+    assert job.progress["epoch"] == 2
+    assert job.progress["throughput"] == 4.0
+    assert job.progress["eta_s"] == 0.0
+    assert trainer.calls[0].batchSize == 4
+    assert worker.stats()["succeeded"] == 1
+
+
+def test_worker_marks_failed_with_readable_error(session_factory):
+    job_id = _enqueue(session_factory)
+    worker = _worker(session_factory, FakeTrainer(
+        RuntimeError("mat1 and mat2 shapes cannot be multiplied")))
+
+    worker.run(drain=True)
+
+    job = _job(session_factory, job_id)
+    assert job.status == FAILED
+    assert "dimensions entre les couches" in job.error
+    assert worker.stats()["failed"] == 1
+
+
+def test_worker_gives_up_after_max_attempts(session_factory):
+    job_id = _enqueue(session_factory)
+    with _scope(session_factory)() as catalog:
+        catalog.claim_next("dead", datetime.now(timezone.utc))
+    # Heartbeat figé : le worker "dead" a disparu sans finir le job
+    stale = datetime.now(timezone.utc) - timedelta(hours=1)
+    with session_factory() as db:
+        db.execute(update(TrainingJob).values(heartbeat_at=stale))
+        db.commit()
+
+    trainer = FakeTrainer()
+    worker = _worker(
+        session_factory, trainer, stale_after_s=60, max_attempts=1)
+    assert worker.run_once()
+
+    job = _job(session_factory, job_id)
+    assert job.status == FAILED
+    assert job.attempts == 2
+    assert trainer.calls == []
+
+
+def test_epoch_progress_eta():
+    progress = epoch_progress(1, 4, 0.25, 100, 10.0, 12.0)
+    assert progress["throughput"] == 10.0
+    assert progress["eta_s"] == 36.0
@@ -0,0 +1,68 @@
+import os
+
+import torch
+import torch.nn as nn
+from torch.utils.data import TensorDataset
+
+from app.config import settings
+from app.model.domain.service import model_training
+from app.model.domain.service.model_training import (
+    ModelTraining,
+    resolve_loader_workers,
+)
+
+
+def _training():
+    training = ModelTraining(
+        room_catalog=None,
+        model_catalog=None,
+        picture_catalog=None,
+        model_namer=None,
+    )
+    training.dataset = TensorDataset(
+        torch.randn(12, 3, 8, 8), torch.randint(0, 2, (12,)))
+    training.model = nn.Sequential(nn.Flatten(), nn.Linear(3 * 8 * 8, 2))
+    return training
+
+
+def test_resolve_loader_workers(monkeypatch):
+    assert resolve_loader_workers(0) == 0
+    assert resolve_loader_workers(3) == 3
+
+    monkeypatch.setattr(os, "sched_getaffinity", lambda pid: set(range(32)))
+    # Pod limité à 2 CPU sur un nœud de 32 cœurs
+    monkeypatch.setattr(model_training, "_cgroup_cpu_quota", lambda: 2.0)
+    assert resolve_loader_workers(-1) == 1
+    # Sans limite : plafonné
+    monkeypatch.setattr(model_training, "_cgroup_cpu_quota", lambda: None)
+    assert resolve_loader_workers(-1) == model_training.AUTO_LOADER_WORKERS_MAX
+
+
+def test_dataloader_options(monkeypatch):
+    monkeypatch.setattr(settings, "TRAINING_PERSISTENT_WORKERS", True)
+    training = _training()
+
+    inline = training.create_dataloader(batch_size=4, num_workers=0)
+    assert inline.num_workers == 0
+    assert not inline.persistent_workers
+    # pin_memory seulement utile (et activé) avec un GPU
+    assert inline.pin_memory == (training.device.type == "cuda")
+
+    loader = training.create_dataloader(
+        batch_size=4, num_workers=2, prefetch_factor=3)
+    assert loader.num_workers == 2
+    assert loader.prefetch_factor == 3
+    assert loader.persistent_workers
+    assert loader.multiprocessing_context.get_start_method() == "spawn"
+
+
+def test_train_epoch_records_data_wait_and_compute():
+    training = _training()
+    loader = training.create_dataloader(batch_size=4, num_workers=1)
+    optimizer = training.create_optimizer(lr=1e-2)
+
+    for _ in range(2):
+        loss = training.train_epoch(loader, optimizer, training.create_loss())
+        assert loss > 0
+        assert training.epoch_timings["data_wait_s"] > 0
+        assert training.epoch_timings["compute_s"] > 0
@@ -12,5 +12,7 @@ export default interface ModelTrainingDTO {
   roomList: RoomLightDTO[];
   scratchLayers?: ScratchLayersDTO;
   customLayers?: CustomLayersDTO;
+  numWorkers?: number;
+  prefetchFactor?: number;
 }
 
@@ -0,0 +1,15 @@
+
+export default interface TrainingJobDTO {
+  id: string;
+  status: "queued" | "running" | "succeeded" | "failed";
+  progress?: {
+    epoch: number;
+    epochs: number;
+    loss: number;
+    throughput?: number | null;
+    eta_s: number;
+  } | null;
+  model_name?: string | null;
+  error?: string | null;
+  attempts: number;
+}
@@ -1,6 +1,7 @@
 import axiosInstance from './axiosConfig';
 import ModelDTO from './DTO/model.dto';
 import ModelTrainingDTO from './DTO/modelTraining.dto';
+import TrainingJobDTO from './DTO/trainingJob.dto';
 import type {
   ModelStatsSummaryDTO,
   ModelStatsDetailedDTO,
@@ -35,9 +36,52 @@ export const setActiveModel = async (model: ModelDTO): Promise<void> => {
   }
 };
 
-export const trainModel = async (trainingData: ModelTrainingDTO): Promise<void> => {
+const TRAINING_POLL_MS = 3000;
+// Au-delà, on arrête de suivre le job (il continue côté serveur)
+const TRAINING_TIMEOUT_MS = 6 * 60 * 60 * 1000;
+
+export const fetchTrainingJob = async (
+  jobId: string,
+  signal?: AbortSignal,
+): Promise<TrainingJobDTO> => {
+  const response = await axiosInstance.get(`/models/train/${jobId}`, { signal });
+  return response.data;
+};
+
+const waitPoll = (signal?: AbortSignal) =>
+  new Promise<void>((resolve, reject) => {
+    const timer = setTimeout(resolve, TRAINING_POLL_MS);
+    signal?.addEventListener('abort', () => {
+      clearTimeout(timer);
+      reject(new Error("Suivi de l'entraînement annulé."));
+    }, { once: true });
+  });
+
+// L'entraînement est mis en file (202) : on suit le job jusqu'à sa fin,
+// son abandon (signal) ou TRAINING_TIMEOUT_MS
+export const trainModel = async (
+  trainingData: ModelTrainingDTO,
+  onProgress?: (job: TrainingJobDTO) => void,
+  signal?: AbortSignal,
+): Promise<TrainingJobDTO> => {
     try {
-        await axiosInstance.post('/models/train', trainingData);
+        const response = await axiosInstance.post('/models/train', trainingData);
+        const jobId: string = response.data.job_id;
+        const deadline = Date.now() + TRAINING_TIMEOUT_MS;
+        while (Date.now() < deadline) {
+            const job = await fetchTrainingJob(jobId, signal);
+            onProgress?.(job);
+            if (job.status === 'succeeded') {
+                return job;
+            }
+            if (job.status === 'failed') {
+                throw new Error(job.error || "L'entraînement a échoué.");
+            }
+            await waitPoll(signal);
+        }
+        throw new Error(
+            "L'entraînement n'est pas terminé : consultez son état plus tard.",
+        );
     } catch (error) {
         console.error('Error training model:', error);
         throw error;
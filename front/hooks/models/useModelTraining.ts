@@ -1,4 +1,4 @@
-import { useCallback, useEffect, useState } from "react";
+import { useCallback, useEffect, useRef, useState } from "react";
 import { trainModel } from "@/api/model.api";
 import { fetchRoomForTraining } from "@/api/room.api";
 import ModelTrainingDTO from "@/api/DTO/modelTraining.dto";
@@ -22,6 +22,10 @@ export function useModelTraining() {
 
   const customLayers = useCustomLayers();
 
+  // Suivi du job interrompu quand l'écran est démonté
+  const abortRef = useRef<AbortController | null>(null);
+  useEffect(() => () => abortRef.current?.abort(), []);
+
   const [trainingConfig, setTrainingConfig] = useState<ModelTrainingDTO>({
     type: "base",
     epochs: 10,
@@ -113,6 +117,9 @@ export function useModelTraining() {
   }, []);
 
   const train = useCallback(async () => {
+    abortRef.current?.abort();
+    const controller = new AbortController();
+    abortRef.current = controller;
     setIsTraining(true);
     setTrainingError(null);
     setTrainingSuccess(false);
@@ -128,9 +135,12 @@ export function useModelTraining() {
             ? customLayers.toDTO()
             : undefined,
       };
-      await trainModel(payload);
+      await trainModel(payload, undefined, controller.signal);
       setTrainingSuccess(true);
     } catch (error: unknown) {
+      if (controller.signal.aborted) {
+        return;
+      }
       let message = "Une erreur inattendue est survenue lors de l'entraînement.";
       if (axios.isAxiosError(error)) {
         const detail = error.response?.data?.detail;
@@ -141,10 +151,14 @@ export function useModelTraining() {
         } else if (error.code === "ECONNABORTED" || error.code === "ERR_NETWORK") {
           message = "Impossible de contacter le serveur. Vérifiez votre connexion.";
         }
+      } else if (error instanceof Error && error.message) {
+        message = error.message;
       }
       setTrainingError(message);
     } finally {
-      setIsTraining(false);
+      if (!controller.signal.aborted) {
+        setIsTraining(false);
+      }
     }
   }, [trainingConfig, scratchLayers, useCustomArchitecture, customLayers]);
 